@@ -0,0 +1,1076 @@
+import argparse
+import glob
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from mock_server import MockAJOServer, MockServerProcess, make_jobs, render_detail
+
+# 로컬 가짜 AJO 서버를 상대로 각 단계의 성능을 측정하는 스크립트
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_engines(num_jobs, latency, workers, concurrency):
+    from crawling import crawl_physics_postdocs
+    from crawling_async import crawl_physics_postdocs_async_run
+
+    # 두 카테고리 x 페이지당 100개로 나눠 목록 페이지 프론티어까지 함께 측정.
+    # 서버는 별도 프로세스에서 실행 (같은 프로세스면 서버 스레드가 GIL을 두고 엔진과 경쟁해 async 엔진이 불리해짐)
+    with MockServerProcess(make_jobs(num_jobs), latency=latency, per_page=100, categories=(3, 4)) as server:
+        thread_jobs, thread_time = timed(crawl_physics_postdocs, server.listing_urls, {}, max_workers=workers)
+        async_jobs, async_time = timed(crawl_physics_postdocs_async_run, server.listing_urls, {}, concurrency=concurrency)
+
+    # 두 엔진은 완전히 같은 공고 데이터를 만들어야 함
+    by_id = lambda jobs: {job['job_id']: job for job in jobs}
+    assert by_id(thread_jobs) == by_id(async_jobs), "thread/async 엔진 결과가 다릅니다"
+
+    print(f"[engines] {num_jobs} postings, {latency * 1000:.0f}ms latency")
+    print(f"  thread ({workers} workers):      {thread_time:8.3f}s  {len(thread_jobs) / thread_time:8.1f} jobs/s")
+    print(f"  async  ({concurrency} concurrent): {async_time:8.3f}s  {len(async_jobs) / async_time:8.1f} jobs/s")
+
+
+def load_detail_pages():
+    pages = {}
+    for filename in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'detail_*.html'))):
+        with open(filename, 'rb') as f:
+            pages[os.path.basename(filename)] = f.read()
+    for job in make_jobs(5):
+        pages[f"mock_{job['job_id']}"] = render_detail(job).encode('utf-8')
+    return pages
+
+
+def bench_parsers(repeat):
+    from crawling import PARSER_BACKENDS
+
+    # 결과 일치 여부는 tests/test_parsers.py에서 검사
+    pages = load_detail_pages()
+    for name, parse in PARSER_BACKENDS.items():
+        _, elapsed = timed(lambda: [parse(content) for _ in range(repeat) for content in pages.values()])
+        per_page = elapsed / (repeat * len(pages))
+        print(f"  {name:5s} {per_page * 1e6:10.1f} us/page")
+
+
+def bench_store(sizes):
+    from store import JobStore
+
+    print("[store] JSON full-file round trip vs SQLite JobStore")
+    for size in sizes:
+        jobs = make_jobs(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_filename = os.path.join(tmp, 'jobs.json')
+
+            def save_json():
+                with open(json_filename, 'w', encoding='utf-8') as f:
+                    json.dump(jobs, f, ensure_ascii=False, indent=2)
+
+            def load_json():
+                with open(json_filename, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+
+            _, json_save = timed(save_json)
+            _, json_load = timed(load_json)
+
+            with JobStore(os.path.join(tmp, 'jobs.db')) as store:
+                _, store_insert = timed(store.upsert_jobs, jobs)
+                # 1%만 바뀐 다음 실행을 가정
+                for job in jobs[::100]:
+                    job['title'] += ' (updated)'
+                _, store_upsert = timed(store.upsert_jobs, jobs)
+                _, store_load = timed(store.load_jobs)
+                changed_ids = [job['job_id'] for job in jobs[::100]]
+                _, store_load_changed = timed(store.load_jobs, changed_ids)
+
+        print(f"  {size:>7} jobs  json save {json_save:7.3f}s  load {json_load:7.3f}s | "
+              f"store insert {store_insert:7.3f}s  upsert {store_upsert:7.3f}s  "
+              f"load all {store_load:7.3f}s  load changed {store_load_changed:7.3f}s")
+
+
+def bench_post_process(sizes):
+    from post_process import LocationCache, update_store
+    from store import JobStore
+
+    print("[post_process] full vs incremental update_store")
+    for size in sizes:
+        jobs = make_jobs(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            output_filename = os.path.join(tmp, 'updated.json')
+            location_cache = LocationCache()
+            with JobStore(os.path.join(tmp, 'jobs.db')) as store:
+                store.upsert_jobs(jobs)
+                _, full = timed(update_store, store, output_filename, location_cache)
+                _, unchanged = timed(update_store, store, output_filename, location_cache)
+                for job in jobs[::100]:
+                    job['title'] += ' (updated)'
+                store.upsert_jobs(jobs)
+                _, one_percent = timed(update_store, store, output_filename, location_cache)
+        print(f"  {size:>7} jobs  full {full:7.3f}s  no changes {unchanged * 1000:7.2f}ms  1% changed {one_percent:7.3f}s")
+
+
+def legacy_extract_location(position_location):
+    # 기존 post_process.extract_country_and_clean_location (예외 목록을 부분 문자열로 훑은 뒤 마지막 부분을 국가로)
+    cleaned_location = position_location.replace('[map]', '').strip()
+    special_cases = {'Korea, The Republic of': 'Republic of Korea'}
+    for special_case in special_cases:
+        if special_case in cleaned_location:
+            return cleaned_location.replace(special_case, '').strip(', ').strip(), special_cases[special_case]
+    parts = [part.strip() for part in cleaned_location.split(',')]
+    return ', '.join(parts[:-1]).strip(), parts[-1]
+
+
+# AJO 공고에서 볼 수 있는 위치 표기 (같은 나라를 여러 방식으로 적은 것 포함)
+LOCATION_TEMPLATES = [
+    '{n} Main St, Cambridge, MA 02139, United States', 'Cambridge, MA, USA', 'Berkeley, CA', 'Princeton, New Jersey',
+    'Pasadena, California, United States of America', 'Ann Arbor, MI, U.S.A.', 'Urbana, Illinois {n}',
+    'Seoul, Korea, The Republic of [map]', 'Daejeon, South Korea', 'Pohang, Korea, Republic of',
+    'Heidelberg, Germany', 'Garching, Bavaria', 'Zürich, Switzerland', 'Geneva {n}, Suisse', 'Tokyo, Japan',
+    'Toronto, Ontario, Canada', 'Waterloo, ON', 'Oxford, England', 'Cambridge, United Kingdom', 'Edinburgh, UK',
+    'Perth, Western Australia', 'Hefei, Anhui, P.R. China', 'Hsinchu, Taiwan', 'Paris {n}, France',
+    'Trieste, Italy', 'São Paulo, SP {n}, Brazil', 'Amsterdam, The Netherlands', 'Rio de Janeiro', 'Remote',
+    'Jersey City, New Jersey', 'Lebanon, New Hampshire', 'Chad Smith Hall, Boston, MA',
+]
+# 국가/주 이름이 도시나 건물 이름 안에 들어 있는 경우를 포함한 (위치, 정리된 위치, 국가 코드)
+LOCATION_CHECKS = [
+    ('1 Main St, Cambridge, MA 02139, United States', '1 Main St, Cambridge, MA 02139', 'US'),
+    ('Seoul, Korea, The Republic of [map]', 'Seoul', 'KR'),
+    ('Garching, Bavaria', 'Garching, Bavaria', 'DE'),
+    ('Hefei, Anhui, P.R. China', 'Hefei, Anhui', 'CN'),
+    ('Jersey City, New Jersey', 'Jersey City, New Jersey', 'US'),
+    ('Lebanon, New Hampshire', 'Lebanon, New Hampshire', 'US'),
+    ('Chad Smith Hall, Boston, MA', 'Chad Smith Hall, Boston, MA', 'US'),
+    ('Mexico City, Mexico', 'Mexico City', 'MX'),
+    ('Beirut, Lebanon', 'Beirut', 'LB'),
+    ('Jersey City', '', ''),
+    ('Rio de Janeiro', '', ''),
+]
+
+
+def bench_locations(size):
+    from countries import resolve_location, resolve_locations
+    from post_process import LocationCache
+
+    for location, cleaned_location, code in LOCATION_CHECKS:
+        result = resolve_location(location)
+        assert (result[0], result[2]) == (cleaned_location, code), (location, result)
+
+    random.seed(0)
+    # {n}이 들어간 표기는 매번 다른 문자열이 되므로 일부는 캐시에 걸리지 않음
+    locations = [random.choice(LOCATION_TEMPLATES).format(n=random.randint(1, 99999)) for _ in range(size)]
+    distinct = len(set(locations))
+    print(f"[locations] {size} locations ({distinct} distinct)")
+
+    legacy, legacy_time = timed(lambda: [legacy_extract_location(location) for location in locations])
+    indexed, indexed_time = timed(lambda: [resolve_location(location) for location in locations])
+    batch, batch_time = timed(resolve_locations, locations)
+    assert batch == indexed
+    cache = LocationCache()
+    cache.resolve_many(locations)
+    _, warm_time = timed(cache.resolve_many, locations)
+
+    for name, elapsed in [('legacy last token', legacy_time), ('indexed, no memo', indexed_time),
+                          ('indexed batch', batch_time), ('warm LocationCache', warm_time)]:
+        print(f"  {name:18s} {elapsed:7.3f}s  {size / elapsed:10.0f} locations/s")
+    unresolved = sum(1 for _, _, code in indexed if not code)
+    print(f"  country keys: legacy {len({country for _, country in legacy})}  "
+          f"indexed {len({country for _, country, _ in indexed})}  unresolved {unresolved / size:.1%}")
+
+
+def legacy_diff(existing_jobs_dict, jobs):
+    # 기존 crawling.py __main__ 블록의 방식 (updated 공고마다 목록 전체를 다시 훑음)
+    existing_job_ids = set(existing_jobs_dict.keys())
+    current_job_ids = set(job['job_id'] for job in jobs)
+    new_jobs = [job for job in jobs if job['job_id'] in current_job_ids - existing_job_ids]
+    updated_jobs = []
+    for job_id in current_job_ids & existing_job_ids:
+        current_job = next(job for job in jobs if job['job_id'] == job_id)
+        if existing_jobs_dict[job_id] != current_job:
+            updated_jobs.append(current_job)
+    return new_jobs, updated_jobs
+
+
+def bench_diff(sizes, legacy_limit):
+    from change_detection import diff_jobs, fingerprint
+
+    print("[diff] fingerprint hash-map diff vs legacy nested lookup")
+    for size in sizes:
+        old_jobs = make_jobs(size)
+        jobs = [dict(job) for job in old_jobs[size // 100:]] + make_jobs(size + size // 100)[size:]
+        for job in jobs[::100]:
+            job['title'] += ' (updated)'
+        old_fingerprints = {job['job_id']: fingerprint(job) for job in old_jobs}
+
+        (diff, _), elapsed = timed(diff_jobs, old_fingerprints, jobs)
+        line = (f"  {size:>7} jobs  diff_jobs {elapsed:7.3f}s  "
+                f"(new {len(diff.new)}, updated {len(diff.updated)}, removed {len(diff.removed)})")
+        if size <= legacy_limit:
+            _, legacy_elapsed = timed(legacy_diff, {job['job_id']: job for job in old_jobs}, jobs)
+            line += f"  legacy {legacy_elapsed:7.3f}s"
+        print(line)
+
+
+def processed_jobs(size):
+    from deadline import with_deadline
+    from post_process import process_jobs
+
+    jobs = [with_deadline(job) for job in make_jobs(size)]
+    for job in jobs:
+        job['job_url'] = f"https://academicjobsonline.org/ajo/jobs/{job['job_id']}"
+    return process_jobs(jobs)
+
+
+def measured(func, *args):
+    # 실행 시간과 tracemalloc 기준 최대 메모리 사용량
+    tracemalloc.start()
+    try:
+        _, elapsed = timed(func, *args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_render(sizes):
+    import render
+
+    def render_to_string(jobs, out_path):
+        # 기존 방식: 페이지 전체를 문자열로 만든 뒤 한 번에 씀
+        html_content = render.env.get_template('jobs.html').render(jobs=jobs, search_index=render.build_search_payload(jobs))
+        with open(out_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+
+    print("[render] render() to string vs streamed render_jobs / render_jobs_virtual")
+    for size in sizes:
+        jobs = processed_jobs(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            out_path = os.path.join(tmp, 'out.html')
+            string_time, string_peak = measured(render_to_string, jobs, out_path)
+            stream_time, stream_peak = measured(render.render_jobs, jobs, out_path, None)
+            virtual_time, virtual_peak = measured(render.render_jobs_virtual, jobs, out_path, None)
+        print(f"  {size:>6} jobs  string {string_time:6.2f}s {string_peak / 2**20:7.1f}MiB | "
+              f"stream {stream_time:6.2f}s {stream_peak / 2**20:7.1f}MiB | "
+              f"virtual {virtual_time:6.2f}s {virtual_peak / 2**20:7.1f}MiB")
+
+
+SEARCH_QUERIES = ['quantum', 'physics', 'condensed matter', 'theoretical physics university', 'astro', 'korea',
+                  'university 12', 'artificial intelligence', 'department of mathematics', 'nothing matches']
+# 브라우저 검색(templates/search.js)을 node로 돌려 질의 지연을 잼
+NODE_SEARCH_SCRIPT = """
+const fs = require('fs');
+const search = createSearch(JSON.parse(fs.readFileSync(process.argv[2], 'utf8')));
+const queries = JSON.parse(process.argv[3]);
+const repeat = Number(process.argv[4]);
+const times = [];
+for (const query of queries) {
+    for (let i = 0; i < repeat; i++) {
+        const start = process.hrtime.bigint();
+        search.search(query);
+        times.push(Number(process.hrtime.bigint() - start) / 1e6);
+    }
+}
+console.log(JSON.stringify(times));
+"""
+# 검색 결과 확인용 공고와 (검색어, 찾아야 할 공고 번호). 마지막 단어는 입력 중인 접두사
+SEARCH_CHECK_JOBS = [
+    {'job_id': '0', 'title': 'Postdoc in Computational Physics'},
+    {'job_id': '1', 'title': 'Theoretical Cosmology Fellowship'},
+    {'job_id': '2', 'title': 'Galaxies and Galaxy Evolution'},
+    {'job_id': '3', 'title': 'Computation and Physical Systems'},
+    {'job_id': '4', 'title': 'Cosmological Simulations'},
+]
+SEARCH_CHECKS = [
+    ('physica', [0, 3]), ('theoretica', [1]), ('galaxie', [2]), ('cosmologi', [4]), ('cosmolog', [1, 4]),
+    ('physics', [0, 3]), ('galaxy ', [2]), ('comput', [0, 3]), ('nothing', []),
+    # 어미가 여러 겹이어도 같은 어간 ('computational' -> 'computation' -> 'comput')
+    ('computation ', [0, 3]), ('computational ', [0, 3]), ('computational physics ', [0, 3]),
+]
+NODE_SEARCH_CHECK_SCRIPT = """
+const fs = require('fs');
+const search = createSearch(JSON.parse(fs.readFileSync(process.argv[2], 'utf8')));
+console.log(JSON.stringify(JSON.parse(process.argv[3]).map(function(query) {
+    return Array.from(search.search(query)).sort(function(a, b) { return a - b; });
+})));
+"""
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_node_search(node, index, script, *args):
+    # templates/search.js에 script를 붙여 node로 실행하고 JSON 출력을 읽음
+    import subprocess
+
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'search.js'), 'r', encoding='utf-8') as f:
+        search_js = f.read()
+    with tempfile.TemporaryDirectory() as tmp:
+        index.save(os.path.join(tmp, 'index.json'))
+        with open(os.path.join(tmp, 'search.js'), 'w', encoding='utf-8') as f:
+            f.write(search_js + script)
+        return json.loads(subprocess.check_output([node, os.path.join(tmp, 'search.js'), os.path.join(tmp, 'index.json'), *args]))
+
+
+def bench_search(sizes, repeat):
+    import shutil
+    from search_index import SEARCH_FIELDS, SearchIndex, fold
+
+    node = shutil.which('node')
+    # 파이썬과 브라우저(node) 검색이 같은 공고를 찾는지 확인
+    index = SearchIndex.from_jobs(SEARCH_CHECK_JOBS)
+    queries = [query for query, _ in SEARCH_CHECKS]
+    for query, expected in SEARCH_CHECKS:
+        assert index.search(query) == expected, (query, index.search(query))
+    if node:
+        assert run_node_search(node, index, NODE_SEARCH_CHECK_SCRIPT, json.dumps(queries)) == [expected for _, expected in SEARCH_CHECKS]
+
+    print(f"[search] inverted index build, size and query latency ({len(SEARCH_QUERIES)} queries x {repeat})")
+    for size in sizes:
+        jobs = processed_jobs(size)
+        index, build_time = timed(SearchIndex.from_jobs, jobs)
+        data = index.to_json().encode('utf-8')
+
+        # 비교용: 질의마다 모든 공고의 필드를 훑는 방식 (색인 없이 브라우저에서 찾을 때와 같음)
+        texts = [fold(' '.join(job.get(field) or '' for field in SEARCH_FIELDS)) for job in jobs]
+
+        def scan(query):
+            words = fold(query).split()
+            return [doc_id for doc_id, text in enumerate(texts) if all(word in text for word in words)]
+
+        index_times, scan_times = [], []
+        for query in SEARCH_QUERIES:
+            for _ in range(repeat):
+                index_times.append(timed(index.search, query)[1] * 1000)
+            scan_times.append(timed(scan, query)[1] * 1000)
+        line = (f"  {size:>7} jobs  build {build_time:6.3f}s  {len(index.terms):>6} terms  {len(data) / 2**20:6.2f}MiB | "
+                f"python p50 {percentile(index_times, 0.5):7.3f}ms  p99 {percentile(index_times, 0.99):7.3f}ms | "
+                f"scan p50 {percentile(scan_times, 0.5):8.2f}ms")
+        if node:
+            js_times = run_node_search(node, index, NODE_SEARCH_SCRIPT, json.dumps(SEARCH_QUERIES), str(repeat))
+            line += f" | js p50 {percentile(js_times, 0.5):7.3f}ms  p99 {percentile(js_times, 0.99):7.3f}ms"
+        print(line)
+
+
+def legacy_jobs_to_excel(data, excel_file):
+    # 기존 convert.jobs_to_excel 방식 (일반 워크북에 셀 단위로 쓰고, 열 너비는 전체 셀을 다시 훑어 계산)
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Font
+    from deadline import job_deadline, to_datetime
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Physics Postdocs"
+    for col, header in enumerate(data[0].keys(), start=1):
+        ws.cell(row=1, column=col, value=header).font = Font(bold=True)
+    for row, item in enumerate(data, start=2):
+        for col, (key, value) in enumerate(item.items(), start=1):
+            cell = ws.cell(row=row, column=col)
+            if key == 'deadline':
+                parsed_date = to_datetime(job_deadline(item)[0])
+                if parsed_date:
+                    cell.value = parsed_date
+                    cell.number_format = 'YYYY-MM-DD'
+                else:
+                    cell.value = value
+            elif key == 'application_materials' and isinstance(value, list):
+                cell.value = '\n'.join(f'• {material}' for material in value)
+                cell.alignment = Alignment(wrapText=True, vertical='top')
+            else:
+                cell.value = value
+    for col in ws.columns:
+        max_length = max(len(str(cell.value)) for cell in col)
+        ws.column_dimensions[col[0].column_letter].width = min(max_length + 2, 50)
+    wb.save(excel_file)
+
+
+def read_excel(excel_file):
+    from openpyxl import load_workbook
+
+    ws = load_workbook(excel_file).active
+    widths = {letter: dim.width for letter, dim in ws.column_dimensions.items()}
+    rows = [[(cell.value, cell.number_format, cell.alignment.wrap_text, cell.font.b) for cell in row]
+            for row in ws.iter_rows()]
+    return widths, rows
+
+
+def bench_excel(sizes, legacy_limit):
+    import convert
+    from deadline import parse_deadline
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, 'legacy.xlsx')
+        stream_path = os.path.join(tmp, 'stream.xlsx')
+        jobs = processed_jobs(200)
+        legacy_jobs_to_excel(jobs, legacy_path)
+        convert.jobs_to_excel(iter(jobs), stream_path)
+        assert read_excel(legacy_path) == read_excel(stream_path), "write-only export differs from legacy export"
+
+        print("[excel] legacy Workbook export vs write-only streaming export")
+        for size in sizes:
+            jobs = processed_jobs(size)
+            parse_deadline.cache_clear()
+            stream_time, stream_peak = measured(convert.jobs_to_excel, jobs, stream_path)
+            line = f"  {size:>6} jobs  write-only {stream_time:6.2f}s {stream_peak / 2**20:7.1f}MiB"
+            if size <= legacy_limit:
+                legacy_time, legacy_peak = measured(legacy_jobs_to_excel, jobs, legacy_path)
+                line += f" | legacy {legacy_time:6.2f}s {legacy_peak / 2**20:7.1f}MiB"
+            print(line)
+
+
+def read_export(fmt, filename, columns=None):
+    # 분석 작업처럼 파일 전체 또는 일부 열만 읽어 행 수를 돌려줌
+    if fmt == 'jsonl':
+        with open(filename, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+    elif fmt == 'csv':
+        import csv
+        with open(filename, encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+    elif fmt == 'xlsx':
+        from openpyxl import load_workbook
+        wb = load_workbook(filename, read_only=True)
+        rows = list(wb.active.iter_rows(min_row=2, values_only=True))
+        wb.close()
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_table(filename, columns=columns).num_rows
+    elif fmt == 'arrow':
+        import pyarrow as pa
+        with pa.memory_map(filename) as source:
+            table = pa.ipc.open_file(source).read_all()
+            return (table.select(columns) if columns else table).num_rows
+    if columns and fmt != 'xlsx':
+        rows = [[row[name] for name in columns] for row in rows]
+    return len(rows)
+
+
+def bench_export(sizes):
+    import convert
+    import exporters
+
+    writers = {fmt: write for fmt, (write, _) in exporters.WRITERS.items()}
+    writers['xlsx'] = convert.jobs_to_excel
+    scan_columns = ['deadline', 'country', 'subject_area']
+    print(f"[export] write / full read / scan({', '.join(scan_columns)}) per format")
+    for size in sizes:
+        jobs = processed_jobs(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt, write in writers.items():
+                filename = os.path.join(tmp, f"jobs.{fmt}")
+                _, write_time = timed(write, jobs, filename)
+                rows, read_time = timed(read_export, fmt, filename)
+                assert rows == size, f"{fmt}: read {rows} rows, expected {size}"
+                _, scan_time = timed(read_export, fmt, filename, scan_columns)
+                print(f"  {size:>7} jobs  {fmt:8s} write {write_time:6.2f}s  read {read_time:6.2f}s  "
+                      f"scan {scan_time:6.2f}s  {os.path.getsize(filename) / 2**20:7.1f}MiB")
+
+
+def legacy_deadline(deadline):
+    # 기존 render.py의 parseDeadline(JS)과 같은 규칙: 비교할 때마다 정규식으로 해석
+    import re
+    from datetime import datetime
+
+    match = re.search(r'(\d{4})/(\d{2})/(\d{2}) (\d{1,2}):(\d{2})(AM|PM)', deadline)
+    if not match:
+        return datetime(9999, 12, 31)
+    year, month, day, hour, minute, ampm = match.groups()
+    hour = int(hour)
+    if ampm == 'PM' and hour != 12:
+        hour += 12
+    elif ampm == 'AM' and hour == 12:
+        hour = 0
+    return datetime(int(year), int(month), int(day), hour, int(minute))
+
+
+def bench_deadline(size):
+    import functools
+    import random
+    from deadline import parse_deadline, sort_key, with_deadline
+
+    random.seed(0)
+    jobs = make_jobs(size)
+    for job in jobs:
+        job['deadline'] = (f"(deadline {random.randint(2024, 2026)}/{random.randint(1, 12):02d}/{random.randint(1, 28):02d} "
+                           f"{random.randint(1, 12)}:{random.choice(['00', '30', '59'])}{random.choice(['AM', 'PM'])})")
+
+    def compare(a, b):
+        date_a, date_b = legacy_deadline(a['deadline']), legacy_deadline(b['deadline'])
+        return (date_a > date_b) - (date_a < date_b)
+
+    print(f"[deadline] sort {size} jobs by deadline")
+    legacy_compare, compare_time = timed(sorted, jobs, key=functools.cmp_to_key(compare))
+    legacy_key, key_time = timed(sorted, jobs, key=lambda job: legacy_deadline(job['deadline']))
+    parse_deadline.cache_clear()
+    annotated, annotate_time = timed(lambda: [with_deadline(job) for job in jobs])
+    stored, stored_time = timed(sorted, annotated, key=sort_key)
+    assert [job['job_id'] for job in stored] == [job['job_id'] for job in legacy_key] == [job['job_id'] for job in legacy_compare]
+    print(f"  parse per comparison (old JS)   {compare_time:7.3f}s")
+    print(f"  parse per job (old key)         {key_time:7.3f}s")
+    print(f"  parse once at ingest (cached)   {annotate_time:7.3f}s  {parse_deadline.cache_info()}")
+    print(f"  sort on stored deadline_at      {stored_time:7.3f}s")
+
+
+# fixtures/listing.html 공고별 정답 (관련 공고 여부)
+LISTING_LABELS = {'10001': True, '10002': True, '10003': True, '10004': False, '10005': True}
+RELEVANT_SUBJECTS = {'Theoretical Physics', 'Condensed Matter Physics', 'Astrophysics', 'Artificial Intelligence', 'Natural Sciences'}
+
+
+def legacy_is_relevant(title, department):
+    # 기존 crawling.is_relevant
+    return 'physics' in title.lower() or 'physics' in department.lower() or 'artificial' in title.lower() or 'natural' in title.lower()
+
+
+def labeled_entries(size):
+    # 고정 목록 페이지 + 가짜 서버 공고(과목으로 정답을 정함)를 (title, department, 정답)으로
+    from crawling import parse_listing
+
+    with open(os.path.join(FIXTURES_DIR, 'listing.html'), 'rb') as f:
+        entries, _ = parse_listing(f.read(), 'https://academicjobsonline.org/ajo')
+    labeled = [(entry[1], entry[5], LISTING_LABELS[entry[0]]) for entry in entries]
+    for job in make_jobs(size):
+        labeled.append((job['title'], job['department'], job['subject_area'] in RELEVANT_SUBJECTS))
+    return labeled
+
+
+def precision_recall(predict, labeled):
+    true_positive = sum(1 for title, department, label in labeled if label and predict(title, department))
+    predicted = sum(1 for title, department, _ in labeled if predict(title, department))
+    actual = sum(1 for _, _, label in labeled if label)
+    return true_positive / predicted if predicted else 0.0, true_positive / actual if actual else 0.0
+
+
+def bench_relevance(size, keyword_counts):
+    import random
+    import string
+    from relevance import DEFAULT_CONFIG, KeywordMatcher
+
+    labeled = labeled_entries(size)
+    matcher = KeywordMatcher()
+
+    def predict(title, department):
+        return matcher.is_relevant(title=title, department=department)
+
+    print(f"[relevance] {len(labeled)} labeled listing entries")
+    for name, func in [('legacy substring', legacy_is_relevant), ('KeywordMatcher', predict)]:
+        precision, recall = precision_recall(func, labeled)
+        _, elapsed = timed(lambda: [func(title, department) for title, department, _ in labeled])
+        print(f"  {name:18s} precision {precision:.3f}  recall {recall:.3f}  {len(labeled) / elapsed:10.0f} entries/s")
+
+    # 키워드 수를 늘렸을 때: 키워드마다 `in`으로 확인하는 방식과 접두사 트리 정규식 비교
+    random.seed(0)
+    for count in keyword_counts:
+        extra = [''.join(random.choices(string.ascii_lowercase, k=random.randint(5, 12))) for _ in range(count)]
+        keywords = DEFAULT_CONFIG['fields']['title']['keywords'] + extra
+        config = {'fields': {'title': {'keywords': keywords}, 'department': {'keywords': keywords}}}
+        many = KeywordMatcher(config)
+
+        def naive(title, department):
+            title, department = title.lower(), department.lower()
+            return any(keyword in title or keyword in department for keyword in keywords)
+
+        _, naive_time = timed(lambda: [naive(title, department) for title, department, _ in labeled])
+        _, matcher_time = timed(lambda: [many.is_relevant(title=title, department=department)
+                                         for title, department, _ in labeled])
+        print(f"  {len(keywords):>5} keywords  any(in) {len(labeled) / naive_time:10.0f} entries/s  "
+              f"KeywordMatcher {len(labeled) / matcher_time:10.0f} entries/s")
+
+
+def count_checkpoint_jobs(filename):
+    if not os.path.exists(filename):
+        return 0
+    with open(filename, 'rb') as f:
+        return sum(1 for line in f if line.startswith(b'{"type": "job"'))
+
+
+def bench_resume(num_jobs, latency, kill_after, engine):
+    # crawling.py를 별도 프로세스로 돌리다 SIGKILL로 죽인 뒤 --resume으로 이어서 끝까지 실행
+    import signal
+    import subprocess
+    import sys
+    from checkpoint import CHECKPOINT_FILENAME
+    from crawling import is_relevant
+    from store import DB_FILENAME, JobStore
+
+    crawler = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'crawling.py')
+    jobs = make_jobs(num_jobs)
+    expected = {job['job_id'] for job in jobs if is_relevant(job['title'], job['department'])}
+    print(f"[resume] {engine} engine, {len(expected)} relevant postings, {latency * 1000:.0f}ms latency, kill after {kill_after} jobs")
+    with MockAJOServer(jobs, latency=latency, per_page=50, categories=(3, 4)) as server, tempfile.TemporaryDirectory() as tmp:
+        command = [sys.executable, crawler, '--engine', engine, '--workers', '4']
+        for url in server.listing_urls:
+            command += ['--listing', url]
+        checkpoint_filename = os.path.join(tmp, CHECKPOINT_FILENAME)
+
+        # 파싱 워커 프로세스까지 한꺼번에 죽이도록 별도 프로세스 그룹으로 실행
+        process = subprocess.Popen(command, cwd=tmp, stdout=subprocess.DEVNULL, start_new_session=True)
+        while process.poll() is None and count_checkpoint_jobs(checkpoint_filename) < kill_after:
+            time.sleep(0.02)
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+        done_before_kill = count_checkpoint_jobs(checkpoint_filename)
+        requests_before_kill = server.request_count
+        assert done_before_kill < len(expected), "crawl finished before it could be killed; lower --kill-after"
+
+        start = time.perf_counter()
+        subprocess.run(command + ['--resume'], cwd=tmp, stdout=subprocess.DEVNULL, check=True)
+        resume_time = time.perf_counter() - start
+        resume_requests = server.request_count - requests_before_kill
+
+        with JobStore(os.path.join(tmp, DB_FILENAME)) as store:
+            stored = {job['job_id'] for job in store.load_jobs()}
+        assert stored == expected, f"{len(expected - stored)} postings missing after resume"
+        assert not os.path.exists(checkpoint_filename), "checkpoint should be removed after a completed crawl"
+
+    print(f"  killed with {done_before_kill} jobs checkpointed ({requests_before_kill} requests)")
+    print(f"  resume: {resume_requests} requests for the remaining {len(expected) - done_before_kill} jobs in {resume_time:.2f}s")
+    print(f"  all {len(stored)} postings stored, checkpoint removed")
+
+
+def bench_http_cache(num_jobs, engines):
+    # 같은 저장소와 HTTP 캐시로 가짜 서버를 두 번 크롤링: 두 번째는 모든 상세 페이지가 304이고 다시 쓰는 공고가 없어야 함.
+    # 이어서 공고 하나만 바꾸면 그 공고만 200으로 받아 updated가 됨
+    from crawling import run_crawl
+    from store import JobStore
+
+    def stored_rows(store):
+        return dict(store.conn.execute('SELECT job_id, updated_at FROM jobs'))
+
+    print(f"[http_cache] {num_jobs} postings, crawl twice with a populated cache")
+    for engine in engines:
+        with MockAJOServer(make_jobs(num_jobs), per_page=50, categories=(3, 4)) as server, tempfile.TemporaryDirectory() as tmp:
+            paths = {name: os.path.join(tmp, filename) for name, filename in [
+                ('json_filename', 'jobs.json'), ('http_cache_filename', 'http_cache.json'), ('changelog_dir', 'changelog'),
+                ('checkpoint_filename', 'checkpoint.jsonl'), ('tombstones_filename', 'removed.json'), ('spool_filename', 'spool.gz')]}
+
+            def crawl(store):
+                details, not_modified = server.detail_request_count, server.not_modified_count
+                jobs, changes = run_crawl(store, server.listing_urls, engine=engine, schedule=False, **paths)
+                return jobs, changes, server.detail_request_count - details, server.not_modified_count - not_modified
+
+            with JobStore(os.path.join(tmp, 'jobs.db')) as store:
+                jobs, changes, first_details, _ = crawl(store)
+                assert len(changes.new) == len(jobs) > 0
+                rows = stored_rows(store)
+                # updated_at은 초 단위이므로 다시 쓰면 값이 달라지도록 기다림
+                time.sleep(1.1)
+
+                start = time.perf_counter()
+                _, changes, second_details, second_not_modified = crawl(store)
+                second_time = time.perf_counter() - start
+                assert second_details == len(jobs), f"{second_details} detail requests for {len(jobs)} jobs"
+                assert second_not_modified == second_details, \
+                    f"only {second_not_modified}/{second_details} detail requests were answered with 304"
+                assert not changes.new and not changes.updated and not changes.removed, changes
+                assert stored_rows(store) == rows, "second crawl rewrote stored jobs"
+
+                server.update_job(jobs[0]['job_id'], subject_area='Changed subject area')
+                _, changes, details, not_modified = crawl(store)
+                assert changes.updated == [jobs[0]['job_id']] and not changes.new, changes
+                assert not_modified == details - 1, f"{details - not_modified} full responses after one change"
+
+        print(f"  {engine:6s} {len(jobs)} jobs: first crawl {first_details} full pages, "
+              f"second crawl {second_not_modified}/{second_details} answered 304 in {second_time:.2f}s with 0 jobs rewritten, "
+              f"1 changed posting -> {details - not_modified} full page")
+
+
+def bench_job_memory(size):
+    # 저장소에서 읽은 것처럼 JSON 문자열에서 만든 공고 size개를 dict와 Job 레코드로 각각 들고 있을 때의 메모리
+    from crawling import normalize_job
+    from job import Job
+    from store import dump_job
+
+    rows = [dump_job(normalize_job(job)) for job in processed_jobs(size)]
+
+    def hold(convert):
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            jobs = [convert(row) for row in rows]
+            elapsed = time.perf_counter() - start
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return jobs, current, elapsed
+
+    dicts, dict_bytes, dict_time = hold(json.loads)
+    records, record_bytes, record_time = hold(lambda row: Job.from_dict(json.loads(row)))
+    assert [record.to_dict() for record in records] == dicts, "Job.to_dict() 결과가 원래 dict와 다릅니다"
+    _, to_dict_time = timed(lambda: [record.to_dict() for record in records])
+
+    print(f"[job_memory] {size} jobs loaded from JSON")
+    print(f"  dict  {dict_bytes / size:8.0f} bytes/job  {dict_bytes / 2**20:7.1f}MiB  load {dict_time:6.2f}s")
+    print(f"  Job   {record_bytes / size:8.0f} bytes/job  {record_bytes / 2**20:7.1f}MiB  load {record_time:6.2f}s  "
+          f"({dict_bytes / record_bytes:.1f}x smaller)")
+    print(f"  to_dict {size / to_dict_time:10.0f} jobs/s")
+
+
+def bench_spool(num_pages, workers_list, parser_backend):
+    # 스풀에 상세 페이지 원본을 쌓은 뒤, 파싱 프로세스 수를 늘려 가며 오프라인 재파싱 처리량 측정
+    import itertools
+    import crawling
+    from spool import HtmlSpool
+
+    if parser_backend:
+        crawling.set_parser_backend(parser_backend)
+    pages = [content for _, content in sorted(load_detail_pages().items())]
+    with tempfile.TemporaryDirectory() as tmp:
+        with HtmlSpool(os.path.join(tmp, 'spool.gz')) as spool:
+            raw_size = 0
+            start = time.perf_counter()
+            for i in range(num_pages):
+                content = pages[i % len(pages)]
+                raw_size += len(content)
+                spool.append(f"https://academicjobsonline.org/ajo/jobs/{i}", content)
+            write_time = time.perf_counter() - start
+            locations = list(spool.index.values())
+            spool_size = os.path.getsize(spool.filename)
+
+            print(f"[spool] {num_pages} pages, {os.cpu_count()} CPUs, parser {crawling.PARSER_BACKEND}")
+            print(f"  write  {num_pages / write_time:10.1f} pages/s  {raw_size / 2**20:.1f}MiB -> {spool_size / 2**20:.1f}MiB")
+
+            _, inline_time = timed(lambda: [crawling.parse_spooled(spool.filename, offset, length, crawling.PARSER_BACKEND)
+                                            for offset, length in locations])
+            print(f"  parse in-process     {num_pages / inline_time:10.1f} pages/s")
+            for workers in workers_list:
+                with crawling.parse_process_pool(workers) as pool:
+                    _, elapsed = timed(lambda: list(pool.map(
+                        crawling.parse_spooled, itertools.repeat(spool.filename), [offset for offset, _ in locations],
+                        [length for _, length in locations], itertools.repeat(crawling.PARSER_BACKEND), chunksize=64)))
+                print(f"  parse {workers:2d} processes   {num_pages / elapsed:10.1f} pages/s  ({inline_time / elapsed:.2f}x)")
+
+
+def simulate_recrawl(jobs, days, hot_fraction, hot_churn, churn, new_per_day, start, budget, scheduled):
+    # 하루에 한 번 크롤링하는 상황을 days일 동안 흉내 냄. 매일 일부 공고의 상세 페이지가 바뀌고 새 공고가 올라옴.
+    # 상세 페이지만 바뀐 공고를 놓친 일수(stale)와 상세 페이지 요청 수를 반환
+    from crawling import ListingLog, crawl_physics_postdocs
+    from job import Job
+    from scheduler import RecrawlScheduler
+    from store import JobStore
+
+    rng = random.Random(0)
+    hot = {job['job_id'] for job in jobs[:int(len(jobs) * hot_fraction)]}
+    next_id = 10000 + len(jobs)
+    stale_days = 0
+    with MockAJOServer([dict(job) for job in jobs], per_page=100) as server, tempfile.TemporaryDirectory() as tmp, \
+            JobStore(os.path.join(tmp, 'jobs.db')) as store:
+        for day in range(days):
+            now = start + timedelta(days=day)
+            if day:
+                for job_id, job in list(server.jobs.items()):
+                    if rng.random() < (hot_churn if job_id in hot else churn):
+                        server.update_job(job_id, subject_area=f"{job['subject_area'].split(' #')[0]} #{day}")
+                for _ in range(new_per_day):
+                    job = dict(jobs[next_id % len(jobs)], job_id=str(next_id))
+                    server.add_job(job)
+                    next_id += 1
+
+            existing_jobs_dict = {job.job_id: job for job in map(Job.from_dict, store.iter_jobs())}
+            scheduler = RecrawlScheduler(store.load_schedule(), existing_jobs_dict, budget, now=now) if scheduled else None
+            listing_log = ListingLog()
+            crawled = crawl_physics_postdocs(server.listing_urls, existing_jobs_dict, scheduler=scheduler, listing_log=listing_log)
+            store.upsert_jobs(crawled, listed_ids=listing_log.listed_ids())
+            if scheduler:
+                store.save_schedule(scheduler.updated)
+
+            stale_days += sum(1 for job in crawled if job['subject_area'] != server.jobs[job['job_id']]['subject_area'])
+        return server.detail_request_count, stale_days
+
+
+def bench_schedule(num_jobs, days, hot_fraction, hot_churn, churn, new_per_day, budget):
+    # 마감일을 시뮬레이션 시작 시점부터 0~90일 뒤로 고르게 분산
+    start = datetime.now(timezone.utc)
+    jobs = make_jobs(num_jobs)
+    for i, job in enumerate(jobs):
+        job['deadline'] = f"(deadline {start + timedelta(days=i % 90):%Y/%m/%d} 11:59PM)"
+
+    print(f"[schedule] {num_jobs} postings x {days} daily crawls, {hot_fraction:.0%} hot postings changing {hot_churn:.0%}/day, "
+          f"others {churn:.0%}/day, {new_per_day} new/day")
+    for name, scheduled, run_budget in (('full recrawl', False, None), ('scheduled', True, None), (f'budget {budget}', True, budget)):
+        (requests_total, stale_days), elapsed = timed(simulate_recrawl, jobs, days, hot_fraction, hot_churn, churn, new_per_day,
+                                                      start, run_budget, scheduled)
+        print(f"  {name:13s} {requests_total:7d} detail requests ({requests_total / days:7.1f}/day)  "
+              f"{stale_days:6d} stale job-days  {elapsed:6.2f}s")
+
+
+# 전체 파이프라인 벤치마크 단계 (실행 순서). store는 크롤링 결과를 SQLite 저장소에 반영하는 단계
+SUITE_STAGES = ['crawl', 'store', 'post_process', 'render', 'excel']
+# 지연 비율을 보고할 히스토그램
+SUITE_LATENCIES = ['http_request_seconds', 'parse_listing_seconds', 'parse_detail_seconds']
+
+
+def peak_rss_mb():
+    import resource
+
+    # 프로세스 시작 이후 최대 RSS (Linux는 KiB, macOS는 byte 단위)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+def load_fixture_details():
+    details = []
+    for filename in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'detail_*.html'))):
+        with open(filename, 'r', encoding='utf-8') as f:
+            details.append(f.read())
+    return details
+
+
+def suite_run(urls, engine, workers):
+    # 별도 프로세스에서 실행되므로 단계가 끝날 때마다 잰 최대 RSS가 그 단계까지의 최대 메모리
+    import convert
+    import post_process
+    import render
+    from crawling import crawl_physics_postdocs
+    from crawling_async import crawl_physics_postdocs_async_run
+    from metrics import METRICS
+    from store import JobStore
+
+    stages = {}
+
+    def stage(name, func, *args):
+        result, elapsed = timed(func, *args)
+        stages[name] = {'seconds': elapsed, 'rss_mb': peak_rss_mb()}
+        return result
+
+    METRICS.reset()
+    if engine == 'async':
+        jobs = stage('crawl', crawl_physics_postdocs_async_run, urls, {})
+    else:
+        jobs = stage('crawl', crawl_physics_postdocs, urls, {}, None, None, workers)
+    with tempfile.TemporaryDirectory() as tmp, JobStore(os.path.join(tmp, 'jobs.db')) as store:
+        stage('store', store.upsert_jobs, jobs, {job['job_id'] for job in jobs})
+        processed = stage('post_process', post_process.run_post_process, store,
+                          os.path.join(tmp, 'processed.json'), os.path.join(tmp, 'location_cache.json'))
+        stage('render', render.render_jobs, processed, os.path.join(tmp, 'jobs.html'), os.path.join(tmp, 'search_index.json'))
+        stage('excel', convert.jobs_to_excel, processed, os.path.join(tmp, 'jobs.xlsx'))
+
+    histograms = METRICS.report()['histograms']
+    latencies = {name: {'p50': histograms[name]['p50'], 'p99': histograms[name]['p99']}
+                 for name in SUITE_LATENCIES if name in histograms}
+    return {'jobs': len(jobs), 'stages': stages, 'latencies': latencies}
+
+
+def median_run(runs):
+    # 반복 실행 결과를 단계별 중앙값으로 합침. spread(가장 느린 실행과 가장 빠른 실행의 차이)는 기준 비교에서 잡음 폭으로 씀
+    merged = {'jobs': runs[0]['jobs'], 'stages': {}, 'latencies': {}}
+    for name in runs[0]['stages']:
+        merged['stages'][name] = {key: statistics.median(run['stages'][name][key] for run in runs)
+                                  for key in ('seconds', 'rss_mb')}
+        seconds = [run['stages'][name]['seconds'] for run in runs]
+        merged['stages'][name]['spread'] = max(seconds) - min(seconds)
+    for name in runs[0]['latencies']:
+        merged['latencies'][name] = {key: statistics.median(run['latencies'][name][key] for run in runs)
+                                     for key in ('p50', 'p99')}
+    return merged
+
+
+def compare_baseline(results, baseline, tolerance, min_seconds):
+    # 기준보다 tolerance 비율에 측정 잡음(기준과 이번 실행의 spread 중 큰 값)을 더한 것 이상 느려지거나
+    # (min_seconds 미만 차이는 무시) 메모리를 더 쓰면 회귀
+    regressions = []
+    for size, result in results.items():
+        base = baseline.get(size)
+        if base is None:
+            print(f"  {size:>6} jobs: no baseline")
+            continue
+        for name, current in result['stages'].items():
+            previous = base['stages'].get(name)
+            if previous is None:
+                continue
+            seconds, base_seconds = current['seconds'], previous['seconds']
+            noise = max(previous.get('spread', 0.0), current.get('spread', 0.0))
+            if seconds > base_seconds * (1 + tolerance) + noise and seconds - base_seconds > min_seconds:
+                regressions.append(f"{size} jobs {name}: {base_seconds:.3f}s -> {seconds:.3f}s (noise {noise:.3f}s)")
+            if current['rss_mb'] > previous['rss_mb'] * (1 + tolerance):
+                regressions.append(f"{size} jobs {name}: peak RSS {previous['rss_mb']:.1f}MiB -> {current['rss_mb']:.1f}MiB")
+    return regressions
+
+
+def bench_suite(sizes, latency, error_rate, engine, workers, pages, repeat, baseline_filename, save_baseline, tolerance, min_seconds):
+    import concurrent.futures
+    import multiprocessing
+
+    if (baseline_filename or save_baseline) and repeat < 3:
+        # 한 번만 잰 결과는 잡음 폭을 알 수 없어 기준 비교에 쓰지 않음
+        print(f"  --repeat {repeat} is too few to compare against a baseline; using 3")
+        repeat = 3
+    details = load_fixture_details() if pages == 'fixtures' else None
+    config = {'latency': latency, 'error_rate': error_rate, 'engine': engine, 'workers': workers, 'pages': pages}
+    print(f"[suite] {engine} engine, {pages} pages, {latency * 1000:.0f}ms latency, {error_rate:.1%} errors, median of {repeat}")
+
+    results = {}
+    # 가짜 서버는 이 프로세스에서, 측정 대상 파이프라인은 매번 새 프로세스(spawn)에서 실행해 RSS가 섞이지 않게 함
+    context = multiprocessing.get_context('spawn')
+    for size in sizes:
+        runs = []
+        for i in range(repeat):
+            with MockAJOServer(make_jobs(size), latency=latency, per_page=100, categories=(3, 4),
+                               error_rate=error_rate, detail_pages=details, seed=i) as server:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    runs.append(executor.submit(suite_run, server.listing_urls, engine, workers).result())
+                errors = server.error_count
+        result = results[str(size)] = median_run(runs)
+
+        total = sum(stage['seconds'] for stage in result['stages'].values())
+        print(f"  {size:>6} postings -> {result['jobs']} jobs, end-to-end {total:.2f}s ({result['jobs'] / total:.1f} jobs/s), "
+              f"{errors} injected errors")
+        for name, stage in result['stages'].items():
+            print(f"    {name:12s} {stage['seconds']:8.3f}s ±{stage['spread']:.3f}s {result['jobs'] / stage['seconds']:10.1f} jobs/s  "
+                  f"peak RSS {stage['rss_mb']:7.1f}MiB")
+        for name, latency_stats in result['latencies'].items():
+            print(f"    {name:24s} p50 {latency_stats['p50'] * 1000:8.2f}ms  p99 {latency_stats['p99'] * 1000:8.2f}ms")
+
+    if save_baseline:
+        with open(save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'config': config, 'results': results}, f, indent=2)
+        print(f"  baseline saved: {save_baseline}")
+    if baseline_filename:
+        with open(baseline_filename, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['config'] != config:
+            print(f"  warning: baseline was recorded with {baseline['config']}")
+        regressions = compare_baseline(results, baseline['results'], tolerance, min_seconds)
+        if regressions:
+            print(f"  REGRESSION against {baseline_filename} (tolerance {tolerance:.0%}):")
+            for line in regressions:
+                print(f"    {line}")
+            sys.exit(1)
+        print(f"  no regression against {baseline_filename} (tolerance {tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    engines = subparsers.add_parser('engines', help='ThreadPoolExecutor 경로와 asyncio 경로 비교')
+    engines.add_argument('--jobs', type=int, default=1000)
+    engines.add_argument('--latency', type=float, default=0.05)
+    engines.add_argument('--workers', type=int, default=10)
+    engines.add_argument('--concurrency', type=int, default=200)
+
+    parsers = subparsers.add_parser('parsers', help='상세 페이지 파서 백엔드별 결과 일치 확인 및 페이지당 파싱 시간')
+    parsers.add_argument('--repeat', type=int, default=200)
+
+    store = subparsers.add_parser('store', help='JSON 파일 읽기/쓰기와 SQLite 저장소 비교')
+    store.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+
+    post_process = subparsers.add_parser('post_process', help='post_process 전체 처리와 증분 처리 비교')
+    post_process.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+
+    locations = subparsers.add_parser('locations', help='위치 -> 국가 해석 처리량 (기존 마지막 토큰 방식과 색인 방식)')
+    locations.add_argument('--size', type=int, default=100000)
+
+    diff = subparsers.add_parser('diff', help='공고 변경 감지(diff) 속도 비교')
+    diff.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    diff.add_argument('--legacy-limit', type=int, default=10000, help='이 크기까지만 O(n^2) 기존 방식도 측정')
+
+    render_parser = subparsers.add_parser('render', help='HTML 렌더링 시간/메모리')
+    render_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+
+    search = subparsers.add_parser('search', help='검색 색인 생성 시간/크기와 질의 지연 (python, node가 있으면 브라우저 코드도)')
+    search.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    search.add_argument('--repeat', type=int, default=20, help='질의마다 반복 횟수')
+
+    excel = subparsers.add_parser('excel', help='Excel 내보내기 시간/메모리')
+    excel.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    excel.add_argument('--legacy-limit', type=int, default=50000, help='이 크기까지만 기존 방식도 측정')
+
+    export = subparsers.add_parser('export', help='내보내기 형식별 쓰기/읽기 시간')
+    export.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+
+    deadline = subparsers.add_parser('deadline', help='마감일 기준 정렬 시간 (해석 방식별)')
+    deadline.add_argument('--size', type=int, default=100000)
+
+    relevance = subparsers.add_parser('relevance', help='관련 공고 판단의 정밀도/재현율과 처리량')
+    relevance.add_argument('--size', type=int, default=100000)
+    relevance.add_argument('--keyword-counts', type=int, nargs='+', default=[10, 100, 500])
+
+    resume = subparsers.add_parser('resume', help='크롤링을 중간에 죽였다가 --resume으로 이어서 끝내는지 확인')
+    resume.add_argument('--jobs', type=int, default=300)
+    resume.add_argument('--latency', type=float, default=0.05)
+    resume.add_argument('--kill-after', type=int, default=100, help='체크포인트에 이만큼 공고가 기록되면 프로세스를 죽임')
+    resume.add_argument('--engine', choices=['thread', 'async'], default='thread')
+
+    suite = subparsers.add_parser('suite', help='가짜 서버를 상대로 크롤링부터 Excel까지 단계별 처리량/지연/최대 RSS 측정 및 기준과 비교')
+    suite.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='합성할 공고 수 (1k~100k)')
+    suite.add_argument('--latency', type=float, default=0.01)
+    suite.add_argument('--error-rate', type=float, default=0.01, help='가짜 서버가 503으로 응답할 요청 비율')
+    suite.add_argument('--engine', choices=['thread', 'async'], default='thread')
+    suite.add_argument('--workers', type=int, default=10)
+    suite.add_argument('--pages', choices=['synthetic', 'fixtures'], default='fixtures',
+                       help='상세 페이지: fixtures/의 익명화된 실제 페이지 또는 합성 페이지')
+    suite.add_argument('--repeat', type=int, default=3, help='반복 횟수 (단계별 중앙값 사용, 기준과 비교/저장할 때는 최소 3)')
+    suite.add_argument('--baseline', help='비교할 기준 결과 파일. 회귀가 있으면 종료 코드 1')
+    suite.add_argument('--save-baseline', help='이번 결과를 기준 파일로 저장')
+    suite.add_argument('--tolerance', type=float, default=0.25, help='회귀로 보지 않을 증가 비율')
+    suite.add_argument('--min-seconds', type=float, default=0.1, help='이보다 작은 시간 차이는 무시')
+
+    http_cache = subparsers.add_parser('http_cache', help='HTTP 캐시가 찬 상태로 두 번째 크롤링이 304만 받고 공고를 다시 쓰지 않는지 확인')
+    http_cache.add_argument('--jobs', type=int, default=300)
+    http_cache.add_argument('--engines', nargs='+', choices=['thread', 'async'], default=['thread', 'async'])
+
+    schedule = subparsers.add_parser('schedule', help='매일 전체 재크롤링과 마감일 기반 재확인 일정의 요청 수/놓친 변경 비교')
+    schedule.add_argument('--jobs', type=int, default=500)
+    schedule.add_argument('--days', type=int, default=14)
+    schedule.add_argument('--hot-fraction', type=float, default=0.1, help='자주 바뀌는 공고 비율')
+    schedule.add_argument('--hot-churn', type=float, default=0.3, help='자주 바뀌는 공고가 하루에 바뀔 확률')
+    schedule.add_argument('--churn', type=float, default=0.01, help='나머지 공고가 하루에 바뀔 확률')
+    schedule.add_argument('--new-per-day', type=int, default=10)
+    schedule.add_argument('--budget', type=int, default=50, help='예산을 둔 실행의 하루 상세 페이지 요청 수')
+
+    job_memory = subparsers.add_parser('job_memory', help='공고를 dict와 Job 레코드로 들고 있을 때의 공고당 메모리')
+    job_memory.add_argument('--size', type=int, default=100000)
+
+    spool_parser = subparsers.add_parser('spool', help='원본 스풀 쓰기와 프로세스 수별 재파싱 처리량')
+    spool_parser.add_argument('--pages', type=int, default=20000)
+    spool_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    spool_parser.add_argument('--parser', help='파서 백엔드 (기본: crawling.PARSER_BACKEND)')
+
+    args = parser.parse_args()
+    if args.benchmark == 'engines':
+        bench_engines(args.jobs, args.latency, args.workers, args.concurrency)
+    elif args.benchmark == 'parsers':
+        bench_parsers(args.repeat)
+    elif args.benchmark == 'store':
+        bench_store(args.sizes)
+    elif args.benchmark == 'post_process':
+        bench_post_process(args.sizes)
+    elif args.benchmark == 'locations':
+        bench_locations(args.size)
+    elif args.benchmark == 'diff':
+        bench_diff(args.sizes, args.legacy_limit)
+    elif args.benchmark == 'render':
+        bench_render(args.sizes)
+    elif args.benchmark == 'search':
+        bench_search(args.sizes, args.repeat)
+    elif args.benchmark == 'excel':
+        bench_excel(args.sizes, args.legacy_limit)
+    elif args.benchmark == 'export':
+        bench_export(args.sizes)
+    elif args.benchmark == 'deadline':
+        bench_deadline(args.size)
+    elif args.benchmark == 'relevance':
+        bench_relevance(args.size, args.keyword_counts)
+    elif args.benchmark == 'resume':
+        bench_resume(args.jobs, args.latency, args.kill_after, args.engine)
+    elif args.benchmark == 'http_cache':
+        bench_http_cache(args.jobs, args.engines)
+    elif args.benchmark == 'schedule':
+        bench_schedule(args.jobs, args.days, args.hot_fraction, args.hot_churn, args.churn, args.new_per_day, args.budget)
+    elif args.benchmark == 'job_memory':
+        bench_job_memory(args.size)
+    elif args.benchmark == 'spool':
+        bench_spool(args.pages, args.workers, args.parser)
+    elif args.benchmark == 'suite':
+        bench_suite(args.sizes, args.latency, args.error_rate, args.engine, args.workers, args.pages, args.repeat,
+                    args.baseline, args.save_baseline, args.tolerance, args.min_seconds)
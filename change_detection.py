@@ -0,0 +1,70 @@
+import hashlib
+import itertools
+import json
+import os
+from collections import namedtuple
+from datetime import datetime, timezone
+
+CHANGELOG_DIR = "data/changelog"
+
+Diff = namedtuple('Diff', ['new', 'updated', 'removed', 'unchanged'])
+
+
+def fingerprint(job):
+    # 키 순서와 무관하게 같은 내용이면 같은 값이 나오는 안정적인 내용 해시.
+    # 문자열/문자열 목록은 구분자로 이어 붙이고, 그 외 값만 JSON으로 직렬화 (json.dumps 전체보다 2배 이상 빠름)
+    parts = []
+    for key in sorted(job):
+        value = job[key]
+        if value.__class__ is str:
+            parts.append(key + '\x1e' + value)
+        elif value.__class__ is list and all(item.__class__ is str for item in value):
+            parts.append(key + '\x1d' + '\x1f'.join(value))
+        else:
+            parts.append(key + '\x1c' + json.dumps(value, ensure_ascii=False, sort_keys=True))
+    data = '\x1e'.join(parts).encode('utf-8', 'surrogatepass')
+    return hashlib.md5(data, usedforsecurity=False).hexdigest()
+
+
+def diff_jobs(old_fingerprints, jobs):
+    # old_fingerprints: {job_id: fingerprint}. 해시 맵 조회만으로 한 번에 분류
+    new, updated, unchanged = [], [], []
+    fingerprints = {}
+    for job in jobs:
+        job_id = job['job_id']
+        current = fingerprint(job)
+        fingerprints[job_id] = current
+        previous = old_fingerprints.get(job_id)
+        if previous is None:
+            new.append(job_id)
+        elif previous != current:
+            updated.append(job_id)
+        else:
+            unchanged.append(job_id)
+    removed = [job_id for job_id in old_fingerprints if job_id not in fingerprints]
+    return Diff(new, updated, removed, unchanged), fingerprints
+
+
+def write_changelog(diff, directory=CHANGELOG_DIR, expired=()):
+    # 실행마다 바뀐 job_id만 담은 작은 파일 하나를 남김. expired는 이번 실행에서 마감일이 지나 활성 목록에서 빠진 공고
+    os.makedirs(directory, exist_ok=True)
+    run_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    # 파일 이름은 초 단위라 같은 초에 끝난 실행끼리 겹칠 수 있으므로, 덮어쓰지 않고(x 모드) 뒤에 -1, -2 ...를 붙임
+    stem = os.path.join(directory, run_at.replace(':', ''))
+    for counter in itertools.count():
+        filename = f"{stem}-{counter}.json" if counter else stem + '.json'
+        try:
+            f = open(filename, 'x', encoding='utf-8')
+        except FileExistsError:
+            continue
+        break
+    with f:
+        json.dump({
+            'run_at': run_at,
+            'new': diff.new,
+            'updated': diff.updated,
+            'removed': diff.removed,
+            'expired': list(expired),
+            'unchanged': len(diff.unchanged),
+        }, f, ensure_ascii=False)
+    return filename
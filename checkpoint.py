@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+CHECKPOINT_FILENAME = "data/crawl_checkpoint.jsonl"
+# 매 기록마다 flush(프로세스가 죽어도 남음)하고, fsync(전원 문제 대비)는 이 간격(초)마다 한 번
+FSYNC_INTERVAL = 1.0
+
+
+# 크롤링 진행 상황을 한 줄에 레코드 하나씩 덧붙이는 로그.
+#   {"type": "epoch", ...}    크롤링 시작 (시작 URL, 시각)
+#   {"type": "entry", ...}    목록 페이지에서 파싱한 공고 하나 (파싱하는 대로 기록)
+#   {"type": "listing", ...}  파싱이 끝난 목록 페이지의 링크 (와 entries가 없으면 앞선 entry 레코드들) -> 아직 job 레코드가 없는 공고가 진행 중이던 작업
+#   {"type": "job", ...}      상세 페이지까지 끝난 공고와 그 HTTP 캐시 항목
+# 크롤링이 끝까지 성공하면 파일을 지우므로, 파일이 남아 있다는 것은 중단된 크롤링이 있다는 뜻
+class CrawlCheckpoint:
+    def __init__(self, filename, urls, resume=False):
+        self.filename = filename
+        self.urls = list(urls)
+        self.lock = threading.Lock()
+        self.listings = {}
+        self.jobs = {}
+        self.cache_entries = {}
+        self.epoch = None
+        self.last_fsync = time.monotonic()
+
+        if resume:
+            self._load()
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.epoch is None:
+            # 이어서 할 크롤링이 없으면 새 epoch로 시작
+            self.listings, self.jobs, self.cache_entries = {}, {}, {}
+            self.epoch = datetime.now(timezone.utc).isoformat(timespec='seconds')
+            self.file = open(filename, 'w', encoding='utf-8')
+            self._append({'type': 'epoch', 'epoch': self.epoch, 'urls': self.urls})
+        else:
+            self.file = open(filename, 'a', encoding='utf-8')
+
+    def _load(self):
+        if not os.path.exists(self.filename):
+            return
+        valid_size = 0
+        # listing 레코드가 나오기 전의 entry 레코드 (url -> job_id -> entry). 목록 도중에 죽었으면 그 목록은 다시 받음
+        partial = {}
+        with open(self.filename, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError
+                    record = json.loads(line)
+                except ValueError:
+                    # 기록 도중에 죽어서 잘린 마지막 줄
+                    break
+                valid_size += len(line)
+                kind = record.get('type')
+                if kind == 'epoch':
+                    if record.get('urls') != self.urls:
+                        # 다른 URL로 시작한 크롤링은 이어서 하지 않음
+                        return
+                    self.epoch = record['epoch']
+                elif kind == 'entry':
+                    # 같은 목록을 여러 실행에 걸쳐 다시 받았으면 같은 공고가 여러 번 기록되어 있음
+                    partial.setdefault(record['url'], {})[record['entry'][0]] = tuple(record['entry'])
+                elif kind == 'listing':
+                    if 'entries' in record:
+                        entries = [tuple(entry) for entry in record['entries']]
+                    else:
+                        entries = list(partial.pop(record['url'], {}).values())
+                    self.listings[record['url']] = (entries, record['links'])
+                elif kind == 'job':
+                    self.jobs[record['job']['job_id']] = record['job']
+                    if record.get('cache'):
+                        self.cache_entries[record['job']['job_url']] = record['cache']
+        if self.epoch:
+            # 잘린 줄 뒤에 이어 쓰지 않도록 온전한 레코드까지만 남김
+            os.truncate(self.filename, valid_size)
+            print(f"이전 크롤링({self.epoch})을 이어서 진행합니다: 목록 {len(self.listings)}개, 공고 {len(self.jobs)}개 완료")
+
+    def _append(self, record):
+        with self.lock:
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self.file.flush()
+            now = time.monotonic()
+            if now - self.last_fsync >= FSYNC_INTERVAL:
+                os.fsync(self.file.fileno())
+                self.last_fsync = now
+
+    def record_entry(self, url, entry):
+        self._append({'type': 'entry', 'url': url, 'entry': entry})
+
+    def record_listing(self, url, entries, links):
+        # entries가 None이면 그 목록의 공고는 앞서 record_entry로 하나씩 기록해 둔 것
+        record = {'type': 'listing', 'url': url, 'links': links}
+        if entries is not None:
+            record['entries'] = entries
+        self._append(record)
+
+    def record_job(self, job, http_cache=None):
+        cache_entry = http_cache.get(job['job_url']) if http_cache else None
+        self._append({'type': 'job', 'job': job, 'cache': cache_entry})
+
+    def restore_cache(self, http_cache):
+        # 이전 실행에서 받은 상세 페이지의 검증자를 HTTP 캐시에 다시 넣음 (캐시 파일은 크롤링이 끝나야 저장되므로)
+        if http_cache:
+            http_cache.merge(self.cache_entries)
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+
+    def complete(self):
+        # 크롤링 결과가 저장소에 반영된 뒤 호출. 다음 --resume은 새 epoch로 시작
+        self.close()
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
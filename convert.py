@@ -1,95 +1,103 @@
 import json
+import os
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 from openpyxl.styles.alignment import Alignment
-from datetime import datetime
-import re
+from openpyxl.utils import get_column_letter
+from deadline import job_deadline, to_datetime
+from store import DB_FILENAME, JobStore
 
-def parse_deadline(deadline_str):
-    if not deadline_str:
-        return None
-
-    # 괄호와 공백 제거
-    deadline_str = deadline_str.strip('() ')
-
-    # 'deadline ' 문자열 제거
-    deadline_str = deadline_str.replace('deadline ', '')
-
-    # 'No deadline specified' 처리
-    if deadline_str.lower() == 'no deadline specified':
-        return None
-
-    # 'offers accepted', 'accepting applications' 등의 특수 케이스 처리
-    special_cases = ['offers accepted', 'accepting applications', 'filled', 'withdrawn']
-    for case in special_cases:
-        if case in deadline_str.lower():
-            deadline_str = deadline_str.lower().replace(case, '').strip(', ')
-            break
-
-    # 날짜 추출을 위한 정규표현식
-    date_pattern = r'(\d{4}/\d{1,2}/\d{1,2})'
-    match = re.search(date_pattern, deadline_str)
-    
-    if match:
-        date_str = match.group(1)
-        try:
-            return datetime.strptime(date_str, '%Y/%m/%d')
-        except ValueError:
-            print(f"Warning: Could not parse date: {date_str}")
-            return None
-    else:
-        print(f"Warning: No valid date found in: {deadline_str}")
-        return None
+INPUT_FILENAME = 'data/physics_postdocs_updated.json'
+EXCEL_FILENAME = 'data/physics_postdocs_updated.xlsx'
 
 def json_to_excel(json_file, excel_file):
     # JSON 파일 읽기
     with open(json_file, 'r', encoding='utf-8') as file:
         data = json.load(file)
+    jobs_to_excel(data, excel_file)
 
-    # 새 워크북 생성
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Physics Postdocs"
-
-    # 헤더 작성
-    headers = list(data[0].keys())
-    for col, header in enumerate(headers, start=1):
-        ws.cell(row=1, column=col, value=header)
-        ws.cell(row=1, column=col).font = Font(bold=True)
+def jobs_to_excel(data, excel_file):
+    # write-only 워크북: 셀 객체를 메모리에 쌓지 않고 행 단위로 바로 기록.
+    # data는 공고 dict의 리스트뿐 아니라 제너레이터 등 한 번만 훑을 수 있는 iterable이어도 됨
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Physics Postdocs")
 
-    # 데이터 작성
-    for row, item in enumerate(data, start=2):
-        for col, (key, value) in enumerate(item.items(), start=1):
-            cell = ws.cell(row=row, column=col)
-            if key == 'deadline':
-                parsed_date = parse_deadline(value)
-                if parsed_date:
-                    cell.value = parsed_date
-                    cell.number_format = 'YYYY-MM-DD'
-                else:
-                    cell.value = value  # 원본 문자열 유지
-            elif key == 'application_materials' and isinstance(value, list):
-                cell.value = '\n'.join(f'• {material}' for material in value)
-                cell.alignment = Alignment(wrapText=True, vertical='top')
-            else:
-                cell.value = value
+    # write-only 시트는 첫 행을 쓰기 전에 열 너비가 정해져 있어야 하므로 dict를 한 번 훑어 너비만 계산하고,
+    # 두 번째로 훑으며 셀로 바꾼 행을 바로 기록. 한 번만 훑을 수 있으면 dict 목록으로만 받아 둠 (셀 객체는 쌓지 않음)
+    if iter(data) is data:
+        data = list(data)
+    headers, widths = column_widths(data)
+    if headers is None:
+        print(f"Warning: No jobs to export to {excel_file}")
+        headers = []
 
     # 열 너비 자동 조정
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)  # 최대 너비를 50으로 제한
-        ws.column_dimensions[column].width = adjusted_width
+    for col, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(col)].width = min(width + 2, 50)  # 최대 너비를 50으로 제한
+
+    # 헤더와 데이터 작성. 스타일이 필요한 날짜/지원 서류 셀만 WriteOnlyCell로 감쌈
+    header_font = Font(bold=True)
+    wrap_alignment = Alignment(wrapText=True, vertical='top')
+    ws.append([styled_cell(ws, header, font=header_font) for header in headers])
+    for item in data:
+        row = []
+        for key, value in item.items():
+            parsed_date = deadline_value(item) if key == 'deadline' else None
+            if parsed_date:
+                value = styled_cell(ws, parsed_date, number_format='YYYY-MM-DD')
+            elif key == 'application_materials' and isinstance(value, list):
+                value = styled_cell(ws, materials_text(value), alignment=wrap_alignment)
+            row.append(value)
+        ws.append(row)
 
     # Excel 파일 저장
     wb.save(excel_file)
     print(f"Excel 파일이 성공적으로 생성되었습니다: {excel_file}")
 
-# 함수 실행
-json_to_excel('data/physics_postdocs_updated.json', 'data/physics_postdocs_updated.xlsx')
+def column_widths(data):
+    # 헤더(첫 공고의 키)와 열마다 가장 긴 표시 문자열 길이
+    headers = None
+    widths = []
+    for item in data:
+        if headers is None:
+            headers = list(item.keys())
+            widths = [len(header) for header in headers]
+        for col, (key, value) in enumerate(item.items()):
+            parsed_date = deadline_value(item) if key == 'deadline' else None
+            if parsed_date:
+                length = len(str(parsed_date))
+            elif key == 'application_materials' and isinstance(value, list):
+                length = len(materials_text(value))
+            else:
+                length = len(value) if value.__class__ is str else len(str(value))
+            if col == len(widths):
+                widths.append(length)
+            elif length > widths[col]:
+                widths[col] = length
+    return headers, widths
+
+def deadline_value(item):
+    # 마감일은 크롤링 때 해석해 둔 deadline_at을 그대로 사용
+    return to_datetime(job_deadline(item)[0])
+
+def materials_text(materials):
+    return '\n'.join(f'• {material}' for material in materials)
+
+def styled_cell(ws, value, font=None, alignment=None, number_format=None):
+    cell = WriteOnlyCell(ws, value=value)
+    if font:
+        cell.font = font
+    if alignment:
+        cell.alignment = alignment
+    if number_format:
+        cell.number_format = number_format
+    return cell
+
+if __name__ == "__main__":
+    # 함수 실행
+    if os.path.exists(DB_FILENAME):
+        with JobStore(DB_FILENAME) as store:
+            jobs_to_excel(store.load_processed_jobs(), EXCEL_FILENAME)
+    else:
+        json_to_excel(INPUT_FILENAME, EXCEL_FILENAME)
@@ -0,0 +1,463 @@
+import argparse
+import functools
+import re
+import unicodedata
+
+# 색인 내용(이름/별칭/행정구역)이나 해석 규칙이 바뀌면 올림. 저장된 위치 캐시와 처리 결과를 다시 만들게 함
+INDEX_VERSION = 2
+
+# ISO 3166-1 alpha-2 코드, 표시 이름, 별칭. 표시 이름이 country 필드 값이 되므로 같은 나라는 항상 같은 이름으로 묶임
+COUNTRIES = [
+    ('AD', 'Andorra'),
+    ('AE', 'United Arab Emirates', 'UAE'),
+    ('AF', 'Afghanistan'),
+    ('AG', 'Antigua and Barbuda'),
+    ('AI', 'Anguilla'),
+    ('AL', 'Albania'),
+    ('AM', 'Armenia'),
+    ('AO', 'Angola'),
+    ('AQ', 'Antarctica'),
+    ('AR', 'Argentina'),
+    ('AS', 'American Samoa'),
+    ('AT', 'Austria', 'Österreich'),
+    ('AU', 'Australia'),
+    ('AW', 'Aruba'),
+    ('AX', 'Åland Islands'),
+    ('AZ', 'Azerbaijan'),
+    ('BA', 'Bosnia and Herzegovina'),
+    ('BB', 'Barbados'),
+    ('BD', 'Bangladesh'),
+    ('BE', 'Belgium'),
+    ('BF', 'Burkina Faso'),
+    ('BG', 'Bulgaria'),
+    ('BH', 'Bahrain'),
+    ('BI', 'Burundi'),
+    ('BJ', 'Benin'),
+    ('BL', 'Saint Barthélemy'),
+    ('BM', 'Bermuda'),
+    ('BN', 'Brunei', 'Brunei Darussalam'),
+    ('BO', 'Bolivia', 'Bolivia, Plurinational State of'),
+    ('BQ', 'Caribbean Netherlands', 'Bonaire, Sint Eustatius and Saba'),
+    ('BR', 'Brazil', 'Brasil'),
+    ('BS', 'Bahamas', 'The Bahamas'),
+    ('BT', 'Bhutan'),
+    ('BV', 'Bouvet Island'),
+    ('BW', 'Botswana'),
+    ('BY', 'Belarus'),
+    ('BZ', 'Belize'),
+    ('CA', 'Canada'),
+    ('CC', 'Cocos (Keeling) Islands'),
+    ('CD', 'Democratic Republic of the Congo', 'Congo, The Democratic Republic of the', 'DR Congo'),
+    ('CF', 'Central African Republic'),
+    ('CG', 'Republic of the Congo', 'Congo'),
+    ('CH', 'Switzerland', 'Schweiz', 'Suisse'),
+    ('CI', "Côte d'Ivoire", 'Ivory Coast'),
+    ('CK', 'Cook Islands'),
+    ('CL', 'Chile'),
+    ('CM', 'Cameroon'),
+    ('CN', 'China', "People's Republic of China", 'PR China', 'PRC'),
+    ('CO', 'Colombia'),
+    ('CR', 'Costa Rica'),
+    ('CU', 'Cuba'),
+    ('CV', 'Cabo Verde', 'Cape Verde'),
+    ('CW', 'Curaçao'),
+    ('CX', 'Christmas Island'),
+    ('CY', 'Cyprus'),
+    ('CZ', 'Czechia', 'Czech Republic'),
+    ('DE', 'Germany', 'Deutschland'),
+    ('DJ', 'Djibouti'),
+    ('DK', 'Denmark'),
+    ('DM', 'Dominica'),
+    ('DO', 'Dominican Republic'),
+    ('DZ', 'Algeria'),
+    ('EC', 'Ecuador'),
+    ('EE', 'Estonia'),
+    ('EG', 'Egypt'),
+    ('EH', 'Western Sahara'),
+    ('ER', 'Eritrea'),
+    ('ES', 'Spain', 'España'),
+    ('ET', 'Ethiopia'),
+    ('FI', 'Finland'),
+    ('FJ', 'Fiji'),
+    ('FK', 'Falkland Islands', 'Falkland Islands (Malvinas)'),
+    ('FM', 'Micronesia', 'Micronesia, Federated States of'),
+    ('FO', 'Faroe Islands'),
+    ('FR', 'France'),
+    ('GA', 'Gabon'),
+    ('GB', 'United Kingdom', 'UK', 'Great Britain', 'United Kingdom of Great Britain and Northern Ireland'),
+    ('GD', 'Grenada'),
+    ('GE', 'Georgia'),
+    ('GF', 'French Guiana'),
+    ('GG', 'Guernsey'),
+    ('GH', 'Ghana'),
+    ('GI', 'Gibraltar'),
+    ('GL', 'Greenland'),
+    ('GM', 'Gambia', 'The Gambia'),
+    ('GN', 'Guinea'),
+    ('GP', 'Guadeloupe'),
+    ('GQ', 'Equatorial Guinea'),
+    ('GR', 'Greece'),
+    ('GS', 'South Georgia and the South Sandwich Islands'),
+    ('GT', 'Guatemala'),
+    ('GU', 'Guam'),
+    ('GW', 'Guinea-Bissau'),
+    ('GY', 'Guyana'),
+    ('HK', 'Hong Kong', 'Hong Kong SAR', 'Hong Kong SAR China'),
+    ('HM', 'Heard Island and McDonald Islands'),
+    ('HN', 'Honduras'),
+    ('HR', 'Croatia'),
+    ('HT', 'Haiti'),
+    ('HU', 'Hungary'),
+    ('ID', 'Indonesia'),
+    ('IE', 'Ireland', 'Republic of Ireland'),
+    ('IL', 'Israel'),
+    ('IM', 'Isle of Man'),
+    ('IN', 'India'),
+    ('IO', 'British Indian Ocean Territory'),
+    ('IQ', 'Iraq'),
+    ('IR', 'Iran', 'Iran, Islamic Republic of'),
+    ('IS', 'Iceland'),
+    ('IT', 'Italy', 'Italia'),
+    ('JE', 'Jersey'),
+    ('JM', 'Jamaica'),
+    ('JO', 'Jordan'),
+    ('JP', 'Japan'),
+    ('KE', 'Kenya'),
+    ('KG', 'Kyrgyzstan'),
+    ('KH', 'Cambodia'),
+    ('KI', 'Kiribati'),
+    ('KM', 'Comoros'),
+    ('KN', 'Saint Kitts and Nevis'),
+    ('KP', 'North Korea', "Korea, Democratic People's Republic of", 'DPRK'),
+    ('KR', 'Republic of Korea', 'Korea, The Republic of', 'Korea, Republic of', 'South Korea', 'Korea (South)', 'Korea'),
+    ('KW', 'Kuwait'),
+    ('KY', 'Cayman Islands'),
+    ('KZ', 'Kazakhstan'),
+    ('LA', 'Laos', "Lao People's Democratic Republic"),
+    ('LB', 'Lebanon'),
+    ('LC', 'Saint Lucia'),
+    ('LI', 'Liechtenstein'),
+    ('LK', 'Sri Lanka'),
+    ('LR', 'Liberia'),
+    ('LS', 'Lesotho'),
+    ('LT', 'Lithuania'),
+    ('LU', 'Luxembourg'),
+    ('LV', 'Latvia'),
+    ('LY', 'Libya'),
+    ('MA', 'Morocco'),
+    ('MC', 'Monaco'),
+    ('MD', 'Moldova', 'Moldova, Republic of'),
+    ('ME', 'Montenegro'),
+    ('MF', 'Saint Martin', 'Saint Martin (French part)'),
+    ('MG', 'Madagascar'),
+    ('MH', 'Marshall Islands'),
+    ('MK', 'North Macedonia', 'Macedonia'),
+    ('ML', 'Mali'),
+    ('MM', 'Myanmar', 'Burma'),
+    ('MN', 'Mongolia'),
+    ('MO', 'Macao', 'Macau'),
+    ('MP', 'Northern Mariana Islands'),
+    ('MQ', 'Martinique'),
+    ('MR', 'Mauritania'),
+    ('MS', 'Montserrat'),
+    ('MT', 'Malta'),
+    ('MU', 'Mauritius'),
+    ('MV', 'Maldives'),
+    ('MW', 'Malawi'),
+    ('MX', 'Mexico', 'México'),
+    ('MY', 'Malaysia'),
+    ('MZ', 'Mozambique'),
+    ('NA', 'Namibia'),
+    ('NC', 'New Caledonia'),
+    ('NE', 'Niger'),
+    ('NF', 'Norfolk Island'),
+    ('NG', 'Nigeria'),
+    ('NI', 'Nicaragua'),
+    ('NL', 'Netherlands', 'The Netherlands', 'Netherlands, Kingdom of the', 'Holland'),
+    ('NO', 'Norway'),
+    ('NP', 'Nepal'),
+    ('NR', 'Nauru'),
+    ('NU', 'Niue'),
+    ('NZ', 'New Zealand'),
+    ('OM', 'Oman'),
+    ('PA', 'Panama'),
+    ('PE', 'Peru'),
+    ('PF', 'French Polynesia'),
+    ('PG', 'Papua New Guinea'),
+    ('PH', 'Philippines'),
+    ('PK', 'Pakistan'),
+    ('PL', 'Poland'),
+    ('PM', 'Saint Pierre and Miquelon'),
+    ('PN', 'Pitcairn'),
+    ('PR', 'Puerto Rico'),
+    ('PS', 'Palestine', 'Palestine, State of'),
+    ('PT', 'Portugal'),
+    ('PW', 'Palau'),
+    ('PY', 'Paraguay'),
+    ('QA', 'Qatar'),
+    ('RE', 'Réunion'),
+    ('RO', 'Romania'),
+    ('RS', 'Serbia'),
+    ('RU', 'Russia', 'Russian Federation'),
+    ('RW', 'Rwanda'),
+    ('SA', 'Saudi Arabia'),
+    ('SB', 'Solomon Islands'),
+    ('SC', 'Seychelles'),
+    ('SD', 'Sudan'),
+    ('SE', 'Sweden'),
+    ('SG', 'Singapore'),
+    ('SH', 'Saint Helena', 'Saint Helena, Ascension and Tristan da Cunha'),
+    ('SI', 'Slovenia'),
+    ('SJ', 'Svalbard and Jan Mayen'),
+    ('SK', 'Slovakia', 'Slovak Republic'),
+    ('SL', 'Sierra Leone'),
+    ('SM', 'San Marino'),
+    ('SN', 'Senegal'),
+    ('SO', 'Somalia'),
+    ('SR', 'Suriname'),
+    ('SS', 'South Sudan'),
+    ('ST', 'Sao Tome and Principe'),
+    ('SV', 'El Salvador'),
+    ('SX', 'Sint Maarten', 'Sint Maarten (Dutch part)'),
+    ('SY', 'Syria', 'Syrian Arab Republic'),
+    ('SZ', 'Eswatini', 'Swaziland'),
+    ('TC', 'Turks and Caicos Islands'),
+    ('TD', 'Chad'),
+    ('TF', 'French Southern Territories'),
+    ('TG', 'Togo'),
+    ('TH', 'Thailand'),
+    ('TJ', 'Tajikistan'),
+    ('TK', 'Tokelau'),
+    ('TL', 'Timor-Leste', 'East Timor'),
+    ('TM', 'Turkmenistan'),
+    ('TN', 'Tunisia'),
+    ('TO', 'Tonga'),
+    ('TR', 'Türkiye', 'Turkey'),
+    ('TT', 'Trinidad and Tobago'),
+    ('TV', 'Tuvalu'),
+    ('TW', 'Taiwan', 'Taiwan, Province of China', 'Republic of China', 'Taiwan ROC'),
+    ('TZ', 'Tanzania', 'Tanzania, United Republic of'),
+    ('UA', 'Ukraine'),
+    ('UG', 'Uganda'),
+    ('UM', 'United States Minor Outlying Islands'),
+    ('US', 'United States', 'United States of America', 'USA', 'US', 'U.S.', 'U.S.A.'),
+    ('UY', 'Uruguay'),
+    ('UZ', 'Uzbekistan'),
+    ('VA', 'Holy See', 'Vatican City'),
+    ('VC', 'Saint Vincent and the Grenadines'),
+    ('VE', 'Venezuela', 'Venezuela, Bolivarian Republic of'),
+    ('VG', 'British Virgin Islands', 'Virgin Islands, British'),
+    ('VI', 'U.S. Virgin Islands', 'Virgin Islands, U.S.'),
+    ('VN', 'Vietnam', 'Viet Nam'),
+    ('VU', 'Vanuatu'),
+    ('WF', 'Wallis and Futuna'),
+    ('WS', 'Samoa'),
+    ('YE', 'Yemen'),
+    ('YT', 'Mayotte'),
+    ('ZA', 'South Africa'),
+    ('ZM', 'Zambia'),
+    ('ZW', 'Zimbabwe'),
+]
+
+# 국가명 없이 주/성 이름만 적힌 위치용. (이름, 약어) 약어가 None이면 이름만 색인.
+# 약어는 흔한 단어와 겹치므로(IN, OR, DE...) 쉼표로 나뉜 한 부분을 혼자(우편번호와 함께) 차지할 때만 인정
+SUBDIVISIONS = {
+    'US': [
+        ('Alabama', 'AL'), ('Alaska', 'AK'), ('Arizona', 'AZ'), ('Arkansas', 'AR'), ('California', 'CA'),
+        ('Colorado', 'CO'), ('Connecticut', 'CT'), ('Delaware', 'DE'), ('District of Columbia', 'DC'),
+        ('Florida', 'FL'), ('Georgia', 'GA'), ('Hawaii', 'HI'), ('Idaho', 'ID'), ('Illinois', 'IL'),
+        ('Indiana', 'IN'), ('Iowa', 'IA'), ('Kansas', 'KS'), ('Kentucky', 'KY'), ('Louisiana', 'LA'),
+        ('Maine', 'ME'), ('Maryland', 'MD'), ('Massachusetts', 'MA'), ('Michigan', 'MI'), ('Minnesota', 'MN'),
+        ('Mississippi', 'MS'), ('Missouri', 'MO'), ('Montana', 'MT'), ('Nebraska', 'NE'), ('Nevada', 'NV'),
+        ('New Hampshire', 'NH'), ('New Jersey', 'NJ'), ('New Mexico', 'NM'), ('New York', 'NY'),
+        ('North Carolina', 'NC'), ('North Dakota', 'ND'), ('Ohio', 'OH'), ('Oklahoma', 'OK'), ('Oregon', 'OR'),
+        ('Pennsylvania', 'PA'), ('Rhode Island', 'RI'), ('South Carolina', 'SC'), ('South Dakota', 'SD'),
+        ('Tennessee', 'TN'), ('Texas', 'TX'), ('Utah', 'UT'), ('Vermont', 'VT'), ('Virginia', 'VA'),
+        ('Washington', 'WA'), ('West Virginia', 'WV'), ('Wisconsin', 'WI'), ('Wyoming', 'WY'),
+    ],
+    'CA': [
+        ('Alberta', 'AB'), ('British Columbia', 'BC'), ('Manitoba', 'MB'), ('New Brunswick', 'NB'),
+        ('Newfoundland and Labrador', 'NL'), ('Newfoundland', None), ('Nova Scotia', 'NS'), ('Ontario', 'ON'),
+        ('Prince Edward Island', 'PE'), ('Quebec', 'QC'), ('Saskatchewan', 'SK'),
+        ('Northwest Territories', 'NT'), ('Nunavut', 'NU'), ('Yukon', 'YT'),
+    ],
+    # WA, NT는 미국/캐나다 약어와 겹치므로 이름만
+    'AU': [
+        ('New South Wales', 'NSW'), ('Victoria', 'VIC'), ('Queensland', 'QLD'), ('South Australia', 'SA'),
+        ('Western Australia', None), ('Tasmania', 'TAS'), ('Australian Capital Territory', 'ACT'),
+        ('Northern Territory', None),
+    ],
+    'GB': [('England', None), ('Scotland', None), ('Wales', None), ('Northern Ireland', None)],
+    'CN': [
+        ('Beijing', None), ('Shanghai', None), ('Tianjin', None), ('Chongqing', None), ('Anhui', None),
+        ('Fujian', None), ('Gansu', None), ('Guangdong', None), ('Guizhou', None), ('Hainan', None),
+        ('Hebei', None), ('Heilongjiang', None), ('Henan', None), ('Hubei', None), ('Hunan', None),
+        ('Jiangsu', None), ('Jiangxi', None), ('Jilin', None), ('Liaoning', None), ('Qinghai', None),
+        ('Shaanxi', None), ('Shandong', None), ('Shanxi', None), ('Sichuan', None), ('Yunnan', None),
+        ('Zhejiang', None), ('Guangxi', None), ('Inner Mongolia', None), ('Ningxia', None),
+        ('Tibet', None), ('Xinjiang', None),
+    ],
+    'DE': [
+        ('Baden-Württemberg', None), ('Bavaria', None), ('Bayern', None), ('Berlin', None),
+        ('Brandenburg', None), ('Bremen', None), ('Hamburg', None), ('Hesse', None), ('Hessen', None),
+        ('Lower Saxony', None), ('Niedersachsen', None), ('Mecklenburg-Vorpommern', None),
+        ('North Rhine-Westphalia', None), ('Nordrhein-Westfalen', None), ('Rhineland-Palatinate', None),
+        ('Rheinland-Pfalz', None), ('Saarland', None), ('Saxony', None), ('Sachsen', None),
+        ('Saxony-Anhalt', None), ('Sachsen-Anhalt', None), ('Schleswig-Holstein', None),
+        ('Thuringia', None), ('Thüringen', None),
+    ],
+}
+
+# 색인 항목 종류
+COUNTRY = 'country'
+SUBDIVISION = 'subdivision'
+ABBREVIATION = 'abbreviation'
+# 트라이 노드에서 이름이 끝났음을 나타내는 키 (정규화된 토큰은 빈 문자열이 될 수 없음)
+TERMINAL = ''
+
+COUNTRY_NAMES = {code: name for code, name, *_ in COUNTRIES}
+# 단어(마침표/아포스트로피 포함)와 위치 구분자(쉼표, 세미콜론)
+TOKEN_PATTERN = re.compile(r"[\w.'’]+|[,;]")
+
+
+@functools.lru_cache(maxsize=65536)
+def normalize_token(token):
+    # 대소문자/악센트/마침표/아포스트로피 차이를 없앰 ('U.S.A.' -> 'usa', 'Zürich' -> 'zurich')
+    token = token.casefold().replace('.', '').replace("'", '').replace('’', '')
+    if not token.isascii():
+        token = ''.join(char for char in unicodedata.normalize('NFKD', token) if not unicodedata.combining(char))
+    return token
+
+
+def tokenize(text):
+    # (정규화된 토큰, 시작, 끝, 쉼표로 나뉜 부분 번호) 목록
+    tokens = []
+    part = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        word = match.group()
+        if word == ',' or word == ';':
+            part += 1
+            continue
+        token = normalize_token(word)
+        if token:
+            tokens.append((token, match.start(), match.end(), part))
+    return tokens
+
+
+def build_index():
+    # 첫 토큰은 루트 dict(해시 맵)에서 바로 찾고, 여러 단어 이름은 다음 토큰을 따라 내려가는 트라이.
+    # 노드의 TERMINAL 값은 (국가 코드, 종류)
+    index = {}
+
+    def add(name, code, kind):
+        node = index
+        for token, *_ in tokenize(name):
+            node = node.setdefault(token, {})
+        # Georgia처럼 국가명과 주 이름이 같으면 국가명이 우선
+        if TERMINAL not in node or (kind == COUNTRY and node[TERMINAL][1] != COUNTRY):
+            node[TERMINAL] = (code, kind)
+
+    for code, name, *aliases in COUNTRIES:
+        for alias in (name, *aliases):
+            add(alias, code, COUNTRY)
+    for code, subdivisions in SUBDIVISIONS.items():
+        for name, abbreviation in subdivisions:
+            add(name, code, SUBDIVISION)
+            if abbreviation:
+                add(abbreviation, code, ABBREVIATION)
+    return index
+
+
+INDEX = build_index()
+
+
+def covers_part(tokens, first, last):
+    # tokens[first:last + 1]이 자기 부분 전체인지 (우편번호 같은 숫자 토큰은 무시).
+    # 'Cambridge, MA 02139'의 MA는 인정, 'Rio de Janeiro'의 de나 'Jersey City'의 Jersey는 불인정
+    parts = range(tokens[first][3], tokens[last][3] + 1)
+    return all(token[3] not in parts or first <= index <= last or any(char.isdigit() for char in token[0])
+               for index, token in enumerate(tokens))
+
+
+def ends_part(tokens, last):
+    # tokens[last] 뒤로 자기 부분에 숫자 토큰만 남았는지 ('Tokyo Japan'의 Japan은 인정, 'Jersey City'의 Jersey는 불인정)
+    part = tokens[last][3]
+    return all(token[3] != part or any(char.isdigit() for char in token[0]) for token in tokens[last + 1:])
+
+
+def find_matches(tokens):
+    # 왼쪽부터 가장 긴 이름을 겹치지 않게 찾음 ('New Mexico'가 'Mexico'보다, 'Guinea-Bissau'가 'Guinea'보다 우선).
+    # 각 위치에서 트라이를 이름 길이만큼만 내려가므로 토큰 수에 비례. (시작, 끝, 코드, 종류, 첫 토큰, 마지막 토큰) 목록
+    matches = []
+    position = 0
+    while position < len(tokens):
+        node = INDEX.get(tokens[position][0])
+        best = None
+        end = position
+        while node is not None:
+            value = node.get(TERMINAL)
+            if value is not None:
+                best = (end, value)
+            end += 1
+            if end == len(tokens):
+                break
+            node = node.get(tokens[end][0])
+        if best is not None:
+            end, (code, kind) = best
+            if kind != ABBREVIATION or covers_part(tokens, position, end):
+                matches.append((tokens[position][1], tokens[end][2], code, kind, position, end))
+                position = end + 1
+                continue
+        position += 1
+    return matches
+
+
+def resolve_location(position_location):
+    # (국가명을 뺀 위치, 국가 표시 이름, ISO 코드). 쉼표로 나뉜 부분을 마지막부터 보며, 처음 이름이 나온 부분에서
+    # 국가명이 있으면 그 국가(위치에서 뺌), 없으면 주/성으로 국가를 정함. 마지막 부분의 이름은 그 부분 끝에 있을 때만,
+    # 앞쪽 부분의 이름은 그 부분 전체일 때만 인정 ('Chad Smith Hall, Boston, MA'는 미국, 'Jersey City, New Jersey'는 미국).
+    # 이름이 없으면 예전처럼 마지막 부분을 국가로 보고 코드는 비워 둠
+    cleaned_location = position_location.replace('[map]', '').strip()
+    tokens = tokenize(cleaned_location)
+    parts = {}
+    for match in find_matches(tokens):
+        # 여러 부분에 걸친 이름('Korea, Republic of')은 마지막 토큰의 부분에 속함
+        parts.setdefault(tokens[match[5]][3], []).append(match)
+    last_part = tokens[-1][3] if tokens else 0
+    for part in sorted(parts, reverse=True):
+        if part == last_part:
+            matches = [match for match in parts[part] if ends_part(tokens, match[5])]
+        else:
+            matches = [match for match in parts[part] if covers_part(tokens, match[4], match[5])]
+        countries = [match for match in matches if match[3] == COUNTRY]
+        if countries:
+            start, end, code = countries[-1][:3]
+            before, after = cleaned_location[:start].rstrip(' ,;'), cleaned_location[end:].lstrip(' ,;')
+            return ', '.join(part for part in (before, after) if part), COUNTRY_NAMES[code], code
+        if matches:
+            code = matches[-1][2]
+            return cleaned_location, COUNTRY_NAMES[code], code
+
+    parts = [part.strip() for part in cleaned_location.split(',')]
+    return ', '.join(parts[:-1]).strip(), parts[-1], ''
+
+
+def resolve_locations(locations, memo=None):
+    # 여러 위치를 한 번에 해석. 같은 위치 문자열은 한 번만 해석 (memo에 결과를 모음)
+    memo = {} if memo is None else memo
+    results = []
+    for location in locations:
+        result = memo.get(location)
+        if result is None:
+            result = memo[location] = resolve_location(location)
+        results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('locations', nargs='+', help='해석할 위치 문자열')
+    args = parser.parse_args()
+
+    for location, (cleaned_location, country, code) in zip(args.locations, resolve_locations(args.locations)):
+        print(f"{location!r} -> {cleaned_location!r}, {country!r} ({code or '?'})")
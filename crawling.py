@@ -1,17 +1,40 @@
 import requests
 from bs4 import BeautifulSoup
 import json
-from datetime import datetime
 import os
 import concurrent.futures
+import argparse
+import itertools
+import multiprocessing
+import queue
+import threading
+from urllib.parse import urljoin
+from http_cache import HttpCache
+from http_client import HttpClient, check_status
+from job import Job
+from frontier import UrlFrontier, find_listing_links
+from store import DB_FILENAME, DEFAULT_RETENTION, JobStore, RetentionPolicy
+from metrics import METRICS
+from change_detection import CHANGELOG_DIR, write_changelog
+from checkpoint import CHECKPOINT_FILENAME, CrawlCheckpoint
+from deadline import parse_deadline, sort_key as deadline_sort_key
+from relevance import KEYWORDS_FILENAME, KeywordMatcher
+from scheduler import DEFER, SKIP, RecrawlScheduler
+from spool import SPOOL_FILENAME, HtmlSpool, read_record
 
-def parse_date(date_str):
-    if 'deadline' in date_str:
-        date_str = date_str.split('deadline')[1].strip()
-    try:
-        return datetime.strptime(date_str, '%Y/%m/%d %I:%M%p')
-    except ValueError:
-        return datetime.max
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+MAX_WORKERS = 10
+LISTING_URLS = [
+    "https://academicjobsonline.org/ajo?joblist-0-0-0-3---0-dt--",
+]
+JSON_FILENAME = "data/physics_postdocs.json"
+HTTP_CACHE_FILENAME = "data/http_cache.json"
+TOMBSTONES_FILENAME = "data/physics_postdocs_removed.json"
 
 def get_application_materials(soup):
     materials = []
@@ -97,83 +120,435 @@ def extract_title(position):
     
     return title
 
-def process_job(position, institution, department, existing_jobs_dict):
+# 관련 공고 판단 기준: keywords.yaml이 있으면 그 설정, 없으면 relevance.DEFAULT_CONFIG
+KEYWORD_MATCHER = KeywordMatcher.from_file(KEYWORDS_FILENAME)
+
+def set_keywords(filename):
+    global KEYWORD_MATCHER
+    if not os.path.exists(filename):
+        raise FileNotFoundError(f"Keyword config not found: {filename}")
+    KEYWORD_MATCHER = KeywordMatcher.from_file(filename)
+
+def is_relevant(title, department):
+    # 물리학 혹은 AI 및 자연과학 관련 Post-Doctoral 포지션인지 확인
+    return KEYWORD_MATCHER.is_relevant(title=title, department=department)
+
+def parse_job_page_bs4(content):
+    # 상세 페이지 HTML(bytes)만 받아 파싱하므로 프로세스 풀에서도 실행 가능
+    job_soup = BeautifulSoup(content, 'html.parser')
+    application_materials = get_application_materials(job_soup)
+    position_location, subject_area = get_position_details(job_soup)
+    return application_materials, position_location, subject_area
+
+def _next_div_text(b):
+    # soup.find('b').parent.find_next_sibling('div').text 와 동일
+    for sibling in b.getparent().itersiblings():
+        if sibling.tag == 'div':
+            return sibling.text_content().strip()
+    return ""
+
+def _material_text(li):
+    # BeautifulSoup 경로처럼 하위 <li>가 나오기 전까지의 텍스트만 모음
+    parts = []
+
+    def walk(element):
+        if isinstance(element.tag, str) and element.text:
+            parts.append(element.text)
+        for child in element:
+            if child.tag == 'li':
+                return True
+            if walk(child):
+                return True
+            if child.tail:
+                parts.append(child.tail)
+        return False
+
+    walk(li)
+    return ' '.join(part.strip() for part in parts if part.strip())
+
+def parse_job_page_lxml(content):
+    # lxml 트리를 한 번만 만들고 <b> 라벨을 한 번 훑어서 세 항목을 모두 추출
+    try:
+        try:
+            content.decode('utf-8')
+            root = lxml.html.document_fromstring(content, parser=_LXML_UTF8_PARSER)
+        except UnicodeDecodeError:
+            root = lxml.html.document_fromstring(content)
+    except lxml.etree.ParserError:
+        # 빈 본문이나 공백/주석뿐인 페이지: BeautifulSoup 경로처럼 빈 결과
+        return [], "", ""
+
+    labels = {}
+    for b in root.iter('b'):
+        if len(b) == 0 and b.text in LABELS and b.text not in labels:
+            labels[b.text] = b
+            if len(labels) == len(LABELS):
+                break
+
+    application_materials = []
+    materials_b = labels.get('Application Materials Required:')
+    if materials_b is not None:
+        ul = materials_b.xpath('following::ul[1]')
+        if ul:
+            for li in ul[0].iter('li'):
+                # html.parser 경로는 '<li>' 문자열로 분리하므로 속성이 있는 <li>는 건너뜀
+                if li.attrib:
+                    continue
+                text = _material_text(li)
+                if text:
+                    application_materials.append(text)
+
+    location_b = labels.get('Position Location:')
+    subject_b = labels.get('Subject Area:')
+    position_location = _next_div_text(location_b) if location_b is not None else ""
+    subject_area = _next_div_text(subject_b) if subject_b is not None else ""
+    return application_materials, position_location, subject_area
+
+LABELS = ('Application Materials Required:', 'Position Location:', 'Subject Area:')
+PARSER_BACKENDS = {'bs4': parse_job_page_bs4}
+if lxml is not None:
+    _LXML_UTF8_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+    PARSER_BACKENDS['lxml'] = parse_job_page_lxml
+# 빠른 C 기반 파서가 설치되어 있으면 기본으로 사용하고, 없으면 BeautifulSoup으로 대체
+PARSER_BACKEND = 'lxml' if 'lxml' in PARSER_BACKENDS else 'bs4'
+
+def set_parser_backend(name):
+    global PARSER_BACKEND
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name} (available: {', '.join(PARSER_BACKENDS)})")
+    PARSER_BACKEND = name
+
+def parse_job_page(content):
+    with METRICS.timer('parse_detail_seconds'):
+        return PARSER_BACKENDS[PARSER_BACKEND](content)
+
+def parse_content(content, backend):
+    # 파싱 프로세스에서 실행: 지정한 백엔드로 파싱 (자식 프로세스의 PARSER_BACKEND는 기본값이므로 백엔드를 넘겨받음)
+    return PARSER_BACKENDS[backend](content)
+
+def parse_spooled(filename, offset, length, backend):
+    # 파싱 프로세스에서 실행: 스풀에서 원본을 읽어 지정한 백엔드로 파싱 (본문 대신 위치만 넘겨받음)
+    _, content = read_record(filename, offset, length)
+    return PARSER_BACKENDS[backend](content)
+
+def parse_process_pool(workers):
+    # 파싱 프로세스 풀. 크롤링 스레드(HTTP 워커, 체크포인트 등)가 도는 중에 fork하면 자식이 다른 스레드가 잡고 있던 락을
+    # 잠긴 채로 물려받을 수 있으므로, 스레드 없는 forkserver(지원하지 않는 OS에서는 spawn)에서 워커를 만듦
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method))
+
+def parse_detail(job_url, response, spool=None, parse_pool=None):
+    # 원본을 스풀에 남긴 뒤, 파싱 풀이 있으면 다른 프로세스에서 파싱.
+    # 받는 스레드는 결과를 기다리는 동안 GIL을 놓으므로 파싱이 여러 코어에서 동시에 진행됨
+    if spool is None or response.status_code != 200:
+        return parse_job_page(response.content)
+    offset, length = spool.append(job_url, response.content)
+    if parse_pool is None:
+        return parse_job_page(response.content)
+    with METRICS.timer('parse_detail_seconds'):
+        return parse_pool.submit(parse_spooled, spool.filename, offset, length, PARSER_BACKEND).result()
+
+def listing_entry(position, institution, department, base_url):
     job_id = position.find('a').text.strip('[]')
     title = extract_title(position)
     deadline = position.find('span', class_='purplesml')
     deadline = deadline.text.strip() if deadline else "No deadline specified"
+    job_url = urljoin(base_url, position.find('a')['href'])
+    return (job_id, title, deadline, job_url, institution, department)
 
-    # 물리학 혹은 AI 및 자연과학 관련 Post-Doctoral 포지션인지 확인
-    if ('physics' in title.lower() or 'physics' in department.lower() or 'artificial' in title.lower() or 'natural' in title.lower()):
-        job_url = f"https://academicjobsonline.org{position.find('a')['href']}"
+def iter_listing_entries(soup, base_url):
+    # 목록 페이지의 공고를 파싱하는 즉시 하나씩 넘겨줌 (BeautifulSoup 요소는 밖으로 내보내지 않음)
+    for listing in soup.find_all('div', class_='clr'):
+        institution = listing.find('h3').find('a').text.strip()
+        department = listing.find('h3').find_all('a')[1].text.strip() if len(listing.find('h3').find_all('a')) > 1 else ""
 
-        existing_job = existing_jobs_dict.get(job_id)
+        for position in listing.find('ol', class_='sp5').find_all('li'):
+            yield listing_entry(position, institution, department, base_url)
 
-        try:
-            job_response = requests.get(job_url)
-            job_soup = BeautifulSoup(job_response.content, 'html.parser')
-
-            application_materials = get_application_materials(job_soup)
-            position_location, subject_area = get_position_details(job_soup)
-
-            new_job_data = {
-                'institution': institution,
-                'department': department,
-                'job_id': job_id,
-                'title': title,
-                'deadline': deadline,
-                'job_url': job_url,
-                'application_materials': application_materials,
-                'position_location': position_location,
-                'subject_area': subject_area
-            }
-            normalize_job(new_job_data)
-
-            if not existing_job:
-                # 새로운 공고
-                return new_job_data
-            else:
-                normalize_job(existing_job)
-                if new_job_data != existing_job:
-                    # 업데이트된 공고
-                    return new_job_data
-                else:
-                    # 변경사항 없는 기존 공고
-                    return existing_job
-        except Exception as e:
-            print(f"Error processing job {job_id}: {e}")
-            return None
+def parse_listing(content, base_url):
+    # 목록 페이지를 파싱해 (job_id, title, deadline, job_url, institution, department) 목록과
+    # 같은 카테고리의 다른 목록 페이지(페이지네이션) 링크를 반환. 파싱 시간은 호출한 쪽에서 잼 (파싱 프로세스의 METRICS는 버려짐)
+    soup = BeautifulSoup(content, 'html.parser')
+    return list(iter_listing_entries(soup, base_url)), find_listing_links(soup, base_url)
+
+def build_job(institution, department, job_id, title, deadline, job_url, application_materials, position_location, subject_area, existing_job):
+    # 마감일은 여기서 한 번만 해석해 공고에 같이 저장하고, 이후 단계는 저장된 값으로 정렬/필터링
+    parsed_deadline = parse_deadline(deadline)
+    new_job_data = {
+        'institution': institution,
+        'department': department,
+        'job_id': job_id,
+        'title': title,
+        'deadline': deadline,
+        'deadline_at': parsed_deadline.at,
+        'deadline_status': parsed_deadline.status,
+        'job_url': job_url,
+        'application_materials': application_materials,
+        'position_location': position_location,
+        'subject_area': subject_area
+    }
+    normalize_job(new_job_data)
+
+    if not existing_job:
+        # 새로운 공고
+        return new_job_data
+    else:
+        # 저장소에서 읽은 기존 공고(Job)는 이미 정리된 상태이므로 다시 정리하지 않음
+        if isinstance(existing_job, Job):
+            existing_job = existing_job.to_dict()
+        else:
+            normalize_job(existing_job)
+        if new_job_data != existing_job:
+            # 업데이트된 공고
+            return new_job_data
+        else:
+            # 변경사항 없는 기존 공고
+            return existing_job
+
+def process_entry(entry, existing_jobs_dict, http_cache=None, http_client=None, spool=None, parse_pool=None):
+    job_id, title, deadline, job_url, institution, department = entry
+    existing_job = existing_jobs_dict.get(job_id)
+
+    try:
+        # 기존 공고가 있을 때만 조건부 요청 (없으면 어차피 파싱해야 함)
+        headers = http_cache.conditional_headers(job_url) if http_cache and existing_job else {}
+        get = http_client.get if http_client else requests.get
+        job_response = check_status(get(job_url, headers=headers))
+
+        if http_cache and existing_job and http_cache.is_unchanged(job_url, job_response):
+            # 상세 페이지가 바뀌지 않았으므로 파싱 없이 기존 데이터 재사용
+            application_materials = existing_job.get('application_materials', [])
+            position_location = existing_job.get('position_location', '')
+            subject_area = existing_job.get('subject_area', '')
+        else:
+            application_materials, position_location, subject_area = parse_detail(job_url, job_response, spool, parse_pool)
+        if http_cache:
+            http_cache.update(job_url, job_response)
+
+        return build_job(institution, department, job_id, title, deadline, job_url,
+                         application_materials, position_location, subject_area, existing_job)
+    except Exception as e:
+        print(f"Error processing job {job_id}: {e}")
+        return None
+
+def reuse_entry(entry, existing_job):
+    # 상세 페이지를 받지 않고 목록의 최신 값과 저장된 상세 정보로 공고를 만듦 (재확인 일정이 아직 안 된 공고)
+    job_id, title, deadline, job_url, institution, department = entry
+    return build_job(institution, department, job_id, title, deadline, job_url,
+                     existing_job.get('application_materials', []), existing_job.get('position_location', ''),
+                     existing_job.get('subject_area', ''), existing_job)
+
+def process_job(position, institution, department, existing_jobs_dict, http_cache=None, base_url="https://academicjobsonline.org", http_client=None):
+    entry = listing_entry(position, institution, department, base_url)
+    if is_relevant(entry[1], department):
+        return process_entry(entry, existing_jobs_dict, http_cache, http_client)
     else:
         return None
 
-def crawl_physics_postdocs(url, existing_jobs_dict):
-    jobs = []
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+# 이번 크롤링에서 목록 페이지에 보인 (관련) 공고 ID와 받지 못한 목록 페이지.
+# 목록 페이지가 하나라도 실패하면 사라진 공고를 판단할 수 없으므로 삭제(tombstone) 처리를 하지 않음
+class ListingLog:
+    def __init__(self):
+        self.job_ids = set()
+        self.failed = []
+        self.lock = threading.Lock()
 
-    job_listings = soup.find_all('div', class_='clr')
+    def seen(self, job_id):
+        with self.lock:
+            self.job_ids.add(job_id)
 
-    # 처리할 작업 목록 생성
-    tasks = []
-    for listing in job_listings:
-        institution = listing.find('h3').find('a').text.strip()
-        department = listing.find('h3').find_all('a')[1].text.strip() if len(listing.find('h3').find_all('a')) > 1 else ""
+    def fail(self, listing_url):
+        METRICS.inc('listing_errors_total')
+        with self.lock:
+            self.failed.append(listing_url)
+
+    @property
+    def complete(self):
+        return not self.failed
+
+    def listed_ids(self):
+        # store.upsert_jobs에 넘길 값 (실패한 목록 페이지가 있으면 None)
+        return self.job_ids if self.complete else None
+
+def crawl_order(job):
+    # 마감일 순, 마감일이 같으면 job_id 순. 끝난 순서와 상관없이 매번 같은 순서(rank)가 되어 바뀌지 않은 공고를 다시 쓰지 않음
+    return deadline_sort_key(job), job['job_id']
+
+def fallback_entry(entry, existing_jobs_dict):
+    # 상세 페이지를 받거나 파싱하지 못한 공고: 저장된 공고가 있으면 목록의 최신 값과 저장된 상세 정보로 유지
+    existing_job = existing_jobs_dict.get(entry[0])
+    if existing_job is None:
+        return None
+    METRICS.inc('detail_fallback_total')
+    return reuse_entry(entry, existing_job)
+
+def iter_crawl_jobs(urls, existing_jobs_dict, http_cache=None, http_client=None, max_workers=MAX_WORKERS, checkpoint=None, scheduler=None,
+                    spool=None, parse_pool=None, listing_log=None):
+    if isinstance(urls, str):
+        urls = [urls]
+    # 외부에서 client를 넘기지 않으면 워커 수에 맞춘 풀을 만들고 끝나면 닫음
+    own_client = http_client is None
+    if own_client:
+        http_client = HttpClient(pool_size=max_workers)
+
+    frontier = UrlFrontier(urls)
+    queued_job_ids = set()
+    lock = threading.Lock()
+    finished = queue.Queue()
+    outstanding = 0
+    listings_pending = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def submit(fn, *args):
+            nonlocal outstanding
+            with lock:
+                outstanding += 1
+            executor.submit(fn, *args).add_done_callback(finished.put)
+
+        def emit(job):
+            # 요청 없이 바로 만든 결과도 같은 큐로 넘김
+            nonlocal outstanding
+            future = concurrent.futures.Future()
+            future.set_result(job)
+            with lock:
+                outstanding += 1
+            finished.put(future)
 
-        positions = listing.find('ol', class_='sp5').find_all('li')
+        def submit_listing(listing_url):
+            nonlocal listings_pending
+            with lock:
+                listings_pending += 1
+            submit(crawl_listing_task, listing_url)
 
-        for position in positions:
-            tasks.append((position, institution, department))
+        def crawl_listing_task(listing_url):
+            # 마지막 목록 페이지가 끝나면 미뤄 둔 재확인 공고를 긴급도 순으로 예산만큼 예약
+            nonlocal listings_pending
+            try:
+                return crawl_listing(listing_url)
+            finally:
+                with lock:
+                    listings_pending -= 1
+                    last = listings_pending == 0
+                if last and scheduler:
+                    due, over_budget = scheduler.release()
+                    for entry in due:
+                        submit(crawl_job, entry)
+                    for entry in over_budget:
+                        emit(reuse_entry(entry, existing_jobs_dict[entry[0]]))
 
-    # 스레드 풀을 사용하여 병렬 처리
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        futures = [executor.submit(process_job, task[0], task[1], task[2], existing_jobs_dict) for task in tasks]
-        for future in concurrent.futures.as_completed(futures):
-            job = future.result()
-            if job:
-                jobs.append(job)
+        def checkpointed_entries(listing_url, soup, links):
+            # 목록 페이지의 공고를 파싱하는 대로 체크포인트에 한 줄씩 기록하며 넘겨줌 (목록 전체를 리스트로 만들지 않음).
+            # 마지막 공고까지 넘긴 뒤에 남기는 listing 레코드가 있어야 다음 --resume에서 끝난 목록으로 인정됨
+            for entry in iter_listing_entries(soup, listing_url):
+                checkpoint.record_entry(listing_url, entry)
+                yield entry
+            checkpoint.record_listing(listing_url, None, links)
+
+        def crawl_listing(listing_url):
+            # 목록 페이지를 파싱하면서 관련 공고만 곧바로 상세 작업으로 넘김.
+            # 자식 작업을 모두 예약한 뒤에 끝나므로 outstanding이 중간에 0이 되지 않음
+            recorded = checkpoint.listings.get(listing_url) if checkpoint else None
+            if recorded:
+                # 이전 실행에서 이미 파싱한 목록 페이지는 다시 받지 않음
+                entries, links = recorded
+            else:
+                try:
+                    response = http_client.get(listing_url)
+                    response.raise_for_status()
+                    with METRICS.timer('parse_listing_seconds'):
+                        soup = BeautifulSoup(response.content, 'html.parser')
+                        links = find_listing_links(soup, listing_url)
+                except Exception as e:
+                    print(f"Error fetching listing {listing_url}: {e}")
+                    if listing_log:
+                        listing_log.fail(listing_url)
+                    return None
+                if checkpoint:
+                    entries = checkpointed_entries(listing_url, soup, links)
+                else:
+                    entries = iter_listing_entries(soup, listing_url)
+
+            for link in links:
+                frontier.add(link)
+            for link in frontier.drain():
+                submit_listing(link)
+
+            try:
+                for entry in entries:
+                    if not is_relevant(entry[1], entry[5]):
+                        # 관련 없는 공고는 상세 페이지 작업을 만들지 않음
+                        METRICS.inc('listing_skipped_total')
+                        continue
+                    with lock:
+                        # 여러 카테고리에 동시에 올라온 공고는 한 번만 처리
+                        if entry[0] in queued_job_ids:
+                            continue
+                        queued_job_ids.add(entry[0])
+                    if listing_log:
+                        listing_log.seen(entry[0])
+                    if checkpoint and entry[0] in checkpoint.jobs:
+                        # 이전 실행에서 이미 끝난 공고 (재확인 일정보다 먼저 확인해 일정에 다시 넣지 않음)
+                        METRICS.inc('checkpoint_restored_total')
+                        emit(checkpoint.jobs[entry[0]])
+                        continue
+                    if scheduler:
+                        action = scheduler.plan(entry)
+                        if action == SKIP:
+                            emit(reuse_entry(entry, existing_jobs_dict[entry[0]]))
+                            continue
+                        if action == DEFER:
+                            continue
+                    submit(crawl_job, entry)
+            except Exception as e:
+                # 목록 중간에서 파싱이 실패하면 listing 레코드를 남기지 않아 다음 --resume에서 다시 받음
+                print(f"Error parsing listing {listing_url}: {e}")
+                if listing_log:
+                    listing_log.fail(listing_url)
+            return None
+
+        def crawl_job(entry):
+            if checkpoint and entry[0] in checkpoint.jobs:
+                # 이전 실행에서 이미 끝난 공고
+                METRICS.inc('checkpoint_restored_total')
+                return checkpoint.jobs[entry[0]]
+            job = process_entry(entry, existing_jobs_dict, http_cache, http_client, spool, parse_pool)
+            if job is None:
+                # 실패한 공고는 일정/체크포인트에 남기지 않아 다음 실행(--resume)에서 다시 받음
+                return fallback_entry(entry, existing_jobs_dict)
+            if scheduler:
+                scheduler.record(job, existing_jobs_dict.get(entry[0]))
+            if checkpoint:
+                checkpoint.record_job(job, http_cache)
+            return job
+
+        try:
+            for listing_url in frontier.drain():
+                submit_listing(listing_url)
+
+            while True:
+                with lock:
+                    if outstanding == 0:
+                        break
+                future = finished.get()
+                with lock:
+                    outstanding -= 1
+                job = future.result()
+                if job:
+                    yield job
+        finally:
+            if own_client:
+                executor.shutdown(wait=True)
+                http_client.close()
+
+def crawl_physics_postdocs(urls, existing_jobs_dict, http_cache=None, http_client=None, max_workers=MAX_WORKERS, checkpoint=None,
+                           scheduler=None, spool=None, parse_pool=None, listing_log=None):
+    # 완료된 공고를 하나씩 받아 쓰려면 iter_crawl_jobs를 직접 사용 (체크포인트는 그 안에서 공고마다 기록됨)
+    jobs = list(iter_crawl_jobs(urls, existing_jobs_dict, http_cache, http_client, max_workers, checkpoint, scheduler, spool, parse_pool,
+                                listing_log))
 
     # 마감일 기준으로 정렬
-    jobs.sort(key=lambda x: parse_date(x['deadline']))
+    jobs.sort(key=crawl_order)
 
     return jobs
 
@@ -187,34 +562,133 @@ def save_as_json(data, filename):
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
-if __name__ == "__main__":
-    url = "https://academicjobsonline.org/ajo?joblist-0-0-0-3---0-dt--"
-    json_filename = "data/physics_postdocs.json"
+def run_crawl(store, urls=LISTING_URLS, json_filename=JSON_FILENAME, http_cache_filename=HTTP_CACHE_FILENAME, changelog_dir=CHANGELOG_DIR,
+              engine='thread', workers=MAX_WORKERS, rate_limit=None, timeout=30, retries=3, concurrency=200,
+              checkpoint_filename=CHECKPOINT_FILENAME, resume=False, retention=DEFAULT_RETENTION,
+              tombstones_filename=TOMBSTONES_FILENAME, schedule=True, budget=None, spool_filename=SPOOL_FILENAME, parse_workers=None):
+    http_cache = HttpCache(http_cache_filename)
+    # 끝난 공고를 바로바로 로그에 남겨, 중간에 죽어도 --resume으로 이어서 할 수 있게 함
+    checkpoint = CrawlCheckpoint(checkpoint_filename, urls, resume=resume)
+    checkpoint.restore_cache(http_cache)
 
-    existing_jobs = load_existing_jobs(json_filename)
-    existing_jobs = [normalize_job(job) for job in existing_jobs]
-    existing_jobs_dict = {job['job_id']: job for job in existing_jobs}
+    # 저장소가 비어 있으면 기존 JSON 결과를 한 번 가져옴
+    if len(store) == 0 and os.path.exists(json_filename):
+        store.import_json(json_filename)
 
-    jobs = crawl_physics_postdocs(url, existing_jobs_dict)
-    jobs = [normalize_job(job) for job in jobs]
-    save_as_json(jobs, json_filename)
+    # 크롤링 내내 들고 있는 기존 공고는 dict 대신 Job 레코드로 (공통 문자열 공유, 정리는 읽을 때 한 번만)
+    existing_jobs_dict = {job.job_id: job for job in map(Job.from_dict, store.iter_jobs())}
+    # 재확인 일정이 된 공고만 상세 페이지를 받음 (schedule=False면 이전처럼 모든 공고를 확인)
+    scheduler = RecrawlScheduler(store.load_schedule(), existing_jobs_dict, budget) if schedule else None
 
-    # 새로운 공고와 업데이트된 공고 구분
-    existing_job_ids = set(existing_jobs_dict.keys())
-    current_job_ids = set(job['job_id'] for job in jobs)
+    # 받은 상세 페이지 원본은 스풀에 남기고 파싱은 코어 수만큼의 프로세스에서 (코어가 하나면 받은 스레드에서 바로)
+    spool = HtmlSpool(spool_filename) if spool_filename else None
+    parse_workers = parse_workers or os.cpu_count() or 1
+    listing_log = ListingLog()
 
-    new_job_ids = current_job_ids - existing_job_ids
-    possible_updated_job_ids = current_job_ids & existing_job_ids
+    try:
+        if engine == 'async':
+            from crawling_async import crawl_physics_postdocs_async_run
+            jobs = crawl_physics_postdocs_async_run(urls, existing_jobs_dict, http_cache, concurrency=concurrency, parse_workers=parse_workers,
+                                                    timeout=timeout, checkpoint=checkpoint, scheduler=scheduler, spool=spool,
+                                                    listing_log=listing_log, retries=retries, rate_limit=rate_limit, rate_burst=workers,
+                                                    matcher=KEYWORD_MATCHER, parser_backend=PARSER_BACKEND)
+        else:
+            parse_pool = parse_process_pool(parse_workers) if spool is not None and parse_workers > 1 else None
+            try:
+                with HttpClient(pool_size=workers, timeout=(5, timeout), retries=retries, rate_limit=rate_limit) as http_client:
+                    jobs = crawl_physics_postdocs(urls, existing_jobs_dict, http_cache, http_client, max_workers=workers,
+                                                  checkpoint=checkpoint, scheduler=scheduler, spool=spool, parse_pool=parse_pool,
+                                                  listing_log=listing_log)
+            finally:
+                if parse_pool:
+                    parse_pool.shutdown()
+    finally:
+        checkpoint.close()
+        if spool is not None:
+            spool.close()
 
-    new_jobs = [job for job in jobs if job['job_id'] in new_job_ids]
-    updated_jobs = []
-    for job_id in possible_updated_job_ids:
-        existing_job = existing_jobs_dict[job_id]
-        current_job = next(job for job in jobs if job['job_id'] == job_id)
-        if existing_job != current_job:
-            updated_jobs.append(current_job)
+    # 저장소에 반영하면서 fingerprint 비교로 새로운/업데이트된/삭제된 공고 구분
+    # 목록 페이지에서 사라진 공고는 tombstone으로 남고(목록 페이지가 모두 성공했을 때만), 마감일이 지난 공고는 활성 목록에서 빠짐
+    if not listing_log.complete:
+        print(f"목록 페이지 {len(listing_log.failed)}개를 받지 못해 이번 실행에서는 삭제된 공고를 판단하지 않습니다.")
+    changes = store.upsert_jobs(jobs, listed_ids=listing_log.listed_ids())
+    pruned = store.prune(retention)
+    changelog_filename = write_changelog(changes, changelog_dir, expired=pruned.expired)
+    METRICS.inc('jobs_total', len(jobs))
+    for kind, job_ids in changes._asdict().items():
+        METRICS.inc(f'jobs_{kind}_total', len(job_ids))
+    METRICS.inc('jobs_expired_total', len(pruned.expired))
+    METRICS.inc('jobs_purged_total', pruned.purged)
+    # 이전 버전과의 호환을 위해 JSON 파일도 함께 저장
+    store.export_json(json_filename)
+    store.export_tombstones(tombstones_filename)
+    # ETag/Last-Modified와 재확인 일정은 그 공고 내용이 저장소에 들어간 뒤에 저장. 먼저 저장하고 죽으면 다음 실행이
+    # 304(또는 일정)를 믿고 저장되지 않은 변경을 놓침. 여기까지 오기 전에 죽으면 다음 실행이 조금 더 받을 뿐
+    http_cache.save()
+    if scheduler:
+        store.save_schedule(scheduler.updated)
+    checkpoint.complete()
 
     print(f"총 {len(jobs)}개의 Physics 관련 Post-Doctoral 공고를 찾았습니다.")
-    print(f"새로운 공고: {len(new_jobs)}개")
-    print(f"업데이트된 공고: {len(updated_jobs)}개")
-    print("결과가 data/physics_postdocs.json 파일로 저장되었습니다.")
+    if scheduler:
+        print(f"상세 페이지 요청: {scheduler.requests}개 (나머지는 재확인 일정이 되지 않아 저장된 정보 사용)")
+    print(f"새로운 공고: {len(changes.new)}개")
+    print(f"업데이트된 공고: {len(changes.updated)}개")
+    print(f"삭제된 공고: {len(changes.removed)}개, 마감된 공고: {len(pruned.expired)}개 (변경 내역: {changelog_filename})")
+    print(f"결과가 {store.filename} 및 {json_filename} 파일로 저장되었습니다.")
+    return jobs, changes
+
+def reparse_spool(store, spool_filename=SPOOL_FILENAME, json_filename=JSON_FILENAME, changelog_dir=CHANGELOG_DIR, parse_workers=None):
+    # 네트워크 요청 없이 스풀에 남은 원본으로 상세 정보를 다시 추출 (추출 코드를 고친 뒤 사용).
+    # 스풀에 원본이 없는 공고(스풀 도입 전에 받은 공고)는 그대로 둠
+    jobs = store.load_jobs()
+    with HtmlSpool(spool_filename) as spool:
+        targets = [(i, spool.index[job['job_url']]) for i, job in enumerate(jobs) if job.get('job_url') in spool.index]
+        with parse_process_pool(parse_workers) as parse_pool:
+            parsed = parse_pool.map(parse_spooled, itertools.repeat(spool.filename), [offset for _, (offset, _) in targets],
+                                    [length for _, (_, length) in targets], itertools.repeat(PARSER_BACKEND), chunksize=64)
+            for (i, _), (application_materials, position_location, subject_area) in zip(targets, parsed):
+                job = jobs[i]
+                jobs[i] = build_job(job['institution'], job['department'], job['job_id'], job['title'], job['deadline'], job['job_url'],
+                                    application_materials, position_location, subject_area, job)
+
+    changes = store.upsert_jobs(jobs)
+    changelog_filename = write_changelog(changes, changelog_dir)
+    store.export_json(json_filename)
+    print(f"스풀에서 {len(targets)}개 공고를 다시 파싱했습니다 (원본 없음: {len(jobs) - len(targets)}개).")
+    print(f"업데이트된 공고: {len(changes.updated)}개 (변경 내역: {changelog_filename})")
+    return changes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help='동시에 상세 페이지를 받을 워커 수')
+    parser.add_argument('--rate-limit', type=float, default=None, help='초당 최대 요청 수 (기본: 제한 없음)')
+    parser.add_argument('--timeout', type=float, default=30, help='요청 하나당 읽기 타임아웃(초)')
+    parser.add_argument('--retries', type=int, default=3, help='429/5xx 및 연결 오류 시 재시도 횟수')
+    parser.add_argument('--engine', choices=['thread', 'async'], default='thread', help='크롤링 엔진 (async는 aiohttp 필요)')
+    parser.add_argument('--concurrency', type=int, default=200, help='async 엔진의 최대 동시 요청 수')
+    parser.add_argument('--parser', choices=sorted(PARSER_BACKENDS), default=PARSER_BACKEND, help='상세 페이지 파서 백엔드')
+    parser.add_argument('--listing', action='append', help='크롤링할 목록 페이지 URL (여러 번 지정 가능, 기본: LISTING_URLS)')
+    parser.add_argument('--keywords', help=f'관련 공고 판단 키워드 설정 파일 (기본: {KEYWORDS_FILENAME}이 있으면 사용)')
+    parser.add_argument('--resume', action='store_true', help=f'중단된 크롤링을 {CHECKPOINT_FILENAME}에서 이어서 진행')
+    parser.add_argument('--expire-after-days', type=int, default=DEFAULT_RETENTION.expire_after_days,
+                        help='마감일이 이만큼 지난 공고는 활성 목록(HTML, Excel 등)에서 뺌')
+    parser.add_argument('--tombstone-days', type=int, default=DEFAULT_RETENTION.tombstone_days,
+                        help='목록에서 사라진 공고 기록을 보존할 기간(일)')
+    parser.add_argument('--budget', type=int, default=None, help='실행당 상세 페이지 요청 예산 (새 공고는 예산과 관계없이 받음)')
+    parser.add_argument('--full', action='store_true', help='재확인 일정과 관계없이 모든 공고의 상세 페이지를 확인')
+    parser.add_argument('--parse-workers', type=int, default=None, help='상세 페이지를 파싱할 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--reparse', action='store_true', help=f'크롤링 없이 {SPOOL_FILENAME}의 원본으로 상세 정보를 다시 추출')
+    args = parser.parse_args()
+    set_parser_backend(args.parser)
+    if args.keywords:
+        set_keywords(args.keywords)
+
+    with JobStore(DB_FILENAME) as store:
+        if args.reparse:
+            reparse_spool(store, parse_workers=args.parse_workers)
+        else:
+            run_crawl(store, urls=args.listing or LISTING_URLS, engine=args.engine, workers=args.workers,
+                      rate_limit=args.rate_limit, timeout=args.timeout, retries=args.retries, concurrency=args.concurrency,
+                      resume=args.resume, retention=RetentionPolicy(args.expire_after_days, args.tombstone_days),
+                      schedule=not args.full, budget=args.budget, parse_workers=args.parse_workers)
@@ -0,0 +1,220 @@
+import asyncio
+import contextlib
+import os
+import time
+from collections import namedtuple
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from frontier import UrlFrontier
+import crawling
+from crawling import build_job, crawl_order, fallback_entry, parse_content, parse_listing, parse_process_pool, parse_spooled, reuse_entry
+from http_client import RETRY_STATUSES, RateLimiter, backoff_delay, check_status, retry_after
+from metrics import METRICS
+from scheduler import DEFER, SKIP
+
+MAX_CONCURRENCY = 200
+
+# HttpCache가 requests.Response와 동일하게 다룰 수 있도록 필요한 속성만 담은 응답
+Response = namedtuple('Response', ['status_code', 'headers', 'content'])
+
+
+async def fetch(session, url, headers=None, retries=3, backoff=0.5, max_backoff=30.0, rate_limiter=None):
+    # HttpClient.get과 같은 재시도/백오프와 속도 제한 (기다리는 동안 이벤트 루프를 막지 않음)
+    for attempt in range(retries + 1):
+        if rate_limiter:
+            await asyncio.sleep(rate_limiter.reserve())
+        METRICS.inc('http_requests_total')
+        start = time.perf_counter()
+        try:
+            async with session.get(url, headers=headers) as resp:
+                content = await resp.read()
+                response = Response(resp.status, resp.headers, content)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            METRICS.inc('http_errors_total')
+            if attempt == retries:
+                raise
+            METRICS.inc('http_retries_total')
+            await asyncio.sleep(backoff_delay(attempt, backoff, max_backoff))
+            continue
+        METRICS.observe('http_request_seconds', time.perf_counter() - start)
+        METRICS.inc('http_bytes_total', len(content))
+
+        if response.status_code in RETRY_STATUSES and attempt < retries:
+            METRICS.inc('http_retries_total')
+            await asyncio.sleep(retry_after(response.headers, max_backoff) or backoff_delay(attempt, backoff, max_backoff))
+            continue
+        return response
+
+
+async def run_parse(parse_pool, func, *args):
+    # 파싱 풀이 없으면(파싱 워커 하나) 이벤트 루프에서 바로 파싱. 프로세스로 넘겨도 병렬 이득 없이 pickle/IPC 비용만 듦
+    if parse_pool is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(parse_pool, func, *args)
+
+
+async def process_job_async(entry, existing_jobs_dict, session, semaphore, parse_pool, http_cache=None, spool=None, retries=3,
+                            rate_limiter=None, parser_backend=None):
+    job_id, title, deadline, job_url, institution, department = entry
+    existing_job = existing_jobs_dict.get(job_id)
+    parser_backend = parser_backend or crawling.PARSER_BACKEND
+
+    try:
+        headers = http_cache.conditional_headers(job_url) if http_cache and existing_job else {}
+        async with semaphore:
+            job_response = check_status(await fetch(session, job_url, headers, retries, rate_limiter=rate_limiter))
+
+        if http_cache and existing_job and http_cache.is_unchanged(job_url, job_response):
+            application_materials = existing_job.get('application_materials', [])
+            position_location = existing_job.get('position_location', '')
+            subject_area = existing_job.get('subject_area', '')
+        else:
+            spooled = spool is not None and job_response.status_code == 200
+            if spooled:
+                # 원본은 스풀에 남기고, 파싱 프로세스가 있으면 본문 대신 스풀 안의 위치만 넘김
+                offset, length = spool.append(job_url, job_response.content)
+            # 자식 프로세스의 METRICS는 부모에 합쳐지지 않으므로 파싱 시간은 부모에서 기다린 시간으로 잼
+            with METRICS.timer('parse_detail_seconds'):
+                if spooled and parse_pool is not None:
+                    application_materials, position_location, subject_area = await run_parse(
+                        parse_pool, parse_spooled, spool.filename, offset, length, parser_backend)
+                else:
+                    application_materials, position_location, subject_area = await run_parse(
+                        parse_pool, parse_content, job_response.content, parser_backend)
+        if http_cache:
+            http_cache.update(job_url, job_response)
+
+        return build_job(institution, department, job_id, title, deadline, job_url,
+                         application_materials, position_location, subject_area, existing_job)
+    except Exception as e:
+        print(f"Error processing job {job_id}: {e}")
+        return None
+
+
+async def crawl_physics_postdocs_async(urls, existing_jobs_dict, http_cache=None, concurrency=MAX_CONCURRENCY, parse_workers=None, timeout=30,
+                                       checkpoint=None, scheduler=None, spool=None, listing_log=None, retries=3, rate_limit=None,
+                                       rate_burst=1, matcher=None, parser_backend=None):
+    # matcher(관련 공고 판단)와 parser_backend는 호출한 쪽의 설정을 그대로 받음.
+    # python crawling.py로 실행하면 --keywords/--parser는 __main__ 모듈에 설정되므로 여기서 crawling 모듈의 값을 읽으면 안 됨
+    if aiohttp is None:
+        raise ImportError("crawl_physics_postdocs_async requires aiohttp: pip install aiohttp")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    # 스레드 엔진(HttpClient)과 같은 토큰 버킷
+    rate_limiter = RateLimiter(rate_limit, burst=rate_burst) if rate_limit else None
+    matcher = matcher or crawling.KEYWORD_MATCHER
+
+    if isinstance(urls, str):
+        urls = [urls]
+    frontier = UrlFrontier(urls)
+    queued_job_ids = set()
+    results = []
+
+    parse_workers = parse_workers or os.cpu_count() or 1
+    with parse_process_pool(parse_workers) if parse_workers > 1 else contextlib.nullcontext() as parse_pool:
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+
+            async def crawl_listing(listing_url):
+                # 이전 실행에서 이미 파싱한 목록 페이지는 다시 받지 않음
+                if checkpoint and listing_url in checkpoint.listings:
+                    return checkpoint.listings[listing_url]
+                async with semaphore:
+                    response = await fetch(session, listing_url, retries=retries, rate_limiter=rate_limiter)
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP {response.status_code}")
+                with METRICS.timer('parse_listing_seconds'):
+                    entries, links = await run_parse(parse_pool, parse_listing, response.content, listing_url)
+                if checkpoint:
+                    checkpoint.record_listing(listing_url, entries, links)
+                return entries, links
+
+            # 목록 페이지가 하나 끝날 때마다 상세 작업과 새 목록 페이지를 바로 예약
+            pending = {asyncio.ensure_future(crawl_listing(u)): ('listing', u) for u in frontier.drain()}
+            listings_pending = len(pending)
+            released = False
+
+            def schedule_job(entry):
+                job_task = asyncio.ensure_future(
+                    process_job_async(entry, existing_jobs_dict, session, semaphore, parse_pool, http_cache, spool, retries, rate_limiter,
+                                      parser_backend))
+                pending[job_task] = ('job', entry)
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    kind, key = pending.pop(task)
+                    if kind == 'job':
+                        job = task.result()
+                        if job is None:
+                            # 실패한 공고는 일정/체크포인트에 남기지 않고 저장된 공고로 유지
+                            results.append(fallback_entry(key, existing_jobs_dict))
+                            continue
+                        if scheduler:
+                            scheduler.record(job, existing_jobs_dict.get(key[0]))
+                        if checkpoint:
+                            checkpoint.record_job(job, http_cache)
+                        results.append(job)
+                        continue
+
+                    listings_pending -= 1
+                    try:
+                        entries, links = task.result()
+                    except Exception as e:
+                        print(f"Error fetching listing {key}: {e}")
+                        if listing_log:
+                            listing_log.fail(key)
+                        continue
+
+                    for link in links:
+                        frontier.add(link)
+                    for link in frontier.drain():
+                        pending[asyncio.ensure_future(crawl_listing(link))] = ('listing', link)
+                        listings_pending += 1
+                    for entry in entries:
+                        if entry[0] in queued_job_ids:
+                            continue
+                        if not matcher.is_relevant(title=entry[1], department=entry[5]):
+                            METRICS.inc('listing_skipped_total')
+                            continue
+                        queued_job_ids.add(entry[0])
+                        if listing_log:
+                            listing_log.seen(entry[0])
+                        if checkpoint and entry[0] in checkpoint.jobs:
+                            # 이전 실행에서 이미 끝난 공고
+                            METRICS.inc('checkpoint_restored_total')
+                            results.append(checkpoint.jobs[entry[0]])
+                            continue
+                        if scheduler:
+                            action = scheduler.plan(entry)
+                            if action == SKIP:
+                                results.append(reuse_entry(entry, existing_jobs_dict[entry[0]]))
+                                continue
+                            if action == DEFER:
+                                continue
+                        schedule_job(entry)
+
+                if scheduler and listings_pending == 0 and not released:
+                    # 마지막 목록 페이지가 끝나면 미뤄 둔 재확인 공고를 긴급도 순으로 예산만큼 예약
+                    released = True
+                    due, over_budget = scheduler.release()
+                    for entry in due:
+                        schedule_job(entry)
+                    results.extend(reuse_entry(entry, existing_jobs_dict[entry[0]]) for entry in over_budget)
+
+    jobs = [job for job in results if job]
+    # 스레드 경로와 동일하게 마감일 기준으로 정렬
+    jobs.sort(key=crawl_order)
+    return jobs
+
+
+def crawl_physics_postdocs_async_run(urls, existing_jobs_dict, http_cache=None, concurrency=MAX_CONCURRENCY, parse_workers=None, timeout=30,
+                                     checkpoint=None, scheduler=None, spool=None, listing_log=None, retries=3, rate_limit=None,
+                                     rate_burst=1, matcher=None, parser_backend=None):
+    return asyncio.run(crawl_physics_postdocs_async(urls, existing_jobs_dict, http_cache, concurrency, parse_workers, timeout, checkpoint,
+                                                    scheduler, spool, listing_log, retries, rate_limit, rate_burst, matcher, parser_backend))
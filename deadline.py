@@ -0,0 +1,85 @@
+import re
+from collections import namedtuple
+from datetime import datetime, timezone
+from functools import lru_cache
+
+# 마감일 문자열을 한 번 해석한 결과.
+# at: UTC 기준 'YYYY-MM-DDTHH:MM:SSZ' 문자열 (날짜가 없으면 None). 고정 길이라 문자열 비교만으로 정렬됨
+# status: open / rolling / offers accepted / filled / withdrawn / unknown
+# raw: 원래 문자열
+Deadline = namedtuple('Deadline', ['at', 'status', 'raw'])
+
+# 날짜를 알 수 없는 공고를 맨 뒤로 보내기 위한 정렬 키
+MAX_DEADLINE = '9999-12-31T23:59:59Z'
+
+# '(deadline 2024/11/01 11:59PM*)', '(offers accepted, deadline 2024/11/01)' 등
+DEADLINE_PATTERN = re.compile(r'(\d{4})/(\d{1,2})/(\d{1,2})(?:\s+(\d{1,2}):(\d{2})\s*([AP]M))?', re.IGNORECASE)
+
+# 문자열에 포함된 문구 -> 상태. 앞에 있는 것이 우선
+STATUS_PHRASES = [
+    ('filled', 'filled'),
+    ('withdrawn', 'withdrawn'),
+    ('offers accepted', 'offers accepted'),
+    ('accepting applications', 'rolling'),
+    ('no deadline', 'rolling'),
+]
+
+@lru_cache(maxsize=4096)
+def parse_deadline(text):
+    # 같은 마감일 문자열이 여러 공고와 여러 단계에서 반복되므로 결과를 캐시.
+    # AJO 목록의 시각은 시간대 표기가 없으므로 그대로 UTC로 간주
+    text = (text or '').strip()
+    lowered = text.lower()
+    status = next((name for phrase, name in STATUS_PHRASES if phrase in lowered), None)
+
+    at = None
+    match = DEADLINE_PATTERN.search(text)
+    if match:
+        year, month, day, hour, minute, ampm = match.groups()
+        hour = int(hour) if hour else 0
+        if ampm and ampm.upper() == 'PM' and hour != 12:
+            hour += 12
+        elif ampm and ampm.upper() == 'AM' and hour == 12:
+            hour = 0
+        try:
+            value = datetime(int(year), int(month), int(day), hour, int(minute or 0))
+            at = f"{value.year:04d}-{value.month:02d}-{value.day:02d}T{value.hour:02d}:{value.minute:02d}:00Z"
+        except ValueError:
+            at = None
+
+    if status is None:
+        status = 'open' if at else 'unknown'
+    return Deadline(at, status, text)
+
+def with_deadline(job):
+    # 해석한 마감일(deadline_at, deadline_status)을 'deadline' 바로 뒤에 넣은 새 dict를 반환
+    parsed = parse_deadline(job.get('deadline'))
+    annotated = {}
+    for key, value in job.items():
+        if key in ('deadline_at', 'deadline_status'):
+            continue
+        annotated[key] = value
+        if key == 'deadline':
+            annotated['deadline_at'] = parsed.at
+            annotated['deadline_status'] = parsed.status
+    if 'deadline' not in job:
+        annotated['deadline_at'] = parsed.at
+        annotated['deadline_status'] = parsed.status
+    return annotated
+
+def job_deadline(job):
+    # 저장된 값이 있으면 그대로 쓰고, 이전 형식의 데이터만 원문을 해석
+    if 'deadline_status' in job:
+        return job['deadline_at'], job['deadline_status']
+    parsed = parse_deadline(job.get('deadline'))
+    return parsed.at, parsed.status
+
+def sort_key(job):
+    return job_deadline(job)[0] or MAX_DEADLINE
+
+def to_datetime(at, tz=False):
+    # 'YYYY-MM-DDTHH:MM:SSZ' -> datetime. Excel(openpyxl)은 시간대가 있는 값을 쓸 수 없으므로 기본은 naive UTC
+    if not at:
+        return None
+    value = datetime.fromisoformat(at[:-1])
+    return value.replace(tzinfo=timezone.utc) if tz else value
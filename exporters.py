@@ -0,0 +1,149 @@
+import argparse
+import csv
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from deadline import job_deadline, to_datetime
+from store import DB_FILENAME, JobStore
+
+INPUT_FILENAME = 'data/physics_postdocs_updated.json'
+EXPORT_BASENAME = 'data/physics_postdocs_updated'
+BATCH_SIZE = 10000
+
+# 모든 형식이 공유하는 열 목록: (열 이름, 종류). 처리된 공고 dict의 키 순서를 따르되
+# deadline은 UTC 시각(timestamp)으로 바꾸고 원래 문자열은 deadline_text에 남김
+SCHEMA = [
+    ('institution', 'string'),
+    ('department', 'string'),
+    ('job_id', 'string'),
+    ('title', 'string'),
+    ('deadline', 'timestamp'),
+    ('deadline_text', 'string'),
+    ('deadline_status', 'string'),
+    ('job_url', 'string'),
+    ('application_materials', 'list'),
+    ('position_location', 'string'),
+    ('subject_area', 'string'),
+    ('country', 'string'),
+    ('country_code', 'string'),
+]
+COLUMNS = [name for name, _ in SCHEMA]
+DEADLINE_INDEX = COLUMNS.index('deadline')
+MATERIALS_INDEX = COLUMNS.index('application_materials')
+
+def export_row(job):
+    # 공고 dict 하나를 SCHEMA 순서의 값 목록으로 변환 (deadline은 'YYYY-MM-DDTHH:MM:SSZ' 또는 None)
+    deadline_at, deadline_status = job_deadline(job)
+    return [
+        job.get('institution', ''),
+        job.get('department', ''),
+        job.get('job_id', ''),
+        job.get('title', ''),
+        deadline_at,
+        job.get('deadline') or '',
+        deadline_status,
+        job.get('job_url', ''),
+        list(job.get('application_materials') or []),
+        job.get('position_location', ''),
+        job.get('subject_area', ''),
+        job.get('country', ''),
+        job.get('country_code', ''),
+    ]
+
+def iter_batches(jobs, batch_size=BATCH_SIZE):
+    batch = []
+    for job in jobs:
+        batch.append(export_row(job))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def write_jsonl(jobs, filename):
+    # 한 줄에 공고 하나씩 바로 기록 (deadline은 ISO 8601 문자열)
+    with open(filename, 'w', encoding='utf-8') as f:
+        for job in jobs:
+            row = export_row(job)
+            f.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False))
+            f.write('\n')
+
+def write_csv(jobs, filename):
+    # CSV에는 목록 열이 없으므로 application_materials는 JSON 배열 문자열로 기록
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for job in jobs:
+            row = export_row(job)
+            row[MATERIALS_INDEX] = json.dumps(row[MATERIALS_INDEX], ensure_ascii=False)
+            writer.writerow(row)
+
+def arrow_schema():
+    types = {'string': pa.string(), 'timestamp': pa.timestamp('s', tz='UTC'), 'list': pa.list_(pa.string())}
+    return pa.schema([(name, types[kind]) for name, kind in SCHEMA])
+
+def arrow_batches(jobs, schema):
+    # BATCH_SIZE개씩 열 방향 배열로 바꿔서 넘기므로 전체 표를 메모리에 만들지 않음
+    for batch in iter_batches(jobs):
+        columns = list(zip(*batch))
+        columns[DEADLINE_INDEX] = [to_datetime(at, tz=True) for at in columns[DEADLINE_INDEX]]
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema)
+
+def write_parquet(jobs, filename):
+    schema = arrow_schema()
+    with pq.ParquetWriter(filename, schema) as writer:
+        for batch in arrow_batches(jobs, schema):
+            writer.write_batch(batch)
+
+def write_arrow(jobs, filename):
+    # Arrow IPC(Feather v2) 파일
+    schema = arrow_schema()
+    with pa.ipc.new_file(filename, schema) as writer:
+        for batch in arrow_batches(jobs, schema):
+            writer.write_batch(batch)
+
+# 형식 이름 -> (쓰기 함수, 확장자). pyarrow가 있으면 열 기반 형식도 사용 가능
+WRITERS = {
+    'jsonl': (write_jsonl, '.jsonl'),
+    'csv': (write_csv, '.csv'),
+}
+if pa is not None:
+    WRITERS['parquet'] = (write_parquet, '.parquet')
+    WRITERS['arrow'] = (write_arrow, '.arrow')
+
+def export_filename(fmt, basename=EXPORT_BASENAME):
+    return basename + WRITERS[fmt][1]
+
+def export_jobs(jobs, fmt, filename=None):
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt} (available: {', '.join(WRITERS)})")
+    write, _ = WRITERS[fmt]
+    filename = filename or export_filename(fmt)
+    # 중간에 실패해도 이전 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_filename = filename + '.tmp'
+    write(jobs, tmp_filename)
+    os.replace(tmp_filename, filename)
+    print(f"{fmt} 파일이 성공적으로 생성되었습니다: {filename}")
+    return filename
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('formats', nargs='*', default=['jsonl', 'csv'], help=f"내보낼 형식 ({', '.join(WRITERS)})")
+    args = parser.parse_args()
+
+    if os.path.exists(DB_FILENAME):
+        with JobStore(DB_FILENAME) as store:
+            for fmt in args.formats:
+                export_jobs(store.iter_processed_jobs(), fmt)
+    else:
+        with open(INPUT_FILENAME, 'r', encoding='utf-8') as f:
+            jobs = json.load(f)
+        for fmt in args.formats:
+            export_jobs(jobs, fmt)
@@ -0,0 +1,73 @@
+import threading
+from collections import deque
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+
+# joblist URL을 '-'로 나눈 필드 중 페이지 번호의 위치 (joblist-0-0-0-3---0-dt-- 에서 0)
+PAGE_FIELD = 7
+
+
+def listing_scope(url):
+    # joblist-0-0-0-3---0-dt-- 에서 페이지 번호만 뺀 나머지(카테고리 joblist-0-0-0-3, 정렬 dt 등)가 scope.
+    # 같은 scope의 링크만 같은 목록의 다른 페이지로 간주하고, 정렬만 다른 링크는 같은 공고를 다시 나열하므로 따라가지 않음
+    parts = urlsplit(url)
+    if not parts.query.startswith('joblist-'):
+        return None
+    fields = parts.query.rstrip('-').split('-')
+    return (parts.netloc, parts.path, '-'.join(fields[:PAGE_FIELD] + fields[PAGE_FIELD + 1:]))
+
+
+def frontier_key(url):
+    # 중복 확인용 키. 목록 페이지는 scope와 페이지 번호로 비교해 끝의 '-' 개수 같은 표기 차이를 무시
+    scope = listing_scope(url)
+    if scope is None:
+        return url
+    fields = urlsplit(url).query.rstrip('-').split('-')
+    return scope, fields[PAGE_FIELD] if len(fields) > PAGE_FIELD else ''
+
+
+def find_listing_links(soup, page_url):
+    links = []
+    for a in soup.find_all('a', href=True):
+        if 'joblist-' in a['href']:
+            links.append(urljoin(page_url, a['href']))
+    return links
+
+
+# 목록 페이지 URL을 중복 없이 관리하는 큐. 시드 URL의 카테고리 범위 안의 링크만 받음
+class UrlFrontier:
+    def __init__(self, seeds=()):
+        self.queue = deque()
+        self.seen = set()
+        self.scopes = set()
+        self.lock = threading.Lock()
+        for url in seeds:
+            scope = listing_scope(url)
+            if scope:
+                self.scopes.add(scope)
+            self.add(url, force=True)
+
+    def add(self, url, force=False):
+        url = urldefrag(url)[0]
+        key = frontier_key(url)
+        with self.lock:
+            if key in self.seen:
+                return False
+            if not force and listing_scope(url) not in self.scopes:
+                return False
+            self.seen.add(key)
+            self.queue.append(url)
+            return True
+
+    def pop(self):
+        with self.lock:
+            return self.queue.popleft() if self.queue else None
+
+    def drain(self):
+        with self.lock:
+            urls = list(self.queue)
+            self.queue.clear()
+            return urls
+
+    def __len__(self):
+        return len(self.queue)
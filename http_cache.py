@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import threading
+
+from metrics import METRICS
+
+
+# job_url 별 ETag/Last-Modified/본문 해시를 디스크에 저장하는 조건부 GET 캐시
+class HttpCache:
+    def __init__(self, filename):
+        self.filename = filename
+        self.entries = {}
+        self.lock = threading.Lock()
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def conditional_headers(self, url):
+        # 이전에 받은 검증자(validator)가 있으면 조건부 요청 헤더 생성
+        with self.lock:
+            entry = self.entries.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url, response):
+        # 304 응답이거나 본문 해시가 이전과 같으면 변경 없음
+        with self.lock:
+            entry = self.entries.get(url)
+        if response.status_code == 304:
+            unchanged = entry is not None
+        else:
+            unchanged = bool(entry) and entry.get('content_hash') == content_hash(response.content)
+        METRICS.inc('http_cache_hits_total' if unchanged else 'http_cache_misses_total')
+        return unchanged
+
+    def update(self, url, response):
+        # 정상 응답만 캐시 (304는 기존 항목 유지, 오류 응답은 저장하지 않음)
+        if response.status_code != 200:
+            return
+        with self.lock:
+            self.entries[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_hash': content_hash(response.content),
+            }
+
+    def get(self, url):
+        with self.lock:
+            return self.entries.get(url)
+
+    def merge(self, entries):
+        with self.lock:
+            self.entries.update(entries)
+
+    def save(self):
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            data = json.dumps(self.entries, ensure_ascii=False)
+        # 중간에 죽어도 캐시 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_filename = self.filename + '.tmp'
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_filename, self.filename)
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
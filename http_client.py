@@ -0,0 +1,109 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import METRICS
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+# 전체 스레드가 공유하는 토큰 버킷 방식의 요청 속도 제한기
+class RateLimiter:
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        # 토큰 하나를 예약하고 보내기 전에 기다려야 할 시간을 반환. 토큰이 모자라면 미리 당겨 쓰고(음수) 그만큼 뒤에 보냄.
+        # 기다리는 방법은 호출하는 쪽이 정함 (스레드는 time.sleep, async 엔진은 asyncio.sleep)
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+
+# 워커 수만큼 커넥션 풀을 잡은 Session 하나를 모든 워커가 공유
+class HttpClient:
+    def __init__(self, pool_size=10, timeout=(5, 30), retries=3, backoff=0.5, max_backoff=30.0, rate_limit=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limiter = RateLimiter(rate_limit, burst=pool_size) if rate_limit else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, headers=None):
+        for attempt in range(self.retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            METRICS.inc('http_requests_total')
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                METRICS.inc('http_errors_total')
+                if attempt == self.retries:
+                    raise
+                METRICS.inc('http_retries_total')
+                time.sleep(self._backoff_delay(attempt))
+                continue
+            METRICS.observe('http_request_seconds', time.perf_counter() - start)
+            METRICS.inc('http_bytes_total', len(response.content))
+
+            if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                METRICS.inc('http_retries_total')
+                time.sleep(self._retry_after(response) or self._backoff_delay(attempt))
+                continue
+            return response
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _backoff_delay(self, attempt):
+        return backoff_delay(attempt, self.backoff, self.max_backoff)
+
+    def _retry_after(self, response):
+        return retry_after(response.headers, self.max_backoff)
+
+
+def check_status(response):
+    # 2xx와 304(조건부 요청) 외의 응답은 실패로 봄. 재시도가 끝난 5xx나 404의 오류 페이지를 공고로 파싱하지 않도록
+    status = response.status_code
+    if not (200 <= status < 300 or status == 304):
+        raise RuntimeError(f"HTTP {status}")
+    return response
+
+
+def backoff_delay(attempt, backoff, max_backoff):
+    # full jitter 지수 백오프: 0 ~ backoff * 2^attempt 사이에서 무작위
+    return random.uniform(0, min(max_backoff, backoff * (2 ** attempt)))
+
+
+def retry_after(headers, max_backoff):
+    value = headers.get('Retry-After')
+    if value and value.isdigit():
+        return min(float(value), max_backoff)
+    return None
@@ -0,0 +1,108 @@
+import sys
+import threading
+
+# 공고 dict의 키 순서 (crawling.build_job과 post_process가 만드는 순서). country, country_code는 post_process 이후에만 있음
+FIELDS = ('institution', 'department', 'job_id', 'title', 'deadline', 'deadline_at', 'deadline_status', 'job_url',
+          'application_materials', 'position_location', 'subject_area', 'country', 'country_code')
+FIELD_SET = frozenset(FIELDS)
+# 여러 공고가 같은 값을 갖는 필드는 sys.intern으로 문자열 하나를 공유
+INTERNED_FIELDS = {'institution', 'department', 'deadline', 'deadline_at', 'deadline_status', 'position_location', 'subject_area', 'country', 'country_code'}
+
+# dict에 없던 필드 (to_dict에서 다시 빼기 위한 표시)
+MISSING = object()
+
+
+# 문자열 <-> 번호 사전. 'CV', 'research statement' 같은 제출 서류 이름을 공고마다 따로 들고 있지 않고 번호로 저장
+class Vocabulary:
+    def __init__(self):
+        self.words = []
+        self.ids = {}
+        self.lock = threading.Lock()
+
+    def encode(self, word):
+        word_id = self.ids.get(word)
+        if word_id is None:
+            with self.lock:
+                word_id = self.ids.get(word)
+                if word_id is None:
+                    word_id = self.ids[word] = len(self.words)
+                    self.words.append(sys.intern(word))
+        return word_id
+
+    def decode(self, word_id):
+        return self.words[word_id]
+
+    def __len__(self):
+        return len(self.words)
+
+
+MATERIALS = Vocabulary()
+
+
+# 공고 하나를 dict 대신 __slots__ 객체로 담는 레코드. 메모리에 오래 들고 있는 공고(크롤링 중 비교용 기존 공고 등)에 사용.
+# from_dict에서 한 번만 정리(strip, 제출 서류 정렬)하므로 이후 비교 때 다시 정리하지 않음.
+# get/[]/in을 지원해 dict를 읽던 코드를 그대로 쓸 수 있고, to_dict는 build_job과 같은 키 순서의 dict로 되돌림
+class Job:
+    __slots__ = tuple(field if field != 'application_materials' else 'materials' for field in FIELDS) + ('extra',)
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls.__new__(cls)
+        for field in FIELDS:
+            value = data.get(field, MISSING)
+            if field == 'application_materials':
+                # 정렬된 서류 이름 대신 번호 튜플 (번호 순서가 아니라 이름 순서를 유지)
+                if value is not MISSING and isinstance(value, list):
+                    value = tuple(MATERIALS.encode(item.strip()) for item in sorted(value))
+                job.materials = value
+                continue
+            if value.__class__ is str:
+                value = value.strip()
+                if field in INTERNED_FIELDS:
+                    value = sys.intern(value)
+            setattr(job, field, value)
+        # FIELDS 밖의 키는 드물므로 있을 때만 dict로 보관
+        job.extra = {key: value for key, value in data.items() if key not in FIELD_SET} or None
+        return job
+
+    def to_dict(self):
+        data = {}
+        for field in FIELDS:
+            value = self.get(field, MISSING)
+            if value is not MISSING:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def get(self, key, default=None):
+        if key == 'application_materials':
+            materials = self.materials
+            if materials is MISSING:
+                return default
+            if isinstance(materials, tuple):
+                return [MATERIALS.decode(word_id) for word_id in materials]
+            return materials
+        if key in FIELDS:
+            value = getattr(self, key)
+            return default if value is MISSING else value
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, MISSING) is not MISSING
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            other = Job.from_dict(other)
+        if not isinstance(other, Job):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in Job.__slots__)
+
+    def __repr__(self):
+        return f"Job({self.to_dict()!r})"
@@ -1,26 +1,86 @@
-import subprocess
+import argparse
 import sys
+import traceback
 
-def run_script(script_name):
-    print(f"Running {script_name}...")
-    result = subprocess.run([sys.executable, script_name], capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        print(f"Error running {script_name}:")
-        print(result.stderr)
-        sys.exit(1)
-    else:
-        print(f"{script_name} completed successfully.")
-        print(result.stdout)
+import convert
+import crawling
+import exporters
+import post_process
+import render
+from pipeline import Stage, print_timings, run_pipeline
+from store import DB_FILENAME, JobStore
+from metrics import METRICS
+
+REPORT_FILENAME = "data/run_report.json"
+PROFILE_DIR = "data/profile"
+
+def build_stages(store, args):
+    # crawl -> post_process -> (render, excel, export) 순서이며 post_process 이후 단계들은 동시에 실행
+    def crawl():
+        jobs, _ = crawling.run_crawl(store, urls=args.listing or crawling.LISTING_URLS, engine=args.engine, workers=args.workers,
+                                     resume=args.resume, schedule=not args.full, budget=args.budget)
+        return jobs
+
+    def process(crawl):
+        return post_process.run_post_process(store)
+
+    def html(process):
+        if args.render_mode == 'virtual':
+            render.render_jobs_virtual(process)
+        else:
+            render.render_jobs(process)
+
+    def excel(process):
+        convert.jobs_to_excel(process, convert.EXCEL_FILENAME)
+
+    def export(process):
+        for fmt in args.export or []:
+            exporters.export_jobs(process, fmt)
+
+    stages = [
+        Stage('crawl', crawl, ()),
+        Stage('process', process, ('crawl',)),
+        Stage('render', html, ('process',)),
+        Stage('excel', excel, ('process',)),
+    ]
+    if args.export:
+        stages.append(Stage('export', export, ('process',)))
+    return stages
 
 def main():
-    scripts = ["crawling.py", "post_process.py", "render.py", "convert.py"]
-    
-    for script in scripts:
-        run_script(script)
-        print("\n" + "="*50 + "\n")
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--engine', choices=['thread', 'async'], default='thread', help='크롤링 엔진')
+    parser.add_argument('--workers', type=int, default=crawling.MAX_WORKERS, help='동시에 상세 페이지를 받을 워커 수')
+    parser.add_argument('--listing', action='append', help='크롤링할 목록 페이지 URL (여러 번 지정 가능)')
+    parser.add_argument('--resume', action='store_true', help='중단된 크롤링을 체크포인트에서 이어서 진행')
+    parser.add_argument('--budget', type=int, help='실행당 상세 페이지 요청 예산 (새 공고는 예산과 관계없이 받음)')
+    parser.add_argument('--full', action='store_true', help='재확인 일정과 관계없이 모든 공고의 상세 페이지를 확인')
+    parser.add_argument('--keywords', help='관련 공고 판단 키워드 설정 파일 (기본: keywords.yaml이 있으면 사용)')
+    parser.add_argument('--render-mode', choices=['classic', 'virtual'], default='classic', help='HTML 렌더링 방식')
+    parser.add_argument('--export', action='append', choices=list(exporters.WRITERS), help='Excel 외에 추가로 내보낼 형식 (여러 번 지정 가능)')
+    parser.add_argument('--report', default=REPORT_FILENAME, help='실행 지표(JSON)를 저장할 파일')
+    parser.add_argument('--prometheus', help='Prometheus textfile 형식으로도 지표를 저장할 파일')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, help='단계별 cProfile/tracemalloc 결과를 저장할 디렉터리')
+    args = parser.parse_args()
+    if args.keywords:
+        crawling.set_keywords(args.keywords)
+
+    with JobStore(DB_FILENAME) as store:
+        try:
+            results, timings = run_pipeline(build_stages(store, args), profile_dir=args.profile)
+        except Exception:
+            print("Error running pipeline:")
+            traceback.print_exc()
+            sys.exit(1)
+
+    METRICS.write_report(args.report)
+    if args.prometheus:
+        METRICS.write_prometheus(args.prometheus)
 
-    print("All scripts have been executed successfully.")
+    print("\n" + "="*50 + "\n")
+    print_timings(timings)
+    print(f"Run report: {args.report}")
+    print("All stages have been executed successfully.")
 
 if __name__ == "__main__":
     main()
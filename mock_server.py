@@ -0,0 +1,291 @@
+import argparse
+import hashlib
+import multiprocessing
+import random
+import threading
+import time
+from datetime import datetime
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# academicjobsonline.org 대신 로컬에서 띄우는 테스트/벤치마크용 가짜 AJO 서버
+
+LISTING_PATH = "/ajo?joblist-0-0-0-{category}---{page}-{sort}--"
+# 실제 목록 페이지처럼 같은 페이지를 다른 순서로 보여주는 정렬 링크도 붙임 (가짜 서버는 정렬과 상관없이 같은 순서로 응답)
+SORT_ORDERS = ['dt', 'in', 'dl']
+
+SUBJECTS = ['Theoretical Physics', 'Condensed Matter Physics', 'Astrophysics', 'Artificial Intelligence', 'Natural Sciences', 'Chemistry']
+COUNTRIES = ['Seoul, Korea, The Republic of', 'Cambridge, MA, United States', 'Heidelberg, Germany', 'Tokyo, Japan', 'Toronto, Ontario, Canada']
+MATERIALS = ['cover letter', 'curriculum vitae', 'publication list', 'research statement', 'reference letters']
+
+
+def make_jobs(num_jobs):
+    # 마감일이 지난 공고는 저장소에서 만료 처리되므로 항상 내년 날짜로 만듦
+    year = datetime.now().year + 1
+    jobs = []
+    for i in range(num_jobs):
+        subject = SUBJECTS[i % len(SUBJECTS)]
+        jobs.append({
+            'job_id': str(10000 + i),
+            'institution': f"University {i // 3}",
+            'department': f"Department of {subject}",
+            'title': f"Postdoctoral Position in {subject}",
+            'deadline': f"(deadline {year}/{i % 12 + 1:02d}/{i % 28 + 1:02d} 11:59PM)",
+            'position_location': COUNTRIES[i % len(COUNTRIES)],
+            'subject_area': subject,
+            'application_materials': MATERIALS[:i % len(MATERIALS) + 1],
+        })
+    return jobs
+
+
+def listing_path(category=3, page=0, sort='dt'):
+    return LISTING_PATH.format(category=category, page=page, sort=sort)
+
+
+def parse_listing_path(path):
+    # /ajo?joblist-0-0-0-3---0-dt-- -> (3, 0)
+    fields = path.split('?', 1)[1].split('-')
+    return int(fields[4]), int(fields[7])
+
+
+def render_listing(jobs, page_links=(), sort_links=()):
+    parts = ['<html><body>']
+    if sort_links:
+        parts.append('<div class="sort">' + ' '.join(f'<a href="{link}">{sort}</a>' for sort, link in sort_links) + '</div>')
+    if page_links:
+        parts.append('<div class="pages">' + ' '.join(f'<a href="{link}">{i + 1}</a>' for i, link in enumerate(page_links)) + '</div>')
+    # 같은 기관/학과의 공고는 하나의 div.clr 블록으로 묶음
+    groups = {}
+    for job in jobs:
+        groups.setdefault((job['institution'], job['department']), []).append(job)
+    for i, ((institution, department), group) in enumerate(groups.items()):
+        parts.append(f'<div class="clr"><h3><a href="/ajo/inst{i}">{institution}</a>, <a href="/ajo/inst{i}/dept">{department}</a></h3>')
+        parts.append('<ol class="sp5">')
+        for job in group:
+            parts.append(
+                f'<li><a href="/ajo/jobs/{job["job_id"]}">[{job["job_id"]}]</a> '
+                f'<b>{job["title"]}</b> <span class="purplesml">{job["deadline"]}</span></li>'
+            )
+        parts.append('</ol></div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def render_detail(job):
+    items = ''.join(f'<li>{material}</li>' for material in job['application_materials'])
+    return (
+        '<html><body>'
+        f'<h2>{job["title"]}</h2>'
+        f'<div><b>Position Location:</b></div><div>{job["position_location"]} [map]</div>'
+        f'<div><b>Subject Area:</b></div><div>{job["subject_area"]}</div>'
+        f'<div><b>Application Materials Required:</b></div><ul>{items}</ul>'
+        '</body></html>'
+    )
+
+
+# 기본 listen 백로그(5)로는 async 엔진의 동시 연결 수백 개가 SYN 재전송(1초 단위)으로 밀려 지연이 부풀려짐
+class BackloggedHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class MockAJOServer:
+    def __init__(self, jobs, latency=0.0, per_page=None, categories=(3,), error_rate=0.0, detail_pages=None, seed=0, port=0):
+        self.jobs = {job['job_id']: job for job in jobs}
+        self.latency = latency
+        # per_page를 지정하면 목록을 여러 페이지로 나누고, 공고를 categories에 번갈아 배정
+        self.per_page = per_page
+        self.categories = list(categories)
+        # 요청 중 error_rate 비율만큼 503으로 응답 (재시도 경로 측정용). seed가 같으면 같은 순서로 실패
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        # detail_pages(HTML 문자열 목록)를 주면 합성 페이지 대신 공고 순서대로 돌아가며 응답
+        self.detail_pages = list(detail_pages or [])
+        self.last_modified = formatdate(usegmt=True)
+        self.request_count = 0
+        self.detail_request_count = 0
+        self.not_modified_count = 0
+        self.error_count = 0
+        self.lock = threading.Lock()
+        self._index_jobs()
+        self.httpd = BackloggedHTTPServer(('127.0.0.1', port), self._make_handler())
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def listing_url(self):
+        return self.base_url + listing_path(self.categories[0])
+
+    @property
+    def listing_urls(self):
+        return [self.base_url + listing_path(category) for category in self.categories]
+
+    def _index_jobs(self):
+        # 목록 페이지마다 전체 공고를 훑지 않도록 카테고리별 공고 목록과 공고 순번을 미리 만들어 둠
+        self.category_jobs = {category: [] for category in self.categories}
+        self.job_index = {}
+        for i, job in enumerate(self.jobs.values()):
+            self.category_jobs[self.categories[i % len(self.categories)]].append(job)
+            self.job_index[job['job_id']] = i
+
+    def render_listing_page(self, category, page):
+        jobs = self.category_jobs[category]
+        if not self.per_page:
+            return render_listing(jobs)
+        num_pages = max(1, -(-len(jobs) // self.per_page))
+        page_links = [listing_path(category, p) for p in range(num_pages)]
+        sort_links = [(sort, listing_path(category, page, sort)) for sort in SORT_ORDERS]
+        return render_listing(jobs[page * self.per_page:(page + 1) * self.per_page], page_links, sort_links)
+
+    def update_job(self, job_id, **fields):
+        # 상세 페이지 내용을 바꾸면 ETag와 Last-Modified도 함께 바뀜
+        with self.lock:
+            self.jobs[job_id] = dict(self.jobs[job_id], **fields)
+            self.last_modified = formatdate(usegmt=True)
+            self._index_jobs()
+
+    def add_job(self, job):
+        # 새 공고를 목록 끝에 추가
+        with self.lock:
+            self.jobs[job['job_id']] = job
+            self._index_jobs()
+
+    def render_detail_page(self, job):
+        if self.detail_pages:
+            return self.detail_pages[self.job_index[job['job_id']] % len(self.detail_pages)]
+        return render_detail(job)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.request_count += 1
+                    failed = server.error_rate and server.random.random() < server.error_rate
+                    if failed:
+                        server.error_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                if failed:
+                    self.send_error(503)
+                    return
+
+                if self.path.startswith('/ajo?joblist'):
+                    category, page = parse_listing_path(self.path)
+                    if category not in server.categories:
+                        self.send_error(404)
+                        return
+                    self._send(server.render_listing_page(category, page))
+                elif self.path.startswith('/ajo/jobs/'):
+                    with server.lock:
+                        server.detail_request_count += 1
+                    job = server.jobs.get(self.path.rsplit('/', 1)[-1])
+                    if job is None:
+                        self.send_error(404)
+                        return
+                    self._send(server.render_detail_page(job), conditional=True)
+                else:
+                    self.send_error(404)
+
+            def _send(self, body, conditional=False):
+                content = body.encode('utf-8')
+                etag = '"' + hashlib.md5(content).hexdigest() + '"'
+                if conditional and self.headers.get('If-None-Match') == etag:
+                    with server.lock:
+                        server.not_modified_count += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                if conditional:
+                    self.send_header('ETag', etag)
+                    self.send_header('Last-Modified', server.last_modified)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def handle(self):
+                # 크롤러 프로세스를 강제로 종료해 응답 도중 연결이 끊겨도 오류를 출력하지 않음
+                try:
+                    super().handle()
+                except ConnectionError:
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+
+def serve_forever(jobs, options, urls):
+    # MockServerProcess의 자식 프로세스에서 실행. 목록 페이지 URL을 부모에게 넘기고 종료될 때까지 응답
+    server = MockAJOServer(jobs, **options)
+    urls.put(server.listing_urls)
+    server.httpd.serve_forever()
+
+
+# 측정 대상과 같은 프로세스(같은 GIL)에서 응답하면 서버 스레드가 크롤러와 CPU를 나눠 써 엔진 비교가 왜곡되므로
+# 별도 프로세스에서 띄우는 가짜 서버. 요청 수 같은 카운터는 볼 수 없고 listing_urls만 제공
+class MockServerProcess:
+    def __init__(self, jobs, **options):
+        self.jobs = jobs
+        self.options = options
+        self.process = None
+        self.listing_urls = None
+
+    def __enter__(self):
+        context = multiprocessing.get_context('spawn')
+        urls = context.Queue()
+        self.process = context.Process(target=serve_forever, args=(self.jobs, self.options, urls), daemon=True)
+        self.process.start()
+        self.listing_urls = urls.get(timeout=60)
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=1000, help='합성할 공고 수')
+    parser.add_argument('--latency', type=float, default=0.0, help='요청마다 추가할 지연(초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='503으로 응답할 요청 비율')
+    parser.add_argument('--per-page', type=int, default=100, help='목록 페이지당 공고 수')
+    parser.add_argument('--categories', type=int, nargs='+', default=[3, 4], help='목록 카테고리 번호')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    server = MockAJOServer(make_jobs(args.jobs), latency=args.latency, per_page=args.per_page, categories=args.categories,
+                           error_rate=args.error_rate, port=args.port)
+    print("목록 페이지:")
+    for url in server.listing_urls:
+        print(f"  {url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
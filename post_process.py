@@ -1,56 +1,108 @@
 import json
+import os
+from store import DB_FILENAME, JobStore
+from metrics import METRICS
+from countries import INDEX_VERSION, resolve_location, resolve_locations
+
+STAGE = 'post_process'
+INPUT_FILENAME = "data/physics_postdocs.json"
+OUTPUT_FILENAME = "data/physics_postdocs_updated.json"
+LOCATION_CACHE_FILENAME = "data/location_cache.json"
 
 def extract_country_and_clean_location(position_location):
-    # '[map]' 부분 제거
-    cleaned_location = position_location.replace('[map]', '').strip()
-    
-    # 특정 예외 국가명 리스트
-    special_cases = {
-        'Korea, The Republic of': 'Republic of Korea',
-        # 필요한 다른 예외 케이스들을 여기에 추가할 수 있습니다.
-    }
-    
-    # 예외 국가명이 위치 정보에 포함되어 있는지 확인
-    for special_case in special_cases:
-        if special_case in cleaned_location:
-            country = special_cases[special_case]
-            # 국가명을 제거한 위치 정보
-            cleaned_location = cleaned_location.replace(special_case, '').strip(', ').strip()
-            return cleaned_location, country
-    
-    # 주소를 쉼표로 분리
-    parts = [part.strip() for part in cleaned_location.split(',')]
-    
-    # 국가명 추출 (마지막 부분)
-    if parts:
-        country = parts[-1]
-        # 국가명을 제거한 위치 정보
-        cleaned_location = ', '.join(parts[:-1]).strip()
-    else:
-        country = ''
-    
-    return cleaned_location, country
+    # (국가명을 뺀 위치, 국가 표시 이름, ISO 국가 코드). 국가/별칭/주(州) 색인으로 해석 (countries.py)
+    return resolve_location(position_location)
 
-def update_jobs_file(input_filename, output_filename):
-    # 기존 데이터를 읽어옵니다.
-    with open(input_filename, 'r', encoding='utf-8') as f:
-        jobs = json.load(f)
-    
-    # 각 공고에 대해 처리
+# position_location -> (cleaned_location, country, country_code) 결과를 실행 간에 재사용하는 캐시.
+# 색인 버전이 다른 캐시는 버리고, stale로 표시해 이미 처리된 공고도 다시 처리하게 함
+class LocationCache:
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.entries = {}
+        self.dirty = False
+        self.stale = False
+        if filename and os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.entries = data['entries']
+            else:
+                self.stale = True
+
+    def resolve(self, position_location):
+        return self.resolve_many([position_location])[0]
+
+    def resolve_many(self, locations):
+        size = len(self.entries)
+        results = resolve_locations(locations, self.entries)
+        if len(self.entries) != size:
+            self.dirty = True
+        return results
+
+    def save(self):
+        if not self.filename or not (self.dirty or self.stale):
+            return
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'entries': self.entries}, f, ensure_ascii=False)
+        self.dirty = self.stale = False
+
+def process_jobs(jobs, location_cache=None):
+    resolve_many = location_cache.resolve_many if location_cache else resolve_locations
+    # 위치가 있는 공고는 모아서 한 번에 해석 (같은 위치는 한 번만)
+    located = []
     for job in jobs:
-        position_location = job.get('position_location', '')
-        if position_location:
-            cleaned_location, country = extract_country_and_clean_location(position_location)
-            job['position_location'] = cleaned_location
-            job['country'] = country
+        if job.get('position_location', ''):
+            located.append(job)
         else:
             job['country'] = ''
-    
+            job['country_code'] = ''
+    for job, (cleaned_location, country, country_code) in zip(located, resolve_many([job['position_location'] for job in located])):
+        job['position_location'] = cleaned_location
+        job['country'] = country
+        job['country_code'] = country_code
+    return jobs
+
+def update_jobs_file(input_filename, output_filename, location_cache=None):
+    # 기존 데이터를 읽어옵니다.
+    with open(input_filename, 'r', encoding='utf-8') as f:
+        jobs = json.load(f)
+
+    process_jobs(jobs, location_cache)
+
     # 수정된 데이터를 저장합니다.
     with open(output_filename, 'w', encoding='utf-8') as f:
         json.dump(jobs, f, ensure_ascii=False, indent=2)
-    
+
+def update_store(store, output_filename, location_cache=None):
+    # 마지막 실행 이후 새로 생기거나 바뀐 공고만 다시 처리합니다.
+    # 위치 색인이 바뀌어 캐시가 stale이면 이미 처리된 공고도 모두 다시 처리합니다.
+    changes, last_seq = store.changes_since(STAGE)
+    reprocess = location_cache is not None and location_cache.stale
+    if not changes and not reprocess and os.path.exists(output_filename):
+        return []
+
+    changed_ids = None if reprocess else {job_id for job_id, kind in changes if kind not in ('removed', 'expired')}
+    jobs = process_jobs(store.load_jobs(changed_ids), location_cache)
+    store.save_processed(jobs)
+    # 호환용 JSON은 변경(삭제/만료 포함)이 있을 때만 다시 내보냅니다.
+    store.export_json(output_filename, processed=True)
+    store.advance_cursor(STAGE, last_seq)
+    return jobs
+
+def run_post_process(store, output_filename=OUTPUT_FILENAME, location_cache_filename=LOCATION_CACHE_FILENAME):
+    location_cache = LocationCache(location_cache_filename)
+    jobs = update_store(store, output_filename, location_cache)
+    location_cache.save()
+    METRICS.inc('post_process_jobs_total', len(jobs))
+    print(f"{len(jobs)}개의 새로운/변경된 공고를 처리했습니다.")
+    # 다음 단계(렌더링, Excel)에서 쓸 전체 처리 결과를 반환
+    return store.load_processed_jobs()
+
 if __name__ == "__main__":
-    input_filename = "data/physics_postdocs.json"
-    output_filename = "data/physics_postdocs_updated.json"
-    update_jobs_file(input_filename, output_filename)
+    if os.path.exists(DB_FILENAME):
+        with JobStore(DB_FILENAME) as store:
+            run_post_process(store)
+    else:
+        location_cache = LocationCache(LOCATION_CACHE_FILENAME)
+        update_jobs_file(INPUT_FILENAME, OUTPUT_FILENAME, location_cache)
+        location_cache.save()
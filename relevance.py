@@ -0,0 +1,93 @@
+import os
+import re
+
+import yaml
+
+KEYWORDS_FILENAME = "keywords.yaml"
+
+# keywords.yaml이 없을 때 쓰는 기본 설정 (기존 하드코딩된 조건과 같은 결과).
+# 필드별 키워드 중 하나라도 포함되면 그 필드의 weight를 더하고, 합이 threshold 이상이면 관련 공고.
+# exclude의 키워드가 어느 필드에든 포함되면 점수와 관계없이 제외
+DEFAULT_CONFIG = {
+    'fields': {
+        'title': {'weight': 1, 'keywords': ['physics', 'artificial', 'natural']},
+        'department': {'weight': 1, 'keywords': ['physics']},
+    },
+    'exclude': [],
+    'threshold': 1,
+    'whole_words': False,
+}
+
+def trie_pattern(words):
+    # 키워드들을 접두사 트리로 묶은 정규식으로 변환 ('physics', 'physical' -> 'physic(?:s|al)').
+    # 단순 'a|b|c' 나열과 달리 위치마다 키워드 수만큼 다시 시도하지 않으므로 키워드가 수백 개여도 빠름
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        end = node.get('') is True
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not end:
+            return branches[0]
+        pattern = '(?:' + '|'.join(branches) + ')'
+        return pattern + '?' if end else pattern
+
+    return build(trie)
+
+def compile_keywords(words, whole_words=False):
+    words = sorted({word.strip().lower() for word in words if word and word.strip()})
+    if not words:
+        return None
+    pattern = trie_pattern(words)
+    if whole_words:
+        pattern = r'\b' + pattern + r'\b'
+    return re.compile(pattern)
+
+# 설정의 키워드를 필드별로 정규식 하나씩으로 컴파일해 두고 공고마다 재사용.
+# 컴파일된 뒤에는 상태를 바꾸지 않으므로 여러 스레드에서 같이 써도 됨
+class KeywordMatcher:
+    def __init__(self, config=None):
+        config = config or DEFAULT_CONFIG
+        whole_words = config.get('whole_words', False)
+        self.threshold = config.get('threshold', 1)
+        self.fields = []
+        for name, field in config.get('fields', {}).items():
+            pattern = compile_keywords(field.get('keywords', []), whole_words)
+            if pattern:
+                self.fields.append((name, field.get('weight', 1), pattern))
+        self.exclude = compile_keywords(config.get('exclude', []), whole_words)
+
+    @classmethod
+    def from_file(cls, filename=KEYWORDS_FILENAME):
+        # 파일이 없으면 기본 설정 사용
+        if not filename or not os.path.exists(filename):
+            return cls()
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls(yaml.safe_load(f) or DEFAULT_CONFIG)
+
+    def score(self, **fields):
+        # 필드 값은 한 번만 소문자로 바꿈. exclude에 걸리면 -1
+        lowered = {name: value.lower() for name, value in fields.items() if value}
+        if self.exclude and any(self.exclude.search(value) for value in lowered.values()):
+            return -1
+        return sum(weight for name, weight, pattern in self.fields
+                   if name in lowered and pattern.search(lowered[name]))
+
+    def is_relevant(self, **fields):
+        # score와 같은 판단이지만 exclude가 없으면 threshold에 닿는 순간 멈춤
+        if self.exclude:
+            return self.score(**fields) >= self.threshold
+        total = 0
+        for name, weight, pattern in self.fields:
+            value = fields.get(name)
+            if value and pattern.search(value.lower()):
+                total += weight
+                if total >= self.threshold:
+                    return True
+        return total >= self.threshold
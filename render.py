@@ -1,302 +1,94 @@
+import argparse
 import json
-from jinja2 import Environment, FileSystemLoader
-
-# JSON 데이터 로드
-with open('data/physics_postdocs_updated.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
-
-# Jinja2 환경 설정
-env = Environment(loader=FileSystemLoader('.'))
-template = env.from_string('''
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Physics Postdoc Institutes</title>
-    <style>
-        body { font-family: Arial, sans-serif; }
-        .controls { margin: 20px; }
-        .job { border: 1px solid #ccc; padding: 15px; margin: 15px; }
-        .institution { font-size: 1.5em; font-weight: bold; }
-        .title { font-size: 1.2em; }
-        .deadline { color: red; }
-        .materials { margin-top: 10px; }
-        .hidden { display: none; }
-        .favorite { background-color: #ffffcc; } /* 관심 공고 표시를 위한 배경색 */
-        table { width: 100%; border-collapse: collapse; margin-top: 20px; }
-        th, td { border: 1px solid #ccc; padding: 8px; text-align: left; vertical-align: top; }
-        th { background-color: #f2f2f2; }
-    </style>
-</head>
-<body>
-    <h1>Physics Postdoc Institutes</h1>
-    <div class="controls">
-        <label><input type="checkbox" id="toggleMaterials" checked> Application Materials 있는 공고만 보기</label>
-        &nbsp;&nbsp;
-        <label><input type="checkbox" id="toggleFellow" checked> Fellow 공고 포함하기</label>
-        &nbsp;&nbsp;
-        <label>정렬 기준:
-            <select id="sortOption">
-                <option value="deadline">마감일 순</option>
-                <option value="country">국가별</option>
-            </select>
-        </label>
-        &nbsp;&nbsp;
-        <label><input type="checkbox" id="toggleFavorites"> 관심 공고만 보기</label>
-        &nbsp;&nbsp;
-        <label><input type="checkbox" id="toggleTableView"> Table View</label>
-    </div>
-    <div id="jobs">
-        {% for job in jobs %}
-        <div class="job" data-id="{{ loop.index0 }}" data-has-materials="{{ '1' if job.application_materials else '0' }}" data-is-fellow="{{ '1' if 'fellow' in job.title.lower() else '0' }}" data-deadline="{{ job.deadline }}" data-country="{{ job.country }}">
-            <div class="institution">{{ job.institution }} - {{ job.department }}</div>
-            <div class="title">{{ job.title }}</div>
-            <div class="deadline">마감일: {{ job.deadline }}</div>
-            <div class="location">위치: {{ job.position_location }}</div>
-            <div class="country">국가: {{ job.country }}</div>
-            {% if job.subject_area %}
-            <div class="subject-area">분야: {{ job.subject_area }}</div>
-            {% endif %}
-            {% if job.application_materials %}
-            <div class="materials">
-                <strong>Application Materials:</strong>
-                <ul>
-                    {% for material in job.application_materials %}
-                    <li>{{ material }}</li>
-                    {% endfor %}
-                </ul>
-            </div>
-            {% endif %}
-            <div><a href="{{ job.job_url }}">More Info</a></div>
-            <!-- 관심 표시 버튼 추가 -->
-            <button class="favorite-btn">관심 공고 추가</button>
-        </div>
-        {% endfor %}
-    </div>
-    <div id="jobsTable" class="hidden">
-        <table>
-            <thead>
-                <tr>
-                    <th>Institution</th>
-                    <th>Department</th>
-                    <th>Title</th>
-                    <th>Deadline</th>
-                    <th>Location</th>
-                    <th>Country</th>
-                    <th>Subject Area</th>
-                    <th>Application Materials</th>
-                    <th>Link</th>
-                    <th>Favorite</th>
-                </tr>
-            </thead>
-            <tbody>
-                {% for job in jobs %}
-                <tr class="job-row" data-id="{{ loop.index0 }}" data-has-materials="{{ '1' if job.application_materials else '0' }}" data-is-fellow="{{ '1' if 'fellow' in job.title.lower() else '0' }}" data-deadline="{{ job.deadline }}" data-country="{{ job.country }}">
-                    <td>{{ job.institution }}</td>
-                    <td>{{ job.department }}</td>
-                    <td>{{ job.title }}</td>
-                    <td>{{ job.deadline }}</td>
-                    <td>{{ job.position_location }}</td>
-                    <td>{{ job.country }}</td>
-                    <td>{{ job.subject_area }}</td>
-                    <td>
-                        {% if job.application_materials %}
-                        <ul>
-                            {% for material in job.application_materials %}
-                            <li>{{ material }}</li>
-                            {% endfor %}
-                        </ul>
-                        {% endif %}
-                    </td>
-                    <td><a href="{{ job.job_url }}">More Info</a></td>
-                    <td><button class="favorite-btn">관심 공고 추가</button></td>
-                </tr>
-                {% endfor %}
-            </tbody>
-        </table>
-    </div>
-    <script>
-        // 관심 공고 불러오기
-        function loadFavorites() {
-            var favorites = localStorage.getItem('favorites');
-            if (favorites) {
-                return JSON.parse(favorites);
-            } else {
-                return [];
-            }
-        }
-
-        // 관심 공고 저장하기
-        function saveFavorites(favorites) {
-            localStorage.setItem('favorites', JSON.stringify(favorites));
-        }
-
-        // 초기 관심 공고 목록 로드
-        var favorites = loadFavorites();
-
-        function setupFavoriteButtons() {
-            var favoriteButtons = document.querySelectorAll('.favorite-btn');
-
-            favoriteButtons.forEach(function(button) {
-                var jobElement = button.closest('.job, .job-row');
-                var jobId = jobElement.getAttribute('data-id');
-
-                // 이미 관심 공고인지 확인
-                if (favorites.includes(jobId)) {
-                    button.textContent = '관심 공고 제거';
-                    jobElement.classList.add('favorite');
-                }
-
-                // 클릭 이벤트 추가
-                button.addEventListener('click', function() {
-                    if (favorites.includes(jobId)) {
-                        // 관심 공고 제거
-                        favorites = favorites.filter(function(id) { return id !== jobId; });
-                        button.textContent = '관심 공고 추가';
-                        jobElement.classList.remove('favorite');
-                    } else {
-                        // 관심 공고 추가
-                        favorites.push(jobId);
-                        button.textContent = '관심 공고 제거';
-                        jobElement.classList.add('favorite');
-                    }
-                    saveFavorites(favorites);
-                    applyFilters(); // 필터링 다시 적용
-                });
-            });
-        }
-
-        function applyFilters() {
-            var showMaterials = document.getElementById('toggleMaterials').checked;
-            var includeFellow = document.getElementById('toggleFellow').checked;
-            var sortOption = document.getElementById('sortOption').value;
-            var showFavoritesOnly = document.getElementById('toggleFavorites').checked;
-            var isTableView = document.getElementById('toggleTableView').checked;
-
-            var jobsDiv = document.getElementById('jobs');
-            var jobsTableDiv = document.getElementById('jobsTable');
-
-            if (isTableView) {
-                jobsDiv.classList.add('hidden');
-                jobsTableDiv.classList.remove('hidden');
-            } else {
-                jobsDiv.classList.remove('hidden');
-                jobsTableDiv.classList.add('hidden');
-            }
-
-            var jobs = Array.from(document.querySelectorAll(isTableView ? '.job-row' : '.job'));
-
-            // 필터링
-            jobs.forEach(function(job) {
-                var hasMaterials = job.getAttribute('data-has-materials') === '1';
-                var isFellow = job.getAttribute('data-is-fellow') === '1';
-                var jobId = job.getAttribute('data-id');
-                var isFavorite = favorites.includes(jobId);
-
-                var show = true;
-
-                if (showMaterials && !hasMaterials) {
-                    show = false;
-                }
-
-                if (!includeFellow && isFellow) {
-                    show = false;
-                }
-
-                if (showFavoritesOnly && !isFavorite) {
-                    show = false;
-                }
-
-                if (show) {
-                    job.classList.remove('hidden');
-                } else {
-                    job.classList.add('hidden');
-                }
-            });
-
-            // 정렬
-            var visibleJobs = jobs.filter(function(job) {
-                return !job.classList.contains('hidden');
-            });
-
-            if (sortOption === 'deadline') {
-                visibleJobs.sort(function(a, b) {
-                    var deadlineA = a.getAttribute('data-deadline');
-                    var deadlineB = b.getAttribute('data-deadline');
-
-                    var dateA = parseDeadline(deadlineA);
-                    var dateB = parseDeadline(deadlineB);
-
-                    return dateA - dateB;
-                });
-            } else if (sortOption === 'country') {
-                visibleJobs.sort(function(a, b) {
-                    var countryA = a.getAttribute('data-country').toLowerCase();
-                    var countryB = b.getAttribute('data-country').toLowerCase();
-
-                    if (countryA < countryB) return -1;
-                    if (countryA > countryB) return 1;
-                    return 0;
-                });
-            }
-
-            // 정렬된 요소들을 DOM에 다시 추가
-            if (isTableView) {
-                var tbody = jobsTableDiv.querySelector('tbody');
-                visibleJobs.forEach(function(job) {
-                    tbody.appendChild(job);
-                });
-            } else {
-                var jobsContainer = document.getElementById('jobs');
-                visibleJobs.forEach(function(job) {
-                    jobsContainer.appendChild(job);
-                });
-            }
-        }
-
-        function parseDeadline(deadlineStr) {
-            // (deadline 2024/11/01 11:59PM*)
-            var match = deadlineStr.match(/(\d{4})\/(\d{2})\/(\d{2}) (\d{1,2}):(\d{2})(AM|PM)/);
-            if (match) {
-                var year = parseInt(match[1]);
-                var month = parseInt(match[2]) - 1; // JavaScript months are 0-based
-                var day = parseInt(match[3]);
-                var hour = parseInt(match[4]);
-                var minute = parseInt(match[5]);
-                var ampm = match[6];
-
-                if (ampm === 'PM' && hour !== 12) {
-                    hour += 12;
-                } else if (ampm === 'AM' && hour === 12) {
-                    hour = 0;
-                }
-
-                return new Date(year, month, day, hour, minute);
-            } else {
-                // 날짜 파싱 실패 시, 최대값 반환하여 끝으로 보냄
-                return new Date(9999, 11, 31);
-            }
-        }
-
-        document.getElementById('toggleMaterials').addEventListener('change', applyFilters);
-        document.getElementById('toggleFellow').addEventListener('change', applyFilters);
-        document.getElementById('sortOption').addEventListener('change', applyFilters);
-        document.getElementById('toggleFavorites').addEventListener('change', applyFilters);
-        document.getElementById('toggleTableView').addEventListener('change', applyFilters);
-
-        // 페이지 로드 시 초기화
-        setupFavoriteButtons();
-        applyFilters();
-    </script>
-</body>
-</html>
-''')
-
-# 템플릿 렌더링
-html_content = template.render(jobs=data)
-
-# HTML 파일로 저장
-with open('physics_postdocs_positions.html', 'w', encoding='utf-8') as f:
-    f.write(html_content)
-
-print("HTML 파일이 생성되었습니다: physics_postdocs_positions.html")
+import os
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from deadline import sort_key as deadline_sort_key
+from search_index import SEARCH_INDEX_FILENAME, SearchIndex
+from store import DB_FILENAME, JobStore
+
+INPUT_FILENAME = 'data/physics_postdocs_updated.json'
+OUTPUT_FILENAME = 'physics_postdocs_positions.html'
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# virtual 모드에서 행마다 내보내는 컬럼 (JSON에는 컬럼 이름을 한 번만 씀)
+VIRTUAL_FIELDS = ['job_id', 'institution', 'department', 'title', 'deadline', 'job_url', 'position_location',
+                  'country', 'subject_area', 'application_materials', 'has_materials', 'is_fellow']
+VIRTUAL_ROW_HEIGHT = 96
+STREAM_BUFFER_SIZE = 64
+
+def load_jobs():
+    # 저장소가 있으면 post_process 결과를, 없으면 JSON 파일을 읽음
+    if os.path.exists(DB_FILENAME):
+        with JobStore(DB_FILENAME) as store:
+            return store.load_processed_jobs()
+    with open(INPUT_FILENAME, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Jinja2 환경 설정: 템플릿 파일을 컴파일한 바이트코드를 디스크에 캐시해 다음 실행부터 재사용
+env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), bytecode_cache=FileSystemBytecodeCache())
+# 클래식 페이지는 미리 해석한 마감일(UTC ISO 문자열)을 data 속성에 넣어 브라우저에서 문자열 비교만으로 정렬
+env.globals['deadline_sort_key'] = deadline_sort_key
+
+def build_virtual_payload(jobs):
+    rows = []
+    deadline_keys = []
+    country_keys = []
+    for job in jobs:
+        job = dict(job,
+                   has_materials=1 if job.get('application_materials') else 0,
+                   is_fellow=1 if 'fellow' in job.get('title', '').lower() else 0)
+        job.setdefault('application_materials', [])
+        rows.append([job.get(field, '') for field in VIRTUAL_FIELDS])
+        deadline_keys.append(deadline_sort_key(job))
+        country_keys.append(job.get('country', '').strip().lower())
+
+    indices = range(len(rows))
+    payload = {
+        'fields': VIRTUAL_FIELDS,
+        'rows': rows,
+        # 정렬 기준별 순서를 미리 계산해 두므로 클라이언트는 정렬하지 않음
+        'order': {
+            'deadline': sorted(indices, key=deadline_keys.__getitem__),
+            'country': sorted(indices, key=country_keys.__getitem__),
+        },
+    }
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    # <script> 안에 넣으므로 '</script>' 등이 태그로 해석되지 않게 '<'를 이스케이프
+    return data.replace('<', '\\u003c')
+
+def build_search_payload(jobs, index_path=None):
+    # 공고 순서(data-id/행 번호)로 만든 검색 색인. index_path가 있으면 파이썬에서 조회할 수 있게 따로도 저장
+    index = SearchIndex.from_jobs(jobs)
+    if index_path:
+        index.save(index_path)
+    return index.to_json().replace('<', '\\u003c')
+
+def render_jobs_virtual(jobs, out_path=OUTPUT_FILENAME, index_path=SEARCH_INDEX_FILENAME):
+    # 데이터는 JSON으로 한 번만 넣고 보이는 행만 그리는 가상 스크롤 페이지
+    virtual_template = env.get_template('jobs_virtual.html')
+    stream = virtual_template.stream(payload=build_virtual_payload(jobs), search_index=build_search_payload(jobs, index_path),
+                                     row_height=VIRTUAL_ROW_HEIGHT)
+    stream.dump(out_path, encoding='utf-8')
+
+    print(f"HTML 파일이 생성되었습니다: {out_path}")
+
+def render_jobs(jobs, out_path=OUTPUT_FILENAME, index_path=SEARCH_INDEX_FILENAME):
+    # 템플릿을 한 번에 문자열로 만들지 않고 조각 단위로 바로 파일에 씀 (메모리 사용량 일정)
+    stream = env.get_template('jobs.html').stream(jobs=jobs, search_index=build_search_payload(jobs, index_path))
+    stream.enable_buffering(STREAM_BUFFER_SIZE)
+    stream.dump(out_path, encoding='utf-8')
+
+    print(f"HTML 파일이 생성되었습니다: {out_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mode', choices=['classic', 'virtual'], default='classic',
+                        help='classic: 모든 공고를 DOM에 렌더링, virtual: JSON 데이터 + 가상 스크롤')
+    parser.add_argument('--output', default=OUTPUT_FILENAME)
+    parser.add_argument('--index-output', default=SEARCH_INDEX_FILENAME, help='페이지에 넣은 검색 색인을 따로 저장할 파일 (search_index.py로 조회)')
+    args = parser.parse_args()
+
+    if args.mode == 'virtual':
+        render_jobs_virtual(load_jobs(), args.output, args.index_output)
+    else:
+        render_jobs(load_jobs(), args.output, args.index_output)
@@ -0,0 +1,116 @@
+import heapq
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from deadline import job_deadline
+from metrics import METRICS
+
+# 공고별 재확인 일정: 다음 확인 시각(UTC 'YYYY-MM-DDTHH:MM:SSZ'), 마지막 간격(시간),
+# 지금까지 상세 페이지를 받은 횟수와 그중 내용이 바뀐 횟수
+ScheduleEntry = namedtuple('ScheduleEntry', ['next_check_at', 'interval_hours', 'checks', 'changes'])
+
+# 마감일까지 남은 일수 상한 -> 기본 재확인 간격(시간). 마감이 가까울수록 자주 확인
+DEADLINE_INTERVALS = [(2, 6), (14, 24), (60, 72)]
+# 마감일이 멀거나 rolling/unknown인 공고
+DEFAULT_INTERVAL = 7 * 24
+# filled/withdrawn이거나 마감일이 이미 지난 공고
+CLOSED_INTERVAL = 30 * 24
+CLOSED_STATUSES = {'filled', 'withdrawn'}
+MIN_INTERVAL = 3
+
+# plan()의 결과
+FETCH = 'fetch'   # 지금 바로 상세 페이지를 받음 (새 공고)
+DEFER = 'defer'   # 목록 파싱이 끝난 뒤 긴급도 순으로 예산 안에서 받음
+SKIP = 'skip'     # 받지 않고 저장된 상세 정보를 재사용
+
+
+def format_time(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def base_interval(job, now):
+    # 마감일과 상태만으로 정한 기본 간격(시간)
+    deadline_at, status = job_deadline(job)
+    if status in CLOSED_STATUSES:
+        return CLOSED_INTERVAL
+    if not deadline_at:
+        return DEFAULT_INTERVAL
+    days_left = (datetime.fromisoformat(deadline_at[:-1]).replace(tzinfo=timezone.utc) - now).total_seconds() / 86400
+    if days_left < 0:
+        return CLOSED_INTERVAL
+    for max_days, hours in DEADLINE_INTERVALS:
+        if days_left <= max_days:
+            return hours
+    return DEFAULT_INTERVAL
+
+
+def next_interval(job, checks, changes, now):
+    # 관측한 변경 빈도로 기본 간격을 0.25~4배 조정. 확인 기록이 없으면 빈도 0.5로 보고 그대로 사용
+    change_rate = (changes + 1) / (checks + 2)
+    factor = min(4.0, max(0.25, 0.5 / change_rate))
+    return min(CLOSED_INTERVAL, max(MIN_INTERVAL, base_interval(job, now) * factor))
+
+
+# 알려진 공고마다 다음 확인 시각을 두고, 때가 된 공고의 상세 페이지만 실행당 요청 예산 안에서 받게 함.
+# 목록에 처음 나온 공고는 예산과 관계없이 바로 받고(남은 예산도 먼저 씀), 목록의 제목/마감일이 바뀐 공고가
+# 그다음, 나머지는 확인 시각이 오래 지난 순서로 받음. 받지 않은 공고는 저장된 상세 정보를 그대로 씀
+class RecrawlScheduler:
+    def __init__(self, entries, existing_jobs_dict, budget=None, now=None):
+        self.entries = entries
+        self.existing_jobs_dict = existing_jobs_dict
+        self.budget = budget
+        self.now = now or datetime.now(timezone.utc)
+        self.now_iso = format_time(self.now)
+        self.lock = threading.Lock()
+        self.deferred = []
+        self.requests = 0
+        self.updated = {}
+
+    def plan(self, entry):
+        job_id, title, deadline = entry[:3]
+        existing_job = self.existing_jobs_dict.get(job_id)
+        if existing_job is None:
+            METRICS.inc('schedule_new_total')
+            with self.lock:
+                self.requests += 1
+            return FETCH
+
+        scheduled = self.entries.get(job_id)
+        if existing_job.get('title') != title.strip() or existing_job.get('deadline') != deadline.strip():
+            # 목록에서 바로 보이는 변경(마감일 연장, filled 등)
+            priority = (0, '')
+        elif scheduled is None or scheduled.next_check_at <= self.now_iso:
+            priority = (1, scheduled.next_check_at if scheduled else '')
+        else:
+            METRICS.inc('schedule_skipped_total')
+            return SKIP
+        with self.lock:
+            heapq.heappush(self.deferred, (priority, job_id, entry))
+        return DEFER
+
+    def release(self):
+        # 목록 페이지가 모두 끝난 뒤 호출. 미뤄 둔 공고를 (예산 안에서 받을 것, 예산을 넘어 재사용할 것)으로 나눔
+        with self.lock:
+            due, over_budget = [], []
+            while self.deferred:
+                _, _, entry = heapq.heappop(self.deferred)
+                if self.budget is None or self.requests < self.budget:
+                    self.requests += 1
+                    due.append(entry)
+                else:
+                    over_budget.append(entry)
+        METRICS.inc('schedule_due_total', len(due))
+        METRICS.inc('schedule_over_budget_total', len(over_budget))
+        return due, over_budget
+
+    def record(self, job, existing_job):
+        # 상세 페이지를 받은 공고의 다음 확인 시각을 정함
+        previous = self.entries.get(job['job_id'])
+        checks = (previous.checks if previous else 0) + 1
+        changes = (previous.changes if previous else 0) + (1 if existing_job is not None and job != existing_job else 0)
+        interval = next_interval(job, checks, changes, self.now)
+        entry = ScheduleEntry(format_time(self.now + timedelta(hours=interval)), interval, checks, changes)
+        with self.lock:
+            self.entries[job['job_id']] = entry
+            self.updated[job['job_id']] = entry
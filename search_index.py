@@ -0,0 +1,210 @@
+import argparse
+import bisect
+import functools
+import json
+import os
+import re
+import time
+import unicodedata
+
+SEARCH_INDEX_FILENAME = "data/search_index.json"
+# 색인 형식이나 분석 규칙이 바뀌면 올림
+INDEX_VERSION = 3
+
+# 검색 대상 필드 (한 공고의 필드들을 하나의 문서로 봄)
+SEARCH_FIELDS = ['title', 'subject_area', 'institution', 'department', 'position_location', 'country']
+STOPWORDS = {'a', 'an', 'and', 'at', 'de', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with'}
+# 가벼운 어간 추출 규칙: 단계마다 처음 맞는 어미 하나만 바꾸고, 남는 어간이 MIN_STEM보다 짧으면 그대로 둠.
+# 더 바뀌지 않을 때까지 두 단계를 반복 ('computational' -> 'computation' -> 'comput').
+# 색인에 같이 넣어 브라우저(templates/search.js)도 같은 규칙을 씀
+STEM_RULES = [
+    # 복수형 ('sciences' -> 'science', 'studies' -> 'study', 'physics' -> 'physic')
+    [['sses', 'ss'], ['ies', 'y'], ['ss', 'ss'], ['us', 'us'], ['is', 'is'], ['s', '']],
+    # 흔한 파생 어미 ('computation', 'computing' -> 'comput', 'physical' -> 'physic')
+    [['ation', ''], ['ing', ''], ['ed', ''], ['al', ''], ['ly', ''], ['e', '']],
+]
+MIN_STEM = 3
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+def fold(text):
+    # 소문자 + 악센트 제거 (브라우저의 toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '')와 같음)
+    text = text.lower()
+    if text.isascii():
+        return text
+    return ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.category(char).startswith('M'))
+
+
+@functools.lru_cache(maxsize=65536)
+def stem(word):
+    previous = None
+    while word != previous:
+        previous = word
+        for rules in STEM_RULES:
+            for suffix, replacement in rules:
+                if word.endswith(suffix):
+                    if len(word) - len(suffix) >= MIN_STEM:
+                        word = word[:len(word) - len(suffix)] + replacement
+                    break
+    return word
+
+
+@functools.lru_cache(maxsize=65536)
+def word_forms(text):
+    # 필드 값 -> (단어, 어간) 목록 (기관/국가처럼 반복되는 값은 한 번만 분석)
+    return tuple((token, stem(token)) for token in TOKEN_PATTERN.findall(fold(text)) if token not in STOPWORDS)
+
+
+def analyze(text):
+    # 색인할 단어(어간) 목록
+    return tuple(term for _, term in word_forms(text))
+
+
+def delta_encode(doc_ids):
+    # 정렬된 문서 번호 -> 첫 번호와 차이들 (작은 정수라 JSON이 짧아짐)
+    return [doc_ids[0]] + [b - a for a, b in zip(doc_ids, doc_ids[1:])]
+
+
+def delta_decode(deltas):
+    doc_ids = []
+    doc_id = 0
+    for delta in deltas:
+        doc_id += delta
+        doc_ids.append(doc_id)
+    return doc_ids
+
+
+def build_index(jobs):
+    # 문서 번호 = jobs에서의 순서 (렌더링된 페이지의 data-id/행 번호와 같음)
+    postings = {}
+    word_terms = {}
+    ids = []
+    for doc_id, job in enumerate(jobs):
+        ids.append(job.get('job_id', ''))
+        terms = set()
+        for field in SEARCH_FIELDS:
+            value = job.get(field)
+            if value:
+                for word, term in word_forms(value):
+                    terms.add(term)
+                    if word != term:
+                        word_terms[word] = term
+        for term in terms:
+            postings.setdefault(term, []).append(doc_id)
+    terms = sorted(postings)
+    term_ids = {term: term_id for term_id, term in enumerate(terms)}
+    words = sorted(word_terms)
+    return {
+        'version': INDEX_VERSION,
+        'fields': SEARCH_FIELDS,
+        'stopwords': sorted(STOPWORDS),
+        'stem': STEM_RULES,
+        'min_stem': MIN_STEM,
+        'ids': ids,
+        # 정렬된 단어 목록과 같은 순서의 역색인 (문서 번호를 차이로 저장)
+        'terms': terms,
+        'postings': [delta_encode(postings[term]) for term in terms],
+        # 어간과 다른 원래 단어와 그 어간의 번호. 입력 중인 마지막 단어를 원래 형태의 접두사로도 찾음
+        # ('physica' -> 'physical' -> 'physic')
+        'words': words,
+        'word_terms': [term_ids[word_terms[word]] for word in words],
+    }
+
+
+# 렌더링할 때 만든 역색인을 파이썬에서 조회 (브라우저의 templates/search.js와 같은 방식).
+# 여러 단어는 모두 포함한 공고(AND)만 찾고, 마지막 단어는 입력 중인 것으로 보고 접두사로 찾음
+class SearchIndex:
+    def __init__(self, data):
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {data.get('version')}")
+        self.data = data
+        self.terms = data['terms']
+        self.ids = data['ids']
+        self.term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+        self.words = data['words']
+        self.word_terms = data['word_terms']
+        self.decoded = {}
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        return cls(build_index(jobs))
+
+    @classmethod
+    def load(cls, filename=SEARCH_INDEX_FILENAME):
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def to_json(self):
+        return json.dumps(self.data, ensure_ascii=False, separators=(',', ':'))
+
+    def save(self, filename=SEARCH_INDEX_FILENAME):
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_filename = filename + '.tmp'
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+        os.replace(tmp_filename, filename)
+
+    def postings(self, term_id):
+        # 처음 조회할 때 차이를 풀어 set으로 보관 (교집합을 C 수준의 set 연산으로)
+        doc_ids = self.decoded.get(term_id)
+        if doc_ids is None:
+            doc_ids = self.decoded[term_id] = set(delta_decode(self.data['postings'][term_id]))
+        return doc_ids
+
+    def prefix_term_ids(self, prefix):
+        # 정렬된 어간 목록과 원래 단어 목록에서 이분 탐색으로 접두사 범위를 찾음
+        start = bisect.bisect_left(self.terms, prefix)
+        term_ids = set(range(start, bisect.bisect_left(self.terms, prefix + '\uffff', start)))
+        start = bisect.bisect_left(self.words, prefix)
+        term_ids.update(self.word_terms[start:bisect.bisect_left(self.words, prefix + '\uffff', start)])
+        return term_ids
+
+    def prefix_postings(self, *prefixes):
+        # 접두사(원래 형태와 어간) 중 하나로 시작하는 단어를 가진 문서
+        term_ids = set().union(*(self.prefix_term_ids(prefix) for prefix in prefixes))
+        if len(term_ids) == 1:
+            return self.postings(term_ids.pop())
+        return set().union(*(self.postings(term_id) for term_id in term_ids))
+
+    def search(self, query, prefix=True):
+        # 일치하는 문서 번호(오름차순). 검색어에 단어가 없으면 전체
+        forms = word_forms(query)
+        if not forms:
+            return list(range(len(self.ids)))
+        # 검색어가 공백으로 끝나면 마지막 단어도 입력이 끝난 것으로 봄.
+        # 입력 중인 단어는 어간 규칙이 맞지 않을 수 있으므로('physica') 원래 형태와 어간 모두 접두사로 찾음
+        prefix = prefix and not query[-1:].isspace()
+        sets = []
+        for position, (word, term) in enumerate(forms):
+            if prefix and position == len(forms) - 1:
+                sets.append(self.prefix_postings(word, term))
+            else:
+                term_id = self.term_ids.get(term)
+                sets.append(self.postings(term_id) if term_id is not None else set())
+        # 가장 작은 집합부터 교집합
+        sets.sort(key=len)
+        return sorted(sets[0].intersection(*sets[1:]))
+
+    def search_ids(self, query, prefix=True):
+        return [self.ids[doc_id] for doc_id in self.search(query, prefix)]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('query', nargs='+', help='검색어 (여러 단어는 모두 포함한 공고만)')
+    parser.add_argument('--index', default=SEARCH_INDEX_FILENAME, help='render.py가 만든 검색 색인 파일')
+    args = parser.parse_args()
+
+    index = SearchIndex.load(args.index)
+    query = ' '.join(args.query)
+    start = time.perf_counter()
+    job_ids = index.search_ids(query)
+    elapsed = time.perf_counter() - start
+    print(f"{len(job_ids)}/{len(index)}개 공고 ({elapsed * 1000:.2f}ms): {query}")
+    for job_id in job_ids:
+        print(f"  {job_id}")
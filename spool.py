@@ -0,0 +1,138 @@
+import argparse
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+SPOOL_FILENAME = "data/html_spool.gz"
+
+# 프로세스마다 열어 둔 스풀 파일 (레코드를 읽을 때마다 다시 열지 않도록).
+# fork된 파싱 프로세스가 부모의 파일 객체를 물려받으면 읽기 위치를 공유하게 되므로 pid별로 따로 엶
+_READERS = {}
+
+
+def read_record(filename, offset, length):
+    # offset 위치의 레코드(gzip member) 하나를 읽어 (헤더, 본문)을 반환. 다른 프로세스에서도 호출 가능
+    key = (os.getpid(), filename)
+    f = _READERS.get(key)
+    if f is None:
+        f = _READERS[key] = open(filename, 'rb')
+    f.seek(offset)
+    data = gzip.decompress(f.read(length))
+    header, _, body = data.partition(b'\n')
+    return json.loads(header), body
+
+
+# 받은 상세 페이지 원본을 압축해 덧붙이기만 하는 스풀 (WARC처럼 레코드마다 독립된 gzip member라
+# 파일 전체도 그대로 gunzip 가능). 레코드 = 헤더 JSON 한 줄 + 원본 HTML.
+# <filename>.idx에 URL별 (offset, length)를 한 줄씩 남기며, 같은 URL은 마지막 레코드가 최신
+class HtmlSpool:
+    def __init__(self, filename=SPOOL_FILENAME):
+        self.filename = filename
+        self.index_filename = filename + '.idx'
+        self.lock = threading.Lock()
+        self.index = {}
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        size = self._load_index()
+        self.file = open(filename, 'ab')
+        # 색인되지 않은 꼬리(기록 도중 죽은 레코드)는 버림
+        self.file.truncate(size)
+        self.file.seek(size)
+        self.index_file = open(self.index_filename, 'a', encoding='utf-8')
+
+    def _load_index(self):
+        size = 0
+        if not os.path.exists(self.index_filename):
+            return size
+        valid_size = 0
+        with open(self.index_filename, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                valid_size += len(line)
+                self.index[entry['url']] = (entry['offset'], entry['length'])
+                size = max(size, entry['offset'] + entry['length'])
+        os.truncate(self.index_filename, valid_size)
+        return min(size, os.path.getsize(self.filename)) if os.path.exists(self.filename) else 0
+
+    def append(self, url, content, status=200):
+        header = {'url': url, 'status': status, 'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+        # 압축은 잠금 밖에서 (zlib은 GIL을 놓으므로 여러 스레드가 동시에 압축 가능)
+        record = gzip.compress(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n' + content, compresslevel=6)
+        with self.lock:
+            offset = self.file.tell()
+            self.file.write(record)
+            # 파싱 프로세스가 바로 읽을 수 있도록 색인보다 먼저 내보냄
+            self.file.flush()
+            self.index_file.write(json.dumps({'url': url, 'offset': offset, 'length': len(record)}, ensure_ascii=False) + '\n')
+            self.index_file.flush()
+            self.index[url] = (offset, len(record))
+        return offset, len(record)
+
+    def get(self, url):
+        # 읽기 위치를 공유하는 파일 객체를 쓰므로 잠금 안에서 읽음
+        with self.lock:
+            location = self.index.get(url)
+            if location is None:
+                return None
+            return read_record(self.filename, *location)[1]
+
+    def compact(self):
+        # URL마다 최신 레코드만 남겨 새 파일로 다시 씀
+        with self.lock:
+            self.file.flush()
+            tmp_filename = self.filename + '.tmp'
+            index = {}
+            with open(self.filename, 'rb') as src, open(tmp_filename, 'wb') as dst:
+                for url, (offset, length) in self.index.items():
+                    src.seek(offset)
+                    index[url] = (dst.tell(), length)
+                    dst.write(src.read(length))
+            with open(self.index_filename + '.tmp', 'w', encoding='utf-8') as f:
+                for url, (offset, length) in index.items():
+                    f.write(json.dumps({'url': url, 'offset': offset, 'length': length}, ensure_ascii=False) + '\n')
+            self.file.close()
+            self.index_file.close()
+            os.replace(tmp_filename, self.filename)
+            os.replace(self.index_filename + '.tmp', self.index_filename)
+            reader = _READERS.pop((os.getpid(), self.filename), None)
+            if reader:
+                reader.close()
+            self.index = index
+            self.file = open(self.filename, 'ab')
+            self.index_file = open(self.index_filename, 'a', encoding='utf-8')
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+            self.index_file.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=['stats', 'compact'], help='stats: 레코드 수와 크기, compact: URL마다 최신 레코드만 남김')
+    parser.add_argument('--spool', default=SPOOL_FILENAME, help='스풀 파일')
+    args = parser.parse_args()
+
+    with HtmlSpool(args.spool) as spool:
+        if args.command == 'compact':
+            before = os.path.getsize(spool.filename)
+            spool.compact()
+            print(f"{before / 2**20:.1f}MiB -> {os.path.getsize(spool.filename) / 2**20:.1f}MiB")
+        print(f"{len(spool)}개 URL, {os.path.getsize(spool.filename) / 2**20:.1f}MiB: {spool.filename}")
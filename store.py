@@ -0,0 +1,306 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from change_detection import diff_jobs, fingerprint
+from deadline import with_deadline
+from scheduler import ScheduleEntry
+
+DB_FILENAME = "data/jobs.db"
+
+# 보존 정책: 마감일이 expire_after_days 지난 공고는 활성 목록에서 빼고(expired),
+# 목록에서 사라진 공고(removed)는 tombstone_days 동안 기록만 남긴 뒤 완전히 삭제
+RetentionPolicy = namedtuple('RetentionPolicy', ['expire_after_days', 'tombstone_days'])
+DEFAULT_RETENTION = RetentionPolicy(expire_after_days=1, tombstone_days=180)
+Prune = namedtuple('Prune', ['expired', 'purged'])
+
+# post_process, 렌더링, 내보내기가 다루는 활성 공고: 목록에 남아 있고 마감일이 지나지 않은 것
+ACTIVE = 'removed_at IS NULL AND expired_at IS NULL'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    rank INTEGER NOT NULL,
+    institution TEXT,
+    deadline TEXT,
+    country TEXT,
+    fingerprint TEXT,
+    data TEXT NOT NULL,
+    processed TEXT,
+    first_seen TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    deadline_at TEXT,
+    removed_at TEXT,
+    expired_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_rank ON jobs(rank);
+CREATE INDEX IF NOT EXISTS idx_jobs_deadline ON jobs(deadline);
+CREATE INDEX IF NOT EXISTS idx_jobs_country ON jobs(country);
+CREATE INDEX IF NOT EXISTS idx_jobs_institution ON jobs(institution);
+
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    changed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_job_id ON changes(job_id);
+
+CREATE TABLE IF NOT EXISTS cursors (
+    stage TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS schedule (
+    job_id TEXT PRIMARY KEY,
+    next_check_at TEXT NOT NULL,
+    interval_hours REAL NOT NULL,
+    checks INTEGER NOT NULL,
+    changes INTEGER NOT NULL
+);
+'''
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def dump_job(job):
+    # 키 순서는 유지 (convert.py가 첫 공고의 키 순서로 Excel 헤더를 만듦)
+    return json.dumps(job, ensure_ascii=False, separators=(',', ':'))
+
+
+# job_id를 키로 하는 SQLite(WAL) 공고 저장소.
+# data에는 크롤링 원본, processed에는 post_process 결과를 저장하고
+# changes 테이블에 new/updated/removed/expired 이력을 남겨 각 단계가 바뀐 행만 읽을 수 있게 함.
+# 목록에서 사라진 공고는 지우지 않고 removed_at을 기록한 tombstone으로 남김
+class JobStore:
+    def __init__(self, filename=DB_FILENAME):
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def upsert_jobs(self, jobs, listed_ids=None):
+        # jobs의 순서를 rank로 저장해 JSON 파일과 같은 순서로 읽을 수 있게 함.
+        # 저장된 fingerprint와 비교해 new/updated/removed/unchanged를 한 번에 구분한 Diff를 반환.
+        # listed_ids(이번 크롤링에서 목록 페이지에 보인 공고 ID)가 있을 때만, 거기에 없는 저장된 공고를 removed로 처리
+        timestamp = now_iso()
+        with self.lock, self.conn:
+            ranks = {}
+            old_fingerprints = {}
+            # tombstone은 비교 대상에서 빼므로 다시 올라온 공고는 new로 잡힘
+            for job_id, rank, fp in self.conn.execute('SELECT job_id, rank, fingerprint FROM jobs WHERE removed_at IS NULL'):
+                ranks[job_id] = rank
+                old_fingerprints[job_id] = fp
+            diff, fingerprints = diff_jobs(old_fingerprints, jobs)
+            if listed_ids is None:
+                diff = diff._replace(removed=[])
+            else:
+                diff = diff._replace(removed=[job_id for job_id in diff.removed if job_id not in listed_ids])
+
+            rows = []
+            for rank, job in enumerate(jobs):
+                job_id = job['job_id']
+                # 내용과 순서가 같으면 다시 쓰지 않음
+                if old_fingerprints.get(job_id) == fingerprints[job_id] and ranks.get(job_id) == rank:
+                    continue
+                rows.append((job_id, rank, job.get('institution'), job.get('deadline'), job.get('deadline_at'),
+                             fingerprints[job_id], dump_job(job), timestamp, timestamp))
+
+            # 내용이 바뀌면 마감일이 연장됐을 수 있으므로 expired를 풀고 다음 prune에서 다시 판단
+            self.conn.executemany('''
+                INSERT INTO jobs (job_id, rank, institution, deadline, deadline_at, fingerprint, data, first_seen, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    rank = excluded.rank,
+                    institution = excluded.institution,
+                    deadline = excluded.deadline,
+                    deadline_at = excluded.deadline_at,
+                    processed = CASE WHEN jobs.fingerprint = excluded.fingerprint THEN jobs.processed ELSE NULL END,
+                    expired_at = CASE WHEN jobs.fingerprint = excluded.fingerprint THEN jobs.expired_at ELSE NULL END,
+                    removed_at = NULL,
+                    fingerprint = excluded.fingerprint,
+                    data = excluded.data,
+                    updated_at = excluded.updated_at
+            ''', rows)
+
+            if diff.removed:
+                self.conn.executemany('UPDATE jobs SET removed_at = ? WHERE job_id = ?',
+                                      [(timestamp, job_id) for job_id in diff.removed])
+
+            self.conn.executemany(
+                'INSERT INTO changes (job_id, kind, changed_at) VALUES (?, ?, ?)',
+                [(job_id, kind, timestamp) for kind in ('new', 'updated', 'removed') for job_id in getattr(diff, kind)])
+        return diff
+
+    def prune(self, policy=DEFAULT_RETENTION, now=None):
+        # 크롤링이 끝날 때마다 실행. 두 단계 모두 인덱스로 해당 행만 찾음
+        now = now or datetime.now(timezone.utc)
+        timestamp = now.isoformat(timespec='seconds')
+        # deadline_at은 'YYYY-MM-DDTHH:MM:SSZ' 형식이라 문자열 비교로 충분
+        deadline_cutoff = (now - timedelta(days=policy.expire_after_days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        tombstone_cutoff = (now - timedelta(days=policy.tombstone_days)).isoformat(timespec='seconds')
+        with self.lock, self.conn:
+            expired = [job_id for (job_id,) in self.conn.execute(
+                f'SELECT job_id FROM jobs WHERE {ACTIVE} AND deadline_at < ?', (deadline_cutoff,))]
+            self.conn.executemany('UPDATE jobs SET expired_at = ? WHERE job_id = ?', [(timestamp, job_id) for job_id in expired])
+            self.conn.executemany('INSERT INTO changes (job_id, kind, changed_at) VALUES (?, ?, ?)',
+                                  [(job_id, 'expired', timestamp) for job_id in expired])
+            # 아직 목록에 있는 expired 공고는 지우면 다음 크롤링에서 new로 되살아나므로, 사라진 공고만 삭제
+            purged = self.conn.execute('DELETE FROM jobs WHERE removed_at < ?', (tombstone_cutoff,)).rowcount
+            if purged:
+                self.conn.execute('DELETE FROM schedule WHERE job_id NOT IN (SELECT job_id FROM jobs)')
+        return Prune(expired, purged)
+
+    def load_tombstones(self):
+        # 목록에서 사라졌거나 마감일이 지난 공고: 마지막으로 본 내용과 removed_at/expired_at
+        rows = self.conn.execute(f'SELECT data, removed_at, expired_at FROM jobs WHERE NOT ({ACTIVE}) ORDER BY rank')
+        return [{'job': json.loads(data), 'removed_at': removed_at, 'expired_at': expired_at}
+                for data, removed_at, expired_at in rows]
+
+    def export_tombstones(self, filename):
+        tmp_filename = filename + '.tmp'
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(self.load_tombstones(), f, ensure_ascii=False)
+        os.replace(tmp_filename, filename)
+
+    def load_jobs(self, job_ids=None):
+        # job_ids 없이 부르면 목록에 남아 있는 공고 전체(마감일이 지난 공고 포함). 크롤링 비교용
+        if job_ids is None:
+            return list(self.iter_jobs())
+        rows = sorted(self._select_in('SELECT rank, data FROM jobs WHERE job_id IN ({})', job_ids))
+        return [json.loads(data) for _, data in rows]
+
+    def iter_jobs(self):
+        # load_jobs()와 같은 공고를 순위 순으로 하나씩 꺼냄 (Job 레코드로 바꿔 담을 때 dict 목록을 한꺼번에 만들지 않음)
+        for (data,) in self.conn.execute('SELECT data FROM jobs WHERE removed_at IS NULL ORDER BY rank'):
+            yield json.loads(data)
+
+    def load_processed_jobs(self):
+        return list(self.iter_processed_jobs())
+
+    def iter_processed_jobs(self):
+        # 전체 목록을 만들지 않고 순위 순으로 하나씩 꺼냄 (스트리밍 내보내기용)
+        rows = self.conn.execute(f'SELECT processed FROM jobs WHERE processed IS NOT NULL AND {ACTIVE} ORDER BY rank')
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def save_processed(self, jobs):
+        with self.lock, self.conn:
+            self.conn.executemany(
+                'UPDATE jobs SET processed = ?, country = ? WHERE job_id = ?',
+                [(dump_job(job), job.get('country'), job['job_id']) for job in jobs])
+
+    def load_schedule(self):
+        # job_id -> ScheduleEntry (재확인 스케줄러가 다음 확인 시각을 정한 공고만)
+        return {job_id: ScheduleEntry(*values) for job_id, *values in self.conn.execute(
+            'SELECT job_id, next_check_at, interval_hours, checks, changes FROM schedule')}
+
+    def save_schedule(self, entries):
+        with self.lock, self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO schedule (job_id, next_check_at, interval_hours, checks, changes) VALUES (?, ?, ?, ?, ?)',
+                                  [(job_id, *entry) for job_id, entry in entries.items()])
+
+    def changes_since(self, stage):
+        # 단계별 커서 이후에 기록된 변경 이력과 마지막 seq를 반환
+        row = self.conn.execute('SELECT seq FROM cursors WHERE stage = ?', (stage,)).fetchone()
+        cursor = row[0] if row else 0
+        rows = self.conn.execute(
+            'SELECT seq, job_id, kind FROM changes WHERE seq > ? ORDER BY seq', (cursor,)).fetchall()
+        last_seq = rows[-1][0] if rows else cursor
+        return [(job_id, kind) for _, job_id, kind in rows], last_seq
+
+    def advance_cursor(self, stage, seq):
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT INTO cursors (stage, seq) VALUES (?, ?) ON CONFLICT(stage) DO UPDATE SET seq = excluded.seq',
+                (stage, seq))
+
+    def import_json(self, filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            return self.upsert_jobs([with_deadline(job) for job in json.load(f)])
+
+    def export_json(self, filename, processed=False):
+        # 저장된 JSON 문자열을 다시 파싱하지 않고 한 줄에 공고 하나씩 그대로 이어 씀
+        if processed:
+            rows = self.conn.execute(f'SELECT processed FROM jobs WHERE processed IS NOT NULL AND {ACTIVE} ORDER BY rank')
+        else:
+            rows = self.conn.execute('SELECT data FROM jobs WHERE removed_at IS NULL ORDER BY rank')
+        tmp_filename = filename + '.tmp'
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for i, (data,) in enumerate(rows):
+                f.write(',\n' if i else '\n')
+                f.write(data)
+            f.write('\n]\n')
+        os.replace(tmp_filename, filename)
+
+    def _migrate(self):
+        # 이전 버전 DB에 없는 열을 추가하고 값을 채움
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+        if 'fingerprint' not in columns:
+            with self.conn:
+                self.conn.execute('ALTER TABLE jobs ADD COLUMN fingerprint TEXT')
+                self.conn.executemany(
+                    'UPDATE jobs SET fingerprint = ? WHERE job_id = ?',
+                    [(fingerprint(json.loads(data)), job_id) for job_id, data in self.conn.execute('SELECT job_id, data FROM jobs')])
+        # 마감일 해석 결과(deadline_at, deadline_status)가 없는 이전 데이터를 채우고 fingerprint도 다시 계산.
+        # 그대로 두면 다음 크롤링에서 모든 공고가 updated로 잡힘
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] < 1:
+            rows = []
+            for job_id, data, processed in self.conn.execute('SELECT job_id, data, processed FROM jobs'):
+                job = with_deadline(json.loads(data))
+                if processed is not None:
+                    processed = dump_job(with_deadline(json.loads(processed)))
+                rows.append((dump_job(job), fingerprint(job), processed, job_id))
+            timestamp = now_iso()
+            with self.conn:
+                self.conn.executemany('UPDATE jobs SET data = ?, fingerprint = ?, processed = ? WHERE job_id = ?', rows)
+                # 다음 post_process가 바뀐 내용으로 결과 파일을 다시 쓰도록 변경 이력도 남김
+                self.conn.executemany(
+                    'INSERT INTO changes (job_id, kind, changed_at) VALUES (?, ?, ?)',
+                    [(job_id, 'updated', timestamp) for *_, job_id in rows])
+                self.conn.execute('PRAGMA user_version = 1')
+        # tombstone/만료 처리용 열과 인덱스
+        if 'removed_at' not in columns:
+            with self.conn:
+                for column in ('deadline_at', 'removed_at', 'expired_at'):
+                    self.conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} TEXT')
+                self.conn.executemany(
+                    'UPDATE jobs SET deadline_at = ? WHERE job_id = ?',
+                    [(json.loads(data).get('deadline_at'), job_id) for job_id, data in self.conn.execute('SELECT job_id, data FROM jobs')])
+        with self.conn:
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_deadline_at ON jobs(deadline_at) WHERE removed_at IS NULL AND expired_at IS NULL')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_removed_at ON jobs(removed_at) WHERE removed_at IS NOT NULL')
+            self.conn.execute(f'CREATE INDEX IF NOT EXISTS idx_jobs_active_rank ON jobs(rank) WHERE {ACTIVE}')
+
+    def _select_in(self, query, values):
+        # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+        values = list(values)
+        rows = []
+        for i in range(0, len(values), 500):
+            chunk = values[i:i + 500]
+            rows.extend(self.conn.execute(query.format(','.join('?' * len(chunk))), chunk))
+        return rows
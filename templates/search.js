@@ -0,0 +1,122 @@
+// render.py(search_index.py)가 만든 역색인으로 검색. 분석 규칙(불용어, 어간 추출)은 색인에 들어 있는 것을 그대로 씀.
+// 여러 단어는 모두 포함한 공고(AND)만 찾고, 마지막 단어는 입력 중인 것으로 보고 접두사로 찾음.
+// 결과는 공고 번호(페이지의 data-id/행 번호)의 Set이며, 검색어에 단어가 없으면 null (거르지 않음)
+function createSearch(index) {
+    var stopwords = new Set(index.stopwords);
+    var termIds = new Map();
+    index.terms.forEach(function(term, i) { termIds.set(term, i); });
+    var decoded = [];
+
+    function fold(text) {
+        return text.toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '');
+    }
+
+    // 더 바뀌지 않을 때까지 규칙을 반복 ('computational' -> 'computation' -> 'comput')
+    function stem(word) {
+        var previous;
+        while (word !== previous) {
+            previous = word;
+            index.stem.forEach(function(rules) {
+                for (var i = 0; i < rules.length; i++) {
+                    var suffix = rules[i][0];
+                    if (word.endsWith(suffix)) {
+                        if (word.length - suffix.length >= index.min_stem) {
+                            word = word.slice(0, word.length - suffix.length) + rules[i][1];
+                        }
+                        break;
+                    }
+                }
+            });
+        }
+        return word;
+    }
+
+    // 불용어를 뺀 원래 형태의 단어 목록 (색인할 때는 어간으로 바꿈)
+    function split(text) {
+        var tokens = fold(text).match(/[\p{L}\p{N}]+/gu) || [];
+        return tokens.filter(function(token) { return !stopwords.has(token); });
+    }
+
+    // 차이로 저장된 문서 번호를 처음 쓸 때 한 번만 풀어 둠
+    function postings(termId) {
+        var docIds = decoded[termId];
+        if (!docIds) {
+            var deltas = index.postings[termId];
+            docIds = new Array(deltas.length);
+            var docId = 0;
+            for (var i = 0; i < deltas.length; i++) {
+                docId += deltas[i];
+                docIds[i] = docId;
+            }
+            decoded[termId] = docIds;
+        }
+        return docIds;
+    }
+
+    // values[low:high]에서 value 이상인 첫 위치
+    function lowerBound(values, value, low, high) {
+        if (high === undefined) high = values.length;
+        while (low < high) {
+            var mid = (low + high) >>> 1;
+            if (values[mid] < value) low = mid + 1; else high = mid;
+        }
+        return low;
+    }
+
+    // 정렬된 어간 목록과 원래 단어 목록에서 이분 탐색으로 접두사(원래 형태와 어간) 범위를 찾아 합침 (결과도 정렬된 목록)
+    function prefixPostings(prefixes) {
+        var termIds = new Set();
+        prefixes.forEach(function(prefix) {
+            var start = lowerBound(index.terms, prefix, 0);
+            var end = lowerBound(index.terms, prefix + '\uffff', start);
+            for (var termId = start; termId < end; termId++) termIds.add(termId);
+            start = lowerBound(index.words, prefix, 0);
+            end = lowerBound(index.words, prefix + '\uffff', start);
+            for (var i = start; i < end; i++) termIds.add(index.word_terms[i]);
+        });
+        if (termIds.size === 1) return postings(termIds.values().next().value);
+        var merged = [];
+        termIds.forEach(function(termId) {
+            merged.push.apply(merged, postings(termId));
+        });
+        merged.sort(function(a, b) { return a - b; });
+        return merged.filter(function(docId, i) { return i === 0 || docId !== merged[i - 1]; });
+    }
+
+    // 정렬된 두 목록의 교집합. 짧은 목록의 번호마다 긴 목록에서 앞으로만 범위를 두 배씩 넓혀(galloping) 이분 탐색
+    function intersect(short, long) {
+        var result = [];
+        var position = 0;
+        for (var i = 0; i < short.length && position < long.length; i++) {
+            var docId = short[i];
+            var bound = 1;
+            while (position + bound < long.length && long[position + bound] < docId) bound *= 2;
+            position = lowerBound(long, docId, position, Math.min(position + bound, long.length));
+            if (long[position] === docId) result.push(docId);
+        }
+        return result;
+    }
+
+    function search(query) {
+        var words = split(query);
+        if (!words.length) return null;
+        var terms = words.map(stem);
+        // 검색어가 공백으로 끝나면 마지막 단어도 입력이 끝난 것으로 봄.
+        // 입력 중인 단어는 어간 규칙이 맞지 않을 수 있으므로('physica') 원래 형태와 어간 모두 접두사로 찾음
+        var prefix = !/\s$/.test(query);
+        var lists = terms.map(function(term, i) {
+            if (prefix && i === terms.length - 1) return prefixPostings([words[i], term]);
+            var termId = termIds.get(term);
+            return termId === undefined ? [] : postings(termId);
+        });
+        // 가장 짧은 목록에서 시작해 나머지에 모두 있는 문서만 남김
+        lists.sort(function(a, b) { return a.length - b.length; });
+        var result = lists[0];
+        for (var i = 1; i < lists.length && result.length; i++) {
+            result = intersect(result, lists[i]);
+        }
+        return new Set(result);
+    }
+
+    return {search: search};
+}
@@ -0,0 +1,17 @@
+import json
+import os
+
+from change_detection import Diff, write_changelog
+
+
+def test_changelog_runs_in_same_second(tmp_path):
+    # 같은 초에 끝난 실행도 앞선 변경 내역을 덮어쓰지 않음
+    directory = str(tmp_path)
+    filenames = [write_changelog(Diff([str(i)], [], [], []), directory) for i in range(3)]
+    assert len(set(filenames)) == 3
+    assert len(os.listdir(directory)) == 3
+    logged = []
+    for filename in filenames:
+        with open(filename, encoding='utf-8') as f:
+            logged += json.load(f)['new']
+    assert logged == ['0', '1', '2']
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mock_server import MockAJOServer, make_jobs
+from relevance import KeywordMatcher
+from store import DB_FILENAME, JobStore
+
+CRAWLER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'crawling.py')
+# 기본 설정(physics/artificial/natural)과 다른 결과가 나오는 천체물리 전용 설정
+ASTRO_KEYWORDS = """
+fields:
+  title:
+    weight: 1
+    keywords: [astrophysics]
+threshold: 1
+"""
+
+
+def crawl_cli(cwd, server, *args):
+    # python crawling.py로 실행 (--keywords/--parser가 __main__ 모듈에 설정되는 경로)
+    command = [sys.executable, CRAWLER, '--workers', '4', *args]
+    for url in server.listing_urls:
+        command += ['--listing', url]
+    subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, check=True)
+    with JobStore(os.path.join(cwd, DB_FILENAME)) as store:
+        return {job['job_id']: job for job in store.load_jobs()}
+
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_cli_keywords_and_parser(tmp_path, engine):
+    if engine == 'async':
+        pytest.importorskip('aiohttp')
+    keywords = tmp_path / 'astro.yaml'
+    keywords.write_text(ASTRO_KEYWORDS, encoding='utf-8')
+    jobs = make_jobs(60)
+    matcher = KeywordMatcher.from_file(str(keywords))
+    expected = {job['job_id'] for job in jobs if matcher.is_relevant(title=job['title'], department=job['department'])}
+    assert 0 < len(expected) < len(jobs)
+
+    with MockAJOServer(jobs, per_page=20, categories=(3, 4)) as server:
+        crawled = crawl_cli(tmp_path, server, '--engine', engine, '--keywords', str(keywords), '--parser', 'bs4')
+    assert set(crawled) == expected
+    assert all(job['subject_area'] == 'Astrophysics' for job in crawled.values())
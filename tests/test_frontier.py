@@ -0,0 +1,32 @@
+import pytest
+
+from crawling import crawl_physics_postdocs
+from frontier import UrlFrontier
+from mock_server import MockAJOServer, make_jobs
+
+SEED = 'https://academicjobsonline.org/ajo?joblist-0-0-0-3---0-dt--'
+
+
+def test_frontier_follows_pages_only():
+    frontier = UrlFrontier([SEED])
+    assert frontier.add('https://academicjobsonline.org/ajo?joblist-0-0-0-3---40-dt--')
+    # 정렬만 다른 같은 페이지, 끝의 '-' 표기만 다른 URL, 다른 카테고리는 넣지 않음
+    assert not frontier.add('https://academicjobsonline.org/ajo?joblist-0-0-0-3---0-in--')
+    assert not frontier.add('https://academicjobsonline.org/ajo?joblist-0-0-0-3---40-dl--')
+    assert not frontier.add('https://academicjobsonline.org/ajo?joblist-0-0-0-3---40-dt')
+    assert not frontier.add('https://academicjobsonline.org/ajo?joblist-0-0-0-4---0-dt--')
+    assert frontier.drain() == [SEED, 'https://academicjobsonline.org/ajo?joblist-0-0-0-3---40-dt--']
+
+
+# 목록 페이지마다 정렬 링크가 붙어 있어도 페이지당 한 번만 요청
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_listing_pages_fetched_once(engine):
+    jobs = make_jobs(120)
+    with MockAJOServer(jobs, per_page=25, categories=(3, 4)) as server:
+        if engine == 'async':
+            crawling_async = pytest.importorskip('crawling_async')
+            crawling_async.crawl_physics_postdocs_async_run(server.listing_urls, {}, parse_workers=1)
+        else:
+            crawl_physics_postdocs(server.listing_urls, {})
+        listing_requests = server.request_count - server.detail_request_count
+    assert listing_requests == 2 * 3
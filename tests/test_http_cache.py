@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from crawling import run_crawl
+from mock_server import MockAJOServer, make_jobs
+from store import JobStore
+
+
+def crawl(store, server, tmp_path):
+    paths = {name: str(tmp_path / filename) for name, filename in [
+        ('json_filename', 'jobs.json'), ('http_cache_filename', 'http_cache.json'), ('changelog_dir', 'changelog'),
+        ('checkpoint_filename', 'checkpoint.jsonl'), ('tombstones_filename', 'removed.json'), ('spool_filename', 'spool.gz')]}
+    return run_crawl(store, server.listing_urls, schedule=False, **paths)
+
+
+def test_failed_store_write_does_not_keep_new_validators(tmp_path, monkeypatch):
+    # 상세 페이지가 바뀐 뒤 저장 도중 실패하면, 다음 실행은 304가 아니라 바뀐 페이지를 받아야 함
+    with MockAJOServer(make_jobs(30), per_page=10) as server, JobStore(os.path.join(tmp_path, 'jobs.db')) as store:
+        jobs, _ = crawl(store, server, tmp_path)
+        job_id = jobs[0]['job_id']
+        server.update_job(job_id, subject_area='Changed subject area')
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("store write failed")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(store, 'upsert_jobs', fail)
+            with pytest.raises(RuntimeError):
+                crawl(store, server, tmp_path)
+
+        _, changes = crawl(store, server, tmp_path)
+        assert changes.updated == [job_id]
+        assert store.load_jobs([job_id])[0]['subject_area'] == 'Changed subject area'
@@ -0,0 +1,42 @@
+import glob
+import os
+
+import pytest
+
+from crawling import PARSER_BACKENDS
+from mock_server import make_jobs, render_detail
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+# 빈 본문이나 공백/주석뿐인 응답 (모든 백엔드가 예외 없이 빈 결과를 내야 함)
+EMPTY_PAGES = {'empty': b'', 'whitespace': b' \r\n\t', 'comment_only': b'<!-- empty -->'}
+
+
+def detail_pages():
+    pages = {}
+    for filename in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'detail_*.html'))):
+        with open(filename, 'rb') as f:
+            pages[os.path.basename(filename)] = f.read()
+    for job in make_jobs(5):
+        pages[f"mock_{job['job_id']}"] = render_detail(job).encode('utf-8')
+    return dict(pages, **EMPTY_PAGES)
+
+
+PAGES = detail_pages()
+
+
+@pytest.mark.parametrize('page_name', sorted(EMPTY_PAGES))
+def test_empty_pages(page_name):
+    assert PARSER_BACKENDS['bs4'](EMPTY_PAGES[page_name]) == ([], '', '')
+
+
+def test_fixture_fields():
+    materials, location, subject = PARSER_BACKENDS['bs4'](PAGES['detail_basic.html'])
+    assert materials and location and subject
+
+
+# 모든 백엔드가 BeautifulSoup 경로와 같은 결과를 내야 함
+@pytest.mark.parametrize('backend', sorted(PARSER_BACKENDS))
+@pytest.mark.parametrize('page_name', sorted(PAGES))
+def test_backend_parity(backend, page_name):
+    content = PAGES[page_name]
+    assert PARSER_BACKENDS[backend](content) == PARSER_BACKENDS['bs4'](content)
@@ -0,0 +1,75 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from checkpoint import CHECKPOINT_FILENAME, CrawlCheckpoint
+from crawling import is_relevant
+from mock_server import MockAJOServer, make_jobs
+from store import DB_FILENAME, JobStore
+
+CRAWLER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'crawling.py')
+ENTRY = ('1', 'Postdoc in Physics', '2030-01-01', 'http://example.org/ajo/job/1', 'Institute', 'Physics')
+
+
+def count_checkpoint_jobs(filename):
+    if not os.path.exists(filename):
+        return 0
+    with open(filename, 'rb') as f:
+        # 죽는 순간 쓰던 마지막 줄은 잘려 있어 이어서 할 때 버려짐
+        return sum(1 for line in f if line.startswith(b'{"type": "job"') and line.endswith(b'\n'))
+
+
+def test_listing_entries_need_listing_record(tmp_path):
+    # 목록 레코드 없이 entry만 남은 목록(도중에 죽은 목록)은 끝난 목록으로 보지 않음
+    filename = str(tmp_path / 'checkpoint.jsonl')
+    checkpoint = CrawlCheckpoint(filename, ['http://example.org/a'])
+    checkpoint.record_entry('http://example.org/a', ENTRY)
+    checkpoint.record_entry('http://example.org/b', ENTRY)
+    checkpoint.record_entry('http://example.org/a', ENTRY)
+    checkpoint.record_listing('http://example.org/a', None, ['http://example.org/b'])
+    checkpoint.close()
+
+    resumed = CrawlCheckpoint(filename, ['http://example.org/a'], resume=True)
+    resumed.close()
+    assert resumed.listings == {'http://example.org/a': ([ENTRY], ['http://example.org/b'])}
+
+
+# crawling.py를 별도 프로세스로 돌리다 SIGKILL로 죽인 뒤 --resume으로 이어서 끝까지 실행
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_kill_and_resume(engine, tmp_path):
+    if engine == 'async':
+        pytest.importorskip('aiohttp')
+    jobs = make_jobs(250)
+    expected = {job['job_id'] for job in jobs if is_relevant(job['title'], job['department'])}
+    cwd = str(tmp_path)
+    checkpoint_filename = os.path.join(cwd, CHECKPOINT_FILENAME)
+    with MockAJOServer(jobs, latency=0.02, per_page=50, categories=(3, 4)) as server:
+        command = [sys.executable, CRAWLER, '--engine', engine, '--workers', '4']
+        for url in server.listing_urls:
+            command += ['--listing', url]
+
+        # 파싱 워커 프로세스까지 한꺼번에 죽이도록 별도 프로세스 그룹으로 실행
+        process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.DEVNULL, start_new_session=True)
+        while process.poll() is None and count_checkpoint_jobs(checkpoint_filename) < 50:
+            time.sleep(0.02)
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+        # 죽은 크롤러가 보내 둔 요청을 서버가 마저 처리(지연 후 집계)할 때까지 기다림
+        time.sleep(0.2)
+        done_before_kill = count_checkpoint_jobs(checkpoint_filename)
+        assert 0 < done_before_kill < len(expected)
+        detail_requests_before_kill = server.detail_request_count
+
+        subprocess.run(command + ['--resume'], cwd=cwd, stdout=subprocess.DEVNULL, check=True)
+        resume_detail_requests = server.detail_request_count - detail_requests_before_kill
+
+    with JobStore(os.path.join(cwd, DB_FILENAME)) as store:
+        stored = {job['job_id'] for job in store.load_jobs()}
+    assert stored == expected
+    assert not os.path.exists(checkpoint_filename)
+    # 체크포인트에 남은 공고는 다시 받지 않음
+    assert resume_detail_requests <= len(expected) - done_before_kill